@@ -1,45 +1,267 @@
 # common/mcp_tool_decorator.py
 import inspect
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import wraps
-from pydantic import create_model
+from typing import Any, Callable, Dict, Hashable, Optional, Type, Union
+from pydantic import BaseModel, ValidationError, create_model
 from mcp.types import Tool  # Assumes your MCP types define a Tool model
 
+class ToolRegistry(dict):
+    """
+    Tool registry that counts its own changes.
+
+    ``version`` is bumped on every mutation, so the runtime can tell in
+    constant time whether its cached tool list is still current.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def _changed(self):
+        self.version += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self._changed()
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self._changed()
+        return result
+
+    def setdefault(self, key, default=None):
+        result = super().setdefault(key, default)
+        self._changed()
+        return result
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def replace(self, remove, add):
+        """
+        Remove some tools and add others as a single change.
+
+        Used by hot reload to swap a module's tools without ever exposing a
+        registry that has neither the old nor the new ones.
+        """
+        for key in remove:
+            super().pop(key, None)
+        super().update(add)
+        self._changed()
+
 # Global registry for MCP tool functions.
-TOOLS_REGISTRY = {}
+TOOLS_REGISTRY = ToolRegistry()
+
+# Registry that @mcp_tool registers into instead of TOOLS_REGISTRY, while set.
+_REGISTRATION_TARGET: ContextVar[Optional[Dict[str, Any]]] = ContextVar("mcp_registration_target", default=None)
+
+@contextmanager
+def collect_registrations(registry: Dict[str, Any]):
+    """
+    Register tools decorated in this context (e.g. by an import) into ``registry``.
+
+    Tools that name their own ``registry`` are unaffected. The redirect is
+    per thread and task, so concurrent imports elsewhere still register
+    into TOOLS_REGISTRY.
+    """
+    token = _REGISTRATION_TARGET.set(registry)
+    try:
+        yield registry
+    finally:
+        _REGISTRATION_TARGET.reset(token)
+
+# Execution hints accepted by @mcp_tool.
+EXECUTORS = ("thread", "process")
+
+# Annotations whose values can be checked with a plain type() comparison.
+FAST_PATH_TYPES = (str, int, float, bool)
+
+class ArgumentValidator:
+    """
+    Compiled argument validator for one tool.
 
-def mcp_tool(name: str, description: str):
+    Wraps the tool's Pydantic input model, whose core schema is built once at
+    decoration time. Arguments that already have the exact declared types
+    skip model validation entirely; anything else goes through the model.
+    Models with validators, serializers or a custom model_config always go
+    through the model, since skipping it would skip their behaviour.
+    """
+    def __init__(self, name: str, model: Type[BaseModel]):
+        self.name = name
+        self.model = model
+        self.fields = frozenset(model.model_fields)
+        self.required = frozenset(n for n, f in model.model_fields.items() if f.is_required())
+
+        # Fields that can be checked without the model: plain scalar types with no constraints,
+        # on a model that adds nothing of its own to validation
+        plain_model = not model.model_config and not any(
+            getattr(model.__pydantic_decorators__, kind) for kind in (
+                "validators", "field_validators", "root_validators", "model_validators",
+                "field_serializers", "model_serializers", "computed_fields"
+            )
+        )
+        self.simple_types = {
+            n: f.annotation for n, f in model.model_fields.items()
+            if plain_model and f.annotation in FAST_PATH_TYPES and not f.metadata
+        }
+
+    def _is_typed(self, arguments: Dict[str, Any]) -> bool:
+        """Return True if the arguments are complete and already of the declared types."""
+        if not self.required <= arguments.keys():
+            return False
+        for key, value in arguments.items():
+            expected = self.simple_types.get(key)
+            if expected is None or type(value) is not expected:
+                return False
+        return True
+
+    def __call__(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate tool arguments.
+
+        Returns the keyword arguments to call the tool with; parameters the
+        caller left out are omitted so the function's own defaults apply.
+        Raises ValueError if the arguments are invalid.
+        """
+        if self._is_typed(arguments):
+            return arguments
+        unknown = arguments.keys() - self.fields
+        if unknown:
+            raise ValueError(f"Invalid input for {self.name}: unexpected arguments {sorted(unknown)}")
+        try:
+            validated = self.model.model_validate(arguments)
+        except ValidationError as e:
+            raise ValueError(f"Invalid input for {self.name}: {e}")
+        return {key: getattr(validated, key) for key in validated.model_fields_set}
+
+class CachePolicy:
+    """
+    Result caching options for a pure tool.
+
+    Results are kept in an LRU of ``max_entries`` entries and expire after
+    ``ttl`` seconds (None to keep them until evicted). ``key`` maps the raw
+    call arguments to a hashable cache key; returning None skips the cache
+    for that call. By default the key is the arguments themselves.
+    """
+    def __init__(
+        self,
+        ttl: Optional[float] = 60.0,
+        max_entries: int = 256,
+        key: Optional[Callable[[Dict[str, Any]], Optional[Hashable]]] = None
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.key = key
+
+def mcp_tool(
+    name: str,
+    description: str,
+    input_model: Optional[Type[BaseModel]] = None,
+    registry: Optional[Dict[str, Any]] = None,
+    timeout: Optional[float] = None,
+    cache: Union[bool, CachePolicy, None] = None,
+    single_flight: bool = False,
+    executor: str = "thread"
+):
     """
     Decorator to register an MCP tool function and auto-generate its input JSON schema.
-    
+
     It:
-      - Inspects the function's signature and builds a Pydantic model for input.
+      - Inspects the function's signature and builds a Pydantic model for input,
+        or uses ``input_model`` if the tool already defines one.
       - Creates a Tool instance with the provided name, description, and the generated schema.
-      - Registers the function in a global registry for later dispatch.
+      - Keeps the model as a compiled validator so the runtime validates arguments once per call.
+      - Registers the function in a global registry (or ``registry``) for later dispatch.
+      - Records whether the function is a coroutine so the runtime can await it natively.
+      - Records an optional per-call ``timeout`` in seconds; ``host.dispatch`` settings
+        in config.yaml take precedence over it.
+      - Records an optional result ``cache`` policy (True for the defaults, or a
+        CachePolicy). Only use it for tools whose result depends on nothing but
+        their arguments; cached results are shared between callers.
+      - Records whether concurrent calls with identical arguments may share one
+        execution (``single_flight``). Only use it for tools where running once
+        on behalf of several callers is safe.
+      - Records where a synchronous tool runs (``executor``): "thread" for the
+        host's thread pool, or "process" for a process pool, for CPU-bound tools.
+        Process tools must be registered in the global registry and take and
+        return picklable values.
     """
+    if executor not in EXECUTORS:
+        raise ValueError(f"executor must be one of {', '.join(EXECUTORS)}, not {executor!r}")
+
     def decorator(func):
-        # Build a Pydantic model for the input parameters using type hints.
         sig = inspect.signature(func)
-        fields = {}
-        for param in sig.parameters.values():
-            annotation = param.annotation if param.annotation != inspect.Parameter.empty else str
-            fields[param.name] = (annotation, ...)
-        
-        # Create a temporary Pydantic model for schema generation.
-        InputModel = create_model(f"{func.__name__.capitalize()}Input", **fields)
-        
+        if input_model is None:
+            # Build a Pydantic model for the input parameters using type hints.
+            fields = {}
+            for param in sig.parameters.values():
+                annotation = param.annotation if param.annotation != inspect.Parameter.empty else str
+                default = param.default if param.default != inspect.Parameter.empty else ...
+                fields[param.name] = (annotation, default)
+            InputModel = create_model(f"{func.__name__.capitalize()}Input", **fields)
+        else:
+            # The model must describe exactly the function's parameters.
+            if set(input_model.model_fields) != set(sig.parameters):
+                raise TypeError(
+                    f"input_model {input_model.__name__} does not match the parameters of {func.__name__}"
+                )
+            InputModel = input_model
+
         # Use model_json_schema() instead of schema() to generate the input schema.
         tool = Tool(
             name=name,
             description=description,
             inputSchema=InputModel.model_json_schema()
         )
-        
+
         # Register the function in the global registry.
-        TOOLS_REGISTRY[name] = func
-        
+        target = registry if registry is not None else _REGISTRATION_TARGET.get()
+        if target is None:
+            target = TOOLS_REGISTRY
+        target[name] = func
+
         # Attach the tool metadata to the function for introspection.
         func._mcp_tool = tool
 
+        # Keep the compiled validator for the dispatcher.
+        func._mcp_validator = ArgumentValidator(name, InputModel)
+
+        # Record whether the tool is a coroutine function (async def).
+        func._mcp_is_async = inspect.iscoroutinefunction(func)
+
+        # Default deadline for a call, in seconds (None for no deadline).
+        func._mcp_timeout = timeout
+
+        # Result caching policy (None when results are not cached).
+        func._mcp_cache = CachePolicy() if cache is True else (cache or None)
+
+        # Whether identical concurrent calls are coalesced into one execution.
+        func._mcp_single_flight = single_flight
+
+        # Where the dispatcher runs the tool ("thread" or "process").
+        func._mcp_executor = executor
+
+        if func._mcp_is_async:
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await func(*args, **kwargs)
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             return func(*args, **kwargs)
@@ -1,8 +1,8 @@
 # common/tests/test_decorator.py
 import pytest
 import inspect
-from pydantic import BaseModel
-from common.mcp_tool_decorator import mcp_tool, TOOLS_REGISTRY
+from pydantic import BaseModel, ConfigDict, field_validator
+from common.mcp_tool_decorator import mcp_tool, CachePolicy, TOOLS_REGISTRY, ToolRegistry, collect_registrations
 from mcp.types import Tool  # This should be your MCP Tool model
 
 @mcp_tool(name="sample_tool", description="Test tool description")
@@ -42,3 +42,165 @@ def test_tool_functionality():
     sig = inspect.signature(sample_tool)
     assert "a" in sig.parameters, "Parameter 'a' should be in the function signature"
     assert "b" in sig.parameters, "Parameter 'b' should be in the function signature"
+
+@mcp_tool(name="sample_async_tool", description="Async test tool description")
+async def sample_async_tool(a: int) -> dict:
+    return {"a": a}
+
+def test_async_tool_registration():
+    # Verify that coroutine tools are registered and flagged as async.
+    assert "sample_async_tool" in TOOLS_REGISTRY, "sample_async_tool should be in the TOOLS_REGISTRY"
+    assert TOOLS_REGISTRY["sample_async_tool"]._mcp_is_async is True, "Async tool should be flagged as async"
+    assert TOOLS_REGISTRY["sample_tool"]._mcp_is_async is False, "Sync tool should not be flagged as async"
+
+    # The returned wrapper should remain awaitable.
+    assert inspect.iscoroutinefunction(sample_async_tool), "Decorated async tool should stay a coroutine function"
+
+@pytest.mark.asyncio
+async def test_async_tool_functionality():
+    # Verify that the decorated coroutine returns the expected output when awaited.
+    result = await sample_async_tool(a=7)
+    assert result == {"a": 7}, "The async tool should return the correct dictionary"
+
+@mcp_tool(name="sample_defaults_tool", description="Tool with optional parameters")
+def sample_defaults_tool(a: int, b: str = "x") -> dict:
+    return {"a": a, "b": b}
+
+def test_validator_fast_path_returns_arguments_unchanged():
+    # Arguments that already have the declared types skip model validation.
+    validator = TOOLS_REGISTRY["sample_tool"]._mcp_validator
+    arguments = {"a": 1, "b": "hello"}
+    assert validator(arguments) is arguments, "Typed arguments should be passed through as-is"
+
+def test_validator_coerces_and_keeps_function_defaults():
+    # Arguments that need coercion go through the compiled model.
+    validator = TOOLS_REGISTRY["sample_defaults_tool"]._mcp_validator
+    assert validator({"a": "5"}) == {"a": 5}, "Omitted optional parameters should be left to the function"
+    assert "a" in sample_defaults_tool._mcp_tool.inputSchema["required"]
+    assert "b" not in sample_defaults_tool._mcp_tool.inputSchema["required"], "Parameters with defaults should be optional"
+
+def test_validator_rejects_invalid_arguments():
+    validator = TOOLS_REGISTRY["sample_tool"]._mcp_validator
+    with pytest.raises(ValueError):
+        validator({"a": "not a number", "b": "hello"})
+    with pytest.raises(ValueError):
+        validator({"a": 1})
+    with pytest.raises(ValueError):
+        validator({"a": 1, "b": "hello", "c": True})
+
+class SampleInput(BaseModel):
+    a: int
+
+def test_input_model_is_used_for_schema_and_validation():
+    @mcp_tool(name="sample_model_tool", description="Tool with an explicit input model", input_model=SampleInput)
+    def sample_model_tool(a: int) -> dict:
+        return {"a": a}
+
+    assert TOOLS_REGISTRY["sample_model_tool"]._mcp_tool.inputSchema == SampleInput.model_json_schema()
+    assert TOOLS_REGISTRY["sample_model_tool"]._mcp_validator.model is SampleInput
+
+    # The model must describe the function's parameters exactly.
+    with pytest.raises(TypeError):
+        @mcp_tool(name="mismatched_tool", description="Mismatched input model", input_model=SampleInput)
+        def mismatched_tool(b: int) -> dict:
+            return {"b": b}
+
+class StrippedInput(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+    name: str
+
+class ShoutedInput(BaseModel):
+    name: str
+
+    @field_validator("name")
+    @classmethod
+    def shout(cls, value: str) -> str:
+        return value.upper()
+
+def test_input_model_behaviour_is_never_skipped():
+    # A model's own config and validators run even for exactly typed arguments.
+    registry = ToolRegistry()
+
+    @mcp_tool(name="stripped_tool", description="Strips input", registry=registry, input_model=StrippedInput)
+    def stripped_tool(name: str) -> dict:
+        return {"name": name}
+
+    @mcp_tool(name="shouted_tool", description="Shouts input", registry=registry, input_model=ShoutedInput)
+    def shouted_tool(name: str) -> dict:
+        return {"name": name}
+
+    assert registry["stripped_tool"]._mcp_validator({"name": "  hi "}) == {"name": "hi"}
+    assert registry["shouted_tool"]._mcp_validator({"name": "hi"}) == {"name": "HI"}
+
+def test_registry_version_tracks_changes():
+    # Every mutation bumps the version so cached tool lists can be invalidated.
+    registry = ToolRegistry()
+    start = registry.version
+    registry["a"] = sample_tool
+    registry.update(b=sample_tool)
+    registry.pop("a")
+    assert registry.version == start + 3, "Each mutation should bump the registry version"
+    assert isinstance(TOOLS_REGISTRY, ToolRegistry), "The global registry should track its version"
+
+def test_timeout_is_recorded():
+    # The dispatcher reads the deadline from the registered function.
+    registry = ToolRegistry()
+
+    @mcp_tool(name="slow_tool", description="A slow tool", registry=registry, timeout=2.5)
+    def slow_tool() -> dict:
+        return {}
+
+    assert registry["slow_tool"]._mcp_timeout == 2.5
+    assert TOOLS_REGISTRY["sample_tool"]._mcp_timeout is None, "Tools have no deadline by default"
+
+def test_cache_policy_is_recorded():
+    # cache=True uses the default policy; tools are not cached unless they opt in.
+    registry = ToolRegistry()
+
+    @mcp_tool(name="cached_tool", description="A pure tool", registry=registry, cache=True)
+    def cached_tool(a: int) -> dict:
+        return {"a": a}
+
+    policy = registry["cached_tool"]._mcp_cache
+    assert isinstance(policy, CachePolicy)
+    assert (policy.ttl, policy.max_entries, policy.key) == (60.0, 256, None)
+    assert TOOLS_REGISTRY["sample_tool"]._mcp_cache is None
+
+def test_single_flight_is_opt_in():
+    # Only tools that ask for it share executions between identical calls.
+    registry = ToolRegistry()
+
+    @mcp_tool(name="shared_tool", description="A shareable tool", registry=registry, single_flight=True)
+    def shared_tool(a: int) -> dict:
+        return {"a": a}
+
+    assert registry["shared_tool"]._mcp_single_flight is True
+    assert TOOLS_REGISTRY["sample_tool"]._mcp_single_flight is False
+
+def test_executor_hint_is_recorded():
+    # Tools run on the thread pool unless they ask for a process.
+    registry = ToolRegistry()
+
+    @mcp_tool(name="cpu_tool", description="A CPU-bound tool", registry=registry, executor="process")
+    def cpu_tool(a: int) -> dict:
+        return {"a": a}
+
+    assert registry["cpu_tool"]._mcp_executor == "process"
+    assert TOOLS_REGISTRY["sample_tool"]._mcp_executor == "thread"
+
+def test_collect_registrations_redirects_and_replace_bumps_once():
+    # Hot reload stages re-imported tools, then swaps them in with one change.
+    staged = {}
+    with collect_registrations(staged):
+        @mcp_tool(name="staged_tool", description="A staged tool")
+        def staged_tool(a: int) -> dict:
+            return {"a": a}
+
+    assert list(staged) == ["staged_tool"]
+    assert "staged_tool" not in TOOLS_REGISTRY
+
+    registry = ToolRegistry(old_tool=sample_tool)
+    start = registry.version
+    registry.replace(["old_tool"], staged)
+    assert list(registry) == ["staged_tool"]
+    assert registry.version == start + 1, "A replace should be a single change"
@@ -0,0 +1,261 @@
+# runtime/src/mcp_server/admission.py
+"""
+Admission Control Module
+
+This module limits how many tool calls run at once. A limit admits up
+to ``max_concurrent`` calls, lets up to ``max_queue`` more wait in FIFO
+order, and rejects anything beyond that immediately with a
+ToolOverloadedError, so a burst against a heavy tool fails fast instead
+of piling up behind it.
+
+Per-tool limits are configured in each ``mcp_servers`` entry under
+``concurrency`` (a default for the server's tools plus per-tool
+overrides); a host-wide limit is configured under
+``host.dispatch.concurrency``.
+"""
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from runtime.src.mcp_server.errors import ToolOverloadedError
+from runtime.src.mcp_server.tool_manifest import tool_module
+
+class ConcurrencyLimit:
+    """
+    A concurrency limit with a bounded FIFO wait queue.
+
+    All methods run on the event loop thread, so no locking is needed.
+    A released slot is handed directly to the oldest waiter, which keeps
+    newly arriving calls from overtaking queued ones.
+    """
+    def __init__(self, scope: str, max_concurrent: int, max_queue: Optional[int] = 0):
+        """
+        Initialize the limit.
+
+        Args:
+            scope: Which limit this is ("tool" or "global"), reported on rejection.
+            max_concurrent: Calls allowed to run at once.
+            max_queue: Calls allowed to wait for a slot; None for no bound.
+        """
+        self.scope = scope
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.active = 0
+        self.rejected = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        """Number of calls waiting for a slot."""
+        return len(self._waiters)
+
+    async def acquire(self, tool: str) -> None:
+        """
+        Take a slot, waiting in the queue if necessary.
+
+        Args:
+            tool: Name of the tool being called, for the rejection error.
+
+        Raises:
+            ToolOverloadedError: If no slot is free and the queue is full.
+        """
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            return
+        if self.max_queue is not None and len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise ToolOverloadedError(tool, self.scope, self.max_concurrent, self.max_queue)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled; pass it on
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        """Give up a slot, handing it to the oldest waiter if there is one."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # The slot changes hands, so ``active`` is unchanged
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the limit's state as plain data.
+
+        Returns:
+            The configured bounds and current active, waiting and rejected counts.
+        """
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "rejected": self.rejected
+        }
+
+def _make_limit(scope: str, settings: Optional[Dict[str, Any]]) -> Optional[ConcurrencyLimit]:
+    """
+    Build a limit from a ``concurrency`` settings block.
+
+    Args:
+        scope: Which limit this is ("tool" or "global").
+        settings: Mapping with ``max_concurrent`` and optional ``max_queue``.
+
+    Returns:
+        The limit, or None if ``max_concurrent`` is not set.
+    """
+    settings = settings or {}
+    max_concurrent = settings.get("max_concurrent")
+    if not max_concurrent:
+        return None
+    return ConcurrencyLimit(scope, max_concurrent, settings.get("max_queue", 0))
+
+class AdmissionController:
+    """
+    Applies per-tool and host-wide concurrency limits to tool calls.
+
+    A call first takes a slot from its tool's limit and then from the
+    global one, so calls queued behind a saturated tool don't hold global
+    slots that other tools could use.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize the controller.
+
+        Args:
+            config: Configuration dictionary for the server.
+        """
+        dispatch_config = config.get("host", {}).get("dispatch", {}) or {}
+        self.global_limit = _make_limit("global", dispatch_config.get("concurrency"))
+
+        # Concurrency settings of each configured server, keyed by its tools module
+        self._server_settings = self._read_server_settings(config)
+
+        self._tool_limits: Dict[str, Optional[ConcurrencyLimit]] = {}
+        # Tools module each cached limit was built for
+        self._tool_modules: Dict[str, str] = {}
+
+    @staticmethod
+    def _read_server_settings(config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Collect each server's ``concurrency`` block, keyed by its tools module."""
+        server_settings = {}
+        for server_config in (config.get("mcp_servers") or {}).values():
+            server_config = server_config or {}
+            tools_config = server_config.get("tools") or {}
+            settings = server_config.get("concurrency")
+            if tools_config.get("module") and settings:
+                server_settings[tools_config["module"]] = settings
+        return server_settings
+
+    def configure_servers(self, config: Dict[str, Any]) -> None:
+        """
+        Apply the per-server settings of a reloaded configuration.
+
+        Limits of servers whose settings are unchanged are kept, along with
+        their running and waiting calls. The others are rebuilt on their next
+        use; calls already admitted under a replaced limit still release it.
+
+        Args:
+            config: The reloaded configuration dictionary.
+        """
+        settings = self._read_server_settings(config)
+        changed = {
+            module for module in set(settings) | set(self._server_settings)
+            if settings.get(module) != self._server_settings.get(module)
+        }
+        self._server_settings = settings
+        for name, module in list(self._tool_modules.items()):
+            if module in changed:
+                del self._tool_limits[name]
+                del self._tool_modules[name]
+
+    def _tool_limit(self, name: str, func: Any) -> Optional[ConcurrencyLimit]:
+        """
+        Return the limit for a tool, creating it on first use.
+
+        Args:
+            name: Name of the tool.
+            func: The registered tool function (or lazy placeholder).
+
+        Returns:
+            The tool's limit, or None if its server configures none.
+        """
+        if name in self._tool_limits:
+            return self._tool_limits[name]
+
+        module = tool_module(func)
+        settings = self._server_settings.get(module)
+        limit = None
+        if settings:
+            # Per-tool entries override the server's defaults key by key
+            override = (settings.get("tools") or {}).get(name) or {}
+            limit = _make_limit("tool", {**settings, **override})
+        self._tool_limits[name] = limit
+        self._tool_modules[name] = module
+        return limit
+
+    def max_concurrent(self, name: str, func: Any) -> Optional[int]:
+        """
+        Return how many calls to a tool can run at once.
+
+        Args:
+            name: Name of the tool.
+            func: The registered tool function (or lazy placeholder).
+
+        Returns:
+            The smaller of the tool's and the global max_concurrent, or None if neither is limited.
+        """
+        bounds = [
+            limit.max_concurrent for limit in (self._tool_limit(name, func), self.global_limit)
+            if limit is not None
+        ]
+        return min(bounds) if bounds else None
+
+    @asynccontextmanager
+    async def admit(self, name: str, func: Any) -> AsyncIterator[None]:
+        """
+        Hold the tool's and the global slot for the duration of a call.
+
+        Args:
+            name: Name of the tool.
+            func: The registered tool function (or lazy placeholder).
+
+        Raises:
+            ToolOverloadedError: If a limit and its wait queue are full.
+        """
+        limits = [limit for limit in (self._tool_limit(name, func), self.global_limit) if limit is not None]
+        acquired = []
+        try:
+            for limit in limits:
+                await limit.acquire(name)
+                acquired.append(limit)
+            yield
+        finally:
+            for limit in reversed(acquired):
+                limit.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the state of every limit as plain data.
+
+        Returns:
+            The global limit and each tool limit created so far.
+        """
+        return {
+            "global": self.global_limit.snapshot() if self.global_limit is not None else None,
+            "tools": {
+                name: limit.snapshot() for name, limit in sorted(self._tool_limits.items())
+                if limit is not None
+            }
+        }
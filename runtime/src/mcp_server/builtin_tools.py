@@ -0,0 +1,181 @@
+# runtime/src/mcp_server/builtin_tools.py
+"""
+Built-in Host Tools Module
+
+This module provides tools implemented by the host itself rather than
+by a tool server. They are registered into the server's own registry,
+so TOOLS_REGISTRY only ever holds tools from configured servers.
+"""
+import asyncio
+import os
+from typing import Any, Dict, List
+
+from pydantic import BaseModel, Field
+
+from runtime.src.mcp_server.errors import ToolError
+
+# Default upper bound on the number of calls in one batch_call
+DEFAULT_BATCH_MAX_CALLS = 100
+
+# Default number of calls of one batch_call that run at once
+DEFAULT_BATCH_CONCURRENCY = 16
+
+class BatchCallEntry(BaseModel):
+    """One call in a batch_call request."""
+    name: str = Field(..., description="Name of the tool to call")
+    arguments: Dict[str, Any] = Field(default_factory=dict, description="Arguments for the tool")
+
+class BatchCallInput(BaseModel):
+    """Input for the batch_call tool."""
+    calls: List[BatchCallEntry] = Field(..., description="Tool calls to execute, results are returned in the same order")
+    sequential: bool = Field(False, description="Run the calls one after another instead of concurrently")
+    stop_on_error: bool = Field(False, description="With sequential, skip the remaining calls after the first failure")
+
+def _error_entry(name: str, error: Exception) -> Dict[str, Any]:
+    """
+    Describe a failed call in a batch result.
+
+    Args:
+        name: Name of the tool that was called.
+        error: The exception the call raised.
+
+    Returns:
+        The result entry, with a structured error.
+    """
+    if isinstance(error, ToolError):
+        return {"name": name, "ok": False, **error.to_dict()}
+    return {"name": name, "ok": False, "error": {"code": "tool_error", "tool": name, "message": str(error)}}
+
+def register_builtin_tools(server: Any) -> None:
+    """
+    Register the host's built-in tools on a server.
+
+    Args:
+        server: The MCPServer whose ``builtin_tools`` registry receives the tools.
+    """
+    # Imported here so the runtime can be imported before common is on sys.path
+    from common.mcp_tool_decorator import mcp_tool
+
+    @mcp_tool(
+        name="host_diagnostics",
+        description="Report host startup timings per module, tool counts and lazy-loading state.",
+        registry=server.builtin_tools
+    )
+    async def host_diagnostics() -> dict:
+        """
+        Return the startup report and current tool counts.
+
+        Returns:
+            Diagnostics for the running host.
+        """
+        lazy = [
+            name for name, func in server.tools_registry.items()
+            if getattr(func, "_mcp_lazy_module", None)
+        ]
+        return {
+            "server": server.server_name,
+            "pid": os.getpid(),
+            "tools": len(server.tools_registry),
+            "builtin_tools": sorted(server.builtin_tools),
+            "lazy_tools_pending": sorted(lazy),
+            "startup": server.startup_report
+        }
+
+    @mcp_tool(
+        name="host_metrics",
+        description="Report per-tool call counts, error rates, timeouts, rejections, in-flight calls, latency percentiles, concurrency limits and result cache statistics.",
+        registry=server.builtin_tools
+    )
+    async def host_metrics() -> dict:
+        """
+        Return the dispatcher's per-tool metrics.
+
+        Returns:
+            Counters and p50/p95/p99 latencies per tool, plus the state of
+            each concurrency limit and result cache.
+        """
+        snapshot = server.dispatcher.metrics.snapshot()
+        snapshot["admission"] = server.dispatcher.admission.snapshot()
+        snapshot["cache"] = server.dispatcher.results.snapshot()
+        return snapshot
+
+    dispatch_config = server.config.get("host", {}).get("dispatch", {}) or {}
+    batch_max_calls = dispatch_config.get("batch_max_calls", DEFAULT_BATCH_MAX_CALLS)
+    batch_concurrency = dispatch_config.get("batch_concurrency") or DEFAULT_BATCH_CONCURRENCY
+
+    @mcp_tool(
+        name="batch_call",
+        description=(
+            "Execute several tool calls in one request, concurrently or sequentially, "
+            "and return their results in order with per-call errors."
+        ),
+        input_model=BatchCallInput,
+        registry=server.builtin_tools
+    )
+    async def batch_call(calls: List[BatchCallEntry], sequential: bool = False, stop_on_error: bool = False) -> dict:
+        """
+        Run each call through the dispatcher and collect the outcomes.
+
+        Every call gets the same validation, limits, timeouts and caching as
+        if it had been sent on its own. Concurrent calls are started at most
+        ``dispatch.batch_concurrency`` at a time, and no faster than a
+        limited tool admits them, so a large batch waits for slots instead
+        of overflowing the tool's wait queue.
+
+        Args:
+            calls: Tool calls to execute.
+            sequential: Run the calls one after another instead of concurrently.
+            stop_on_error: With sequential, skip the remaining calls after the first failure.
+
+        Returns:
+            One entry per call, in request order, with either its result or its error.
+
+        Raises:
+            ValueError: If the batch is too large.
+        """
+        if len(calls) > batch_max_calls:
+            raise ValueError(f"A batch may contain at most {batch_max_calls} calls, got {len(calls)}")
+
+        async def run(entry: BatchCallEntry) -> Dict[str, Any]:
+            if entry.name == "batch_call":
+                return _error_entry(entry.name, ValueError("batch_call cannot be nested"))
+            try:
+                result = await server.dispatcher.dispatch(entry.name, entry.arguments)
+            except Exception as e:
+                return _error_entry(entry.name, e)
+            return {"name": entry.name, "ok": True, "result": result}
+
+        batch_slots = asyncio.Semaphore(batch_concurrency)
+        tool_slots: Dict[str, asyncio.Semaphore] = {}
+
+        def slots_for(name: str) -> asyncio.Semaphore:
+            """Return the semaphore pacing this batch's calls to one tool."""
+            slots = tool_slots.get(name)
+            if slots is None:
+                bound = batch_concurrency
+                func = server.dispatcher.get_tool(name)
+                if func is not None and name not in server.builtin_tools:
+                    bound = min(bound, server.dispatcher.admission.max_concurrent(name, func) or bound)
+                slots = tool_slots[name] = asyncio.Semaphore(bound)
+            return slots
+
+        async def run_paced(entry: BatchCallEntry) -> Dict[str, Any]:
+            # Wait for the tool first, so calls queued behind a limited tool don't hold batch slots
+            async with slots_for(entry.name), batch_slots:
+                return await run(entry)
+
+        if not sequential:
+            results = list(await asyncio.gather(*(run_paced(entry) for entry in calls)))
+        else:
+            results = []
+            for entry in calls:
+                if stop_on_error and results and not results[-1]["ok"]:
+                    results.append({"name": entry.name, "ok": False, "skipped": True})
+                    continue
+                results.append(await run(entry))
+
+        return {
+            "results": results,
+            "succeeded": sum(1 for r in results if r["ok"]),
+            "failed": sum(1 for r in results if not r["ok"])
+        }
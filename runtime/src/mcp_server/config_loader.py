@@ -7,17 +7,17 @@ configuration files for the MCP server.
 """
 import os
 import yaml
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-def load_config(project_root: str) -> Dict[str, Any]:
+def find_config_file(project_root: str) -> Optional[str]:
     """
-    Load server configuration from config file.
-    
+    Locate the configuration file that load_config reads.
+
     Args:
         project_root: The root directory of the project.
-    
+
     Returns:
-        A dictionary containing the configuration settings.
+        Path of the first existing config file, or None if there is none.
     """
     config_paths = [
         os.path.join(project_root, "config.yaml"),
@@ -27,12 +27,73 @@ def load_config(project_root: str) -> Dict[str, Any]:
     
     for path in config_paths:
         if os.path.exists(path):
-            with open(path, 'r') as f:
-                return yaml.safe_load(f)
+            return path
+    return None
+
+def load_config(project_root: str) -> Dict[str, Any]:
+    """
+    Load server configuration from config file.
+    
+    Args:
+        project_root: The root directory of the project.
+    
+    Returns:
+        A dictionary containing the configuration settings.
+    """
+    path = find_config_file(project_root)
+    if path is not None:
+        with open(path, 'r') as f:
+            return yaml.safe_load(f)
     
     # Default configuration if no file found
     return {
-        "host": {"name": "generic-mcp", "log_level": "INFO"},
+        "host": {
+            "name": "generic-mcp",
+            "log_level": "INFO",
+            "transport": {
+                "type": "stdio",
+                "host": "127.0.0.1",
+                "port": 8000,
+                "sse_path": "/sse",
+                "message_path": "/messages/",
+                "shutdown_timeout": 5,
+                "workers": 1
+            },
+            "dispatch": {
+                "max_workers": 8,
+                "timeout": None,
+                "process_workers": None,
+                "process_start_method": None,
+                "batch_max_calls": 100,
+                "batch_concurrency": 16,
+                "concurrency": {
+                    "max_concurrent": None,
+                    "max_queue": 0
+                },
+                "tools": {}
+            },
+            "serialization": {
+                "format": "compact"
+            },
+            "lazy_tools": {
+                "enabled": True,
+                "manifest": ".mcp_tool_manifest.json"
+            },
+            "startup": {
+                "parallel_load": True,
+                "max_workers": 4
+            },
+            "hot_reload": {
+                "enabled": False,
+                "interval": 1.0
+            },
+            "metrics": {
+                "prometheus_file": None,
+                "write_interval": 15,
+                "prometheus_host": "127.0.0.1",
+                "prometheus_port": None
+            }
+        },
         "core": {
             "common": "common/src",
             "runtime": "runtime/src"
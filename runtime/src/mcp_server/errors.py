@@ -0,0 +1,84 @@
+# runtime/src/mcp_server/errors.py
+"""
+Tool Error Module
+
+This module defines the structured errors the dispatcher raises when a
+call fails for reasons of the host rather than the tool itself. Their
+string form is a JSON object, so the error text returned to the client
+in an ``isError`` tool result can be parsed as well as read.
+"""
+import json
+from typing import Any, Dict
+
+class ToolError(Exception):
+    """
+    Base class for structured tool call errors.
+
+    Subclasses set ``code``; any keyword details are included in the
+    JSON payload alongside the code, tool name and message.
+    """
+    code = "tool_error"
+
+    def __init__(self, tool: str, message: str, **details: Any):
+        """
+        Initialize the error.
+
+        Args:
+            tool: Name of the tool whose call failed.
+            message: Human-readable description.
+            **details: Additional fields for the error payload.
+        """
+        super().__init__(message)
+        self.tool = tool
+        self.message = message
+        self.details = details
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return the error as plain data.
+
+        Returns:
+            A dict with the error code, tool, message and details.
+        """
+        return {"error": {"code": self.code, "tool": self.tool, "message": self.message, **self.details}}
+
+    def __str__(self) -> str:
+        return json.dumps(self.to_dict())
+
+class ToolTimeoutError(ToolError):
+    """Raised when a tool call exceeds its deadline."""
+    code = "timeout"
+
+    def __init__(self, tool: str, timeout: float):
+        """
+        Initialize the error.
+
+        Args:
+            tool: Name of the tool that timed out.
+            timeout: The deadline that was exceeded, in seconds.
+        """
+        super().__init__(tool, f"Tool '{tool}' did not complete within {timeout}s", timeout_seconds=timeout)
+        self.timeout = timeout
+
+class ToolOverloadedError(ToolError):
+    """Raised when a call is rejected because a concurrency limit and its wait queue are full."""
+    code = "overloaded"
+
+    def __init__(self, tool: str, limit: str, max_concurrent: int, max_queue: int):
+        """
+        Initialize the error.
+
+        Args:
+            tool: Name of the tool whose call was rejected.
+            limit: Which limit rejected the call ("tool" or "global").
+            max_concurrent: Concurrent calls allowed by that limit.
+            max_queue: Waiting calls allowed by that limit.
+        """
+        super().__init__(
+            tool,
+            f"Tool '{tool}' is overloaded ({limit} limit: {max_concurrent} running, {max_queue} queued); retry later",
+            limit=limit,
+            max_concurrent=max_concurrent,
+            max_queue=max_queue
+        )
+        self.limit = limit
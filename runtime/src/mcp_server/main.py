@@ -13,12 +13,15 @@ import asyncio
 script_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.abspath(os.path.join(script_dir, "..", "..", ".."))
 sys.path.insert(0, parent_dir)
+# common/src must precede the repo root so "common" resolves to the shared package
+sys.path.insert(0, os.path.join(parent_dir, "common", "src"))
 
 # Runtime imports
 from runtime.src.mcp_server.server_registry import ServerRegistry
 from runtime.src.mcp_server.logging_config import logger
 from runtime.src.mcp_server.config_loader import load_config, get_project_root
 from runtime.src.mcp_server.server import MCPServer
+from runtime.src.mcp_server.supervisor import Supervisor
 
 def main() -> None:
     """
@@ -32,16 +35,25 @@ def main() -> None:
     config = load_config(project_root)
 
     # Only bootstrap if NO_BOOTSTRAP is not set
+    startup_report = None
+    registry = None
     if os.getenv("NO_BOOTSTRAP"):
         logger.info("Bootstrapping disabled by NO_BOOTSTRAP environment variable")
     else:
         # Set up server registry and load components
         registry = ServerRegistry(project_root, config)
         registry.load_server_components()
+        startup_report = registry.startup_report
 
+    transport_config = config.get("host", {}).get("transport", {}) or {}
     try:
+        if transport_config.get("type") == "sse" and transport_config.get("workers", 1) != 1:
+            # Fork the workers now that every tool module has been imported
+            Supervisor(config, startup_report=startup_report, server_registry=registry).run()
+            return
+
         # Create and run the MCP server
-        mcp_server = MCPServer(config)
+        mcp_server = MCPServer(config, startup_report=startup_report, server_registry=registry)
         asyncio.run(mcp_server.serve())
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
@@ -0,0 +1,366 @@
+# runtime/src/mcp_server/metrics.py
+"""
+Tool Metrics Module
+
+This module records per-tool call counts, errors, timeouts,
+cancellations, rejections, coalesced calls, in-flight calls and
+latency histograms for the dispatcher, and renders them as a dict (for
+the host_metrics tool) or in the Prometheus text exposition format.
+
+A MetricsExporter can additionally publish the Prometheus text to a
+file on an interval and/or serve it over HTTP at /metrics. Both are
+configured under ``host.metrics`` in config.yaml.
+"""
+import asyncio
+import bisect
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from runtime.src.mcp_server.logging_config import get_logger
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+# Quantiles reported in snapshots
+SNAPSHOT_QUANTILES = (0.5, 0.95, 0.99)
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Recording is a binary search and an increment, so it is cheap enough
+    for every call. Quantiles are estimated by linear interpolation
+    within the bucket that contains them.
+    """
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        # One count per bucket plus the +Inf overflow bucket
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one observation."""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile between 0 and 1.
+
+        Returns:
+            The estimated value in seconds, or None if nothing was recorded.
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                # Values past the last bound are only known to be <= max
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                fraction = (rank - cumulative) / bucket_count
+                return min(lower + (upper - lower) * fraction, self.max)
+            cumulative += bucket_count
+        return self.max
+
+class ToolMetrics:
+    """Counters and latency histogram for one tool."""
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.rejected = 0
+        self.coalesced = 0
+        self.in_flight = 0
+        self.latency = LatencyHistogram()
+
+class MetricsRegistry:
+    """
+    Per-tool metrics recorded by the dispatcher.
+
+    All updates happen on the event loop thread, so no locking is needed.
+    """
+    def __init__(self):
+        self.tools: Dict[str, ToolMetrics] = {}
+        self.started_at = time.time()
+
+    def _tool(self, name: str) -> ToolMetrics:
+        metrics = self.tools.get(name)
+        if metrics is None:
+            metrics = self.tools[name] = ToolMetrics()
+        return metrics
+
+    def call_started(self, name: str) -> float:
+        """
+        Record the start of a call.
+
+        Args:
+            name: Name of the tool.
+
+        Returns:
+            The start timestamp to pass to call_finished.
+        """
+        self._tool(name).in_flight += 1
+        return time.perf_counter()
+
+    def call_finished(self, name: str, started: float, outcome: str = "ok") -> None:
+        """
+        Record the end of a call.
+
+        Args:
+            name: Name of the tool.
+            started: Timestamp returned by call_started.
+            outcome: "ok", "error", "timeout" (also counted as an error) or "cancelled".
+        """
+        metrics = self._tool(name)
+        metrics.in_flight -= 1
+        metrics.calls += 1
+        if outcome in ("error", "timeout"):
+            metrics.errors += 1
+        if outcome == "timeout":
+            metrics.timeouts += 1
+        elif outcome == "cancelled":
+            metrics.cancelled += 1
+        metrics.latency.observe(time.perf_counter() - started)
+
+    def call_rejected(self, name: str) -> None:
+        """
+        Record a call turned away by admission control before it started.
+
+        Args:
+            name: Name of the tool.
+        """
+        self._tool(name).rejected += 1
+
+    def call_coalesced(self, name: str) -> None:
+        """
+        Record a call that joined an identical call already running.
+
+        Args:
+            name: Name of the tool.
+        """
+        self._tool(name).coalesced += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return all metrics as plain data.
+
+        Returns:
+            Per-tool counters and latency quantiles in milliseconds.
+        """
+        tools = {}
+        for name, metrics in sorted(self.tools.items()):
+            latency = metrics.latency
+            entry = {
+                "calls": metrics.calls,
+                "errors": metrics.errors,
+                "error_rate": round(metrics.errors / metrics.calls, 4) if metrics.calls else 0.0,
+                "timeouts": metrics.timeouts,
+                "cancelled": metrics.cancelled,
+                "rejected": metrics.rejected,
+                "coalesced": metrics.coalesced,
+                "in_flight": metrics.in_flight,
+                "latency_ms": {
+                    "mean": round(latency.sum / latency.count * 1000, 3) if latency.count else None,
+                    "max": round(latency.max * 1000, 3) if latency.count else None,
+                }
+            }
+            for q in SNAPSHOT_QUANTILES:
+                value = latency.quantile(q)
+                entry["latency_ms"][f"p{int(q * 100)}"] = round(value * 1000, 3) if value is not None else None
+            tools[name] = entry
+        return {"uptime_seconds": round(time.time() - self.started_at, 1), "tools": tools}
+
+    def to_prometheus(self, labels: Optional[Dict[str, str]] = None) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Args:
+            labels: Extra labels added to every sample (e.g. the worker).
+
+        Returns:
+            The metrics text.
+        """
+        extra = "".join(f'{key}="{value}",' for key, value in sorted((labels or {}).items()))
+        lines = [
+            "# HELP mcp_tool_calls_total Completed tool calls.",
+            "# TYPE mcp_tool_calls_total counter",
+        ]
+        items = sorted(self.tools.items())
+        lines += [f'mcp_tool_calls_total{{{extra}tool="{name}"}} {m.calls}' for name, m in items]
+        lines += [
+            "# HELP mcp_tool_errors_total Tool calls that raised.",
+            "# TYPE mcp_tool_errors_total counter",
+        ]
+        lines += [f'mcp_tool_errors_total{{{extra}tool="{name}"}} {m.errors}' for name, m in items]
+        lines += [
+            "# HELP mcp_tool_timeouts_total Tool calls that exceeded their deadline.",
+            "# TYPE mcp_tool_timeouts_total counter",
+        ]
+        lines += [f'mcp_tool_timeouts_total{{{extra}tool="{name}"}} {m.timeouts}' for name, m in items]
+        lines += [
+            "# HELP mcp_tool_cancelled_total Tool calls cancelled by the client.",
+            "# TYPE mcp_tool_cancelled_total counter",
+        ]
+        lines += [f'mcp_tool_cancelled_total{{{extra}tool="{name}"}} {m.cancelled}' for name, m in items]
+        lines += [
+            "# HELP mcp_tool_rejected_total Tool calls rejected by admission control.",
+            "# TYPE mcp_tool_rejected_total counter",
+        ]
+        lines += [f'mcp_tool_rejected_total{{{extra}tool="{name}"}} {m.rejected}' for name, m in items]
+        lines += [
+            "# HELP mcp_tool_coalesced_total Tool calls that shared an identical running call.",
+            "# TYPE mcp_tool_coalesced_total counter",
+        ]
+        lines += [f'mcp_tool_coalesced_total{{{extra}tool="{name}"}} {m.coalesced}' for name, m in items]
+        lines += [
+            "# HELP mcp_tool_in_flight Tool calls currently executing.",
+            "# TYPE mcp_tool_in_flight gauge",
+        ]
+        lines += [f'mcp_tool_in_flight{{{extra}tool="{name}"}} {m.in_flight}' for name, m in items]
+        lines += [
+            "# HELP mcp_tool_duration_seconds Tool call latency.",
+            "# TYPE mcp_tool_duration_seconds histogram",
+        ]
+        for name, m in items:
+            histogram = m.latency
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+                cumulative += bucket_count
+                lines.append(f'mcp_tool_duration_seconds_bucket{{{extra}tool="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'mcp_tool_duration_seconds_bucket{{{extra}tool="{name}",le="+Inf"}} {histogram.count}')
+            lines.append(f'mcp_tool_duration_seconds_sum{{{extra}tool="{name}"}} {histogram.sum}')
+            lines.append(f'mcp_tool_duration_seconds_count{{{extra}tool="{name}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+def worker_metrics_file(path: str, pid: int) -> str:
+    """
+    Return the metrics file written by one worker process.
+
+    Args:
+        path: The configured ``prometheus_file``.
+        pid: Process id of the worker.
+
+    Returns:
+        The path with the pid inserted before the extension, e.g. metrics.1234.prom.
+    """
+    root, ext = os.path.splitext(path)
+    return f"{root}.{pid}{ext}"
+
+class MetricsExporter:
+    """
+    Publishes metrics in the Prometheus text format.
+
+    Depending on configuration, the text is rewritten to a file every
+    ``write_interval`` seconds and/or served over HTTP at /metrics.
+
+    An exporter running in a worker process writes its own file (see
+    worker_metrics_file), labels every sample with ``worker``, and
+    removes the file when it stops, so a collector that reads all the
+    files sees every worker's counters exactly once.
+    """
+    def __init__(self, metrics: MetricsRegistry, config: Dict[str, Any], worker: Optional[int] = None):
+        """
+        Initialize the exporter.
+
+        Args:
+            metrics: Metrics to publish.
+            config: Configuration dictionary for the server.
+            worker: Pid of the worker process this exporter runs in, if any.
+        """
+        self.metrics = metrics
+        self.logger = get_logger(config=config)
+        self.worker = worker
+        self.labels = {"worker": str(worker)} if worker is not None else None
+
+        metrics_config = config.get("host", {}).get("metrics", {}) or {}
+        self.prometheus_file = metrics_config.get("prometheus_file")
+        if self.prometheus_file and worker is not None:
+            self.prometheus_file = worker_metrics_file(self.prometheus_file, worker)
+        self.write_interval = metrics_config.get("write_interval", 15)
+        self.prometheus_host = metrics_config.get("prometheus_host", "127.0.0.1")
+        self.prometheus_port = metrics_config.get("prometheus_port")
+
+        self._writer_task: Optional[asyncio.Task] = None
+        self._http_server: Optional[asyncio.base_events.Server] = None
+
+    def write_file(self) -> None:
+        """Write the current metrics to the configured file atomically."""
+        tmp_path = f"{self.prometheus_file}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(self.metrics.to_prometheus(self.labels))
+            os.replace(tmp_path, self.prometheus_file)
+        except OSError as e:
+            self.logger.warning(f"Could not write metrics file {self.prometheus_file}: {e}")
+
+    async def _write_loop(self) -> None:
+        """Periodically rewrite the metrics file."""
+        while True:
+            self.write_file()
+            await asyncio.sleep(self.write_interval)
+
+    async def _handle_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer a single HTTP request with the metrics text."""
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            # Drain headers
+            while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status, body = "200 OK", self.metrics.to_prometheus(self.labels).encode("utf-8")
+            else:
+                status, body = "404 Not Found", b"Not Found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> None:
+        """Start the configured file writer and HTTP endpoint."""
+        if self.prometheus_file:
+            self._writer_task = asyncio.get_running_loop().create_task(self._write_loop())
+            self.logger.info(f"Writing Prometheus metrics to {self.prometheus_file}")
+        if self.prometheus_port is not None:
+            self._http_server = await asyncio.start_server(
+                self._handle_http, self.prometheus_host, self.prometheus_port
+            )
+            self.logger.info(f"Serving Prometheus metrics on http://{self.prometheus_host}:{self.prometheus_port}/metrics")
+
+    async def stop(self) -> None:
+        """Stop the exporter, writing the file one last time (a worker removes its file instead)."""
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            self._writer_task = None
+            if self.worker is None:
+                self.write_file()
+            else:
+                try:
+                    os.unlink(self.prometheus_file)
+                except OSError:
+                    pass
+        if self._http_server is not None:
+            self._http_server.close()
+            await self._http_server.wait_closed()
+            self._http_server = None
@@ -0,0 +1,87 @@
+# runtime/src/mcp_server/process_pool.py
+"""
+Process Pool Module
+
+This module runs tools declared with ``@mcp_tool(executor="process")``
+in a pool of worker processes, so CPU-bound tools neither hold the GIL
+of the host nor occupy its thread pool.
+
+Tool functions are not pickled. Each worker imports the tools modules
+when it starts and looks tools up by name in its own TOOLS_REGISTRY, so
+only the tool name, its module and the validated arguments cross the
+process boundary.
+"""
+import asyncio
+import importlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Optional
+
+
+def init_worker(modules: Iterable[str]) -> None:
+    """
+    Import tools modules in a new worker process.
+
+    Args:
+        modules: Modules that register the pool's tools.
+    """
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            # Reported when a tool from the module is called
+            pass
+
+def run_tool(module: str, name: str, arguments: Dict[str, Any]) -> Any:
+    """
+    Run a tool inside a worker process.
+
+    Args:
+        module: Module that registers the tool, imported if not already loaded.
+        name: Name of the tool.
+        arguments: Validated arguments for the tool.
+
+    Returns:
+        The value returned by the tool.
+
+    Raises:
+        ValueError: If the module does not provide the tool.
+    """
+    from common.mcp_tool_decorator import TOOLS_REGISTRY
+
+    func = TOOLS_REGISTRY.get(name)
+    if func is None:
+        importlib.import_module(module)
+        func = TOOLS_REGISTRY.get(name)
+        if func is None:
+            raise ValueError(f"Tool {name} is not provided by {module}")
+    if getattr(func, "_mcp_is_async", False):
+        return asyncio.run(func(**arguments))
+    return func(**arguments)
+
+def create_process_pool(
+    modules: Iterable[str],
+    max_workers: Optional[int] = None,
+    start_method: Optional[str] = None
+) -> ProcessPoolExecutor:
+    """
+    Create a process pool whose workers import the given tools modules.
+
+    Args:
+        modules: Tools modules to import in every worker.
+        max_workers: Number of worker processes; defaults to the CPU count.
+        start_method: multiprocessing start method; defaults to forkserver
+            where available (forking the threaded host directly is unsafe).
+
+    Returns:
+        The process pool.
+    """
+    if start_method is None:
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(
+        max_workers=max_workers or os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context(start_method),
+        initializer=init_worker,
+        initargs=(sorted(set(modules)),)
+    )
@@ -0,0 +1,174 @@
+# runtime/src/mcp_server/result_cache.py
+"""
+Result Cache Module
+
+This module memoizes the results of tools that opt in with
+``@mcp_tool(cache=...)``. Each tool gets its own LRU with the size and
+TTL from its CachePolicy. Lookups use the raw call arguments, so a hit
+returns before the tool is validated or run. A lazily loaded tool is
+still imported first, since its policy is only known once it is loaded.
+
+Only successful results are cached. Everything runs on the event loop
+thread, so no locking is needed.
+"""
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from runtime.src.mcp_server.logging_config import logger
+
+# Returned by ToolCache.get on a miss (None is a valid cached result)
+MISSING = object()
+
+def default_key(arguments: Dict[str, Any]) -> str:
+    """
+    Build a cache key from call arguments.
+
+    Args:
+        arguments: Raw call arguments.
+
+    Returns:
+        The arguments as canonical JSON.
+    """
+    return json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=repr)
+
+class ToolCache:
+    """LRU with per-entry expiry and hit/miss statistics for one tool."""
+    def __init__(self, policy: Any):
+        """
+        Initialize the cache.
+
+        Args:
+            policy: The tool's CachePolicy.
+        """
+        self.policy = policy
+        self._entries: "OrderedDict[Hashable, Tuple[Optional[float], Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def make_key(self, arguments: Dict[str, Any]) -> Optional[Hashable]:
+        """
+        Return the cache key for a call.
+
+        Args:
+            arguments: Raw call arguments.
+
+        Returns:
+            The key, or None if the call should bypass the cache.
+        """
+        if self.policy.key is None:
+            return default_key(arguments)
+        try:
+            return self.policy.key(arguments)
+        except Exception as e:
+            logger.debug(f"Cache key function failed, bypassing cache: {e}")
+            return None
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Look up a result.
+
+        Args:
+            key: Cache key from make_key.
+
+        Returns:
+            The cached result, or MISSING.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, value = entry
+            if expires is None or expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+            self.expirations += 1
+        self.misses += 1
+        return MISSING
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store a result, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key from make_key.
+            value: The tool's result.
+        """
+        ttl = self.policy.ttl
+        self._entries[key] = (time.monotonic() + ttl if ttl is not None else None, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.policy.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the cache statistics as plain data.
+
+        Returns:
+            Size, bounds, hit/miss counts and hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.policy.max_entries,
+            "ttl_seconds": self.policy.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+class ResultCache:
+    """The per-tool caches of a dispatcher."""
+    def __init__(self):
+        self._caches: Dict[str, ToolCache] = {}
+
+    def cache_for(self, name: str, func: Any) -> Optional[ToolCache]:
+        """
+        Return the cache for a tool, creating it on first use.
+
+        A tool re-registered with a different policy starts a fresh cache.
+
+        Args:
+            name: Name of the tool.
+            func: The registered tool function.
+
+        Returns:
+            The tool's cache, or None if the tool does not opt in.
+        """
+        policy = getattr(func, "_mcp_cache", None)
+        if policy is None:
+            return None
+        cache = self._caches.get(name)
+        if cache is None or cache.policy is not policy:
+            cache = self._caches[name] = ToolCache(policy)
+        return cache
+
+    def clear(self, name: Optional[str] = None) -> None:
+        """
+        Drop cached results.
+
+        Args:
+            name: Only clear this tool's cache; all caches if omitted.
+        """
+        for tool_name, cache in self._caches.items():
+            if name is None or tool_name == name:
+                cache.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return every tool cache's statistics.
+
+        Returns:
+            Statistics keyed by tool name.
+        """
+        return {name: cache.snapshot() for name, cache in sorted(self._caches.items())}
@@ -0,0 +1,100 @@
+# runtime/src/mcp_server/serializer.py
+"""
+Result Serializer Module
+
+This module turns tool results into the text payload returned by
+call_tool. The output format is configured under
+``host.serialization`` in config.yaml:
+
+- ``compact``: stdlib json without whitespace (default)
+- ``pretty``: stdlib json indented for readability
+- ``orjson``: orjson when it is installed, otherwise compact
+
+Pydantic models returned by a tool are serialised directly with
+``model_dump_json`` rather than being converted to a dict first.
+"""
+import json
+from typing import Any, Dict
+
+from pydantic import BaseModel
+
+from runtime.src.mcp_server.logging_config import get_logger
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+# Supported values for host.serialization.format
+SERIALIZATION_FORMATS = ("compact", "pretty", "orjson")
+DEFAULT_FORMAT = "compact"
+
+def _encode_default(value: Any) -> Any:
+    """
+    Fallback encoder for values json cannot handle natively.
+
+    Args:
+        value: The value being serialized.
+
+    Returns:
+        A JSON-compatible representation of the value.
+
+    Raises:
+        TypeError: If the value cannot be serialized.
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class ResultSerializer:
+    """
+    Serializes tool results to JSON text.
+
+    The format is resolved once at startup, so each call goes straight to
+    the selected encoder.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize the serializer.
+
+        Args:
+            config: Configuration dictionary for the server.
+
+        Raises:
+            ValueError: If the configured format is unknown.
+        """
+        self.logger = get_logger(config=config)
+
+        serialization_config = config.get("host", {}).get("serialization", {}) or {}
+        requested = serialization_config.get("format", DEFAULT_FORMAT)
+        if requested not in SERIALIZATION_FORMATS:
+            raise ValueError(
+                f"Unknown serialization format '{requested}', expected one of {', '.join(SERIALIZATION_FORMATS)}"
+            )
+
+        if requested == "orjson" and orjson is None:
+            self.logger.warning("orjson is not installed, falling back to compact JSON serialization")
+            requested = "compact"
+        self.format = requested
+
+    def serialize(self, result: Any) -> str:
+        """
+        Serialize a tool result.
+
+        Args:
+            result: The value returned by the tool.
+
+        Returns:
+            The result as JSON text.
+        """
+        indent = 2 if self.format == "pretty" else None
+
+        if isinstance(result, BaseModel):
+            return result.model_dump_json(indent=indent)
+
+        if self.format == "orjson":
+            return orjson.dumps(result, default=_encode_default).decode("utf-8")
+
+        if indent is not None:
+            return json.dumps(result, indent=indent, ensure_ascii=False, default=_encode_default)
+        return json.dumps(result, separators=(",", ":"), ensure_ascii=False, default=_encode_default)
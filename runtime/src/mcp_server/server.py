@@ -3,16 +3,53 @@ MCP Server Module
 
 This module provides the core MCP server functionality for 
 running tools and managing server operations.
+
+The server speaks MCP over stdio (one client per process) or over
+HTTP with Server-Sent Events, where one warm process with shared
+caches, pools and sessions serves many concurrent clients. The
+transport is selected under ``host.transport`` in config.yaml.
 """
 import asyncio
-import json
+import contextlib
 import importlib
+import socket
+import weakref
+from typing import Any, Dict, List, Optional
 
-from mcp.server import Server
+from mcp.server import Server, NotificationOptions
+from mcp.server.session import ServerSession
 from mcp.server.stdio import stdio_server
-from mcp.types import Tool, TextContent, ImageContent, EmbeddedResource
+from mcp.types import (
+    TextContent,
+    ImageContent,
+    EmbeddedResource,
+    ListToolsRequest,
+    ListToolsResult,
+    ServerResult,
+)
 
+from runtime.src.mcp_server.errors import ToolError
 from runtime.src.mcp_server.logging_config import get_logger, logger
+from runtime.src.mcp_server.tool_dispatcher import ToolDispatcher
+from runtime.src.mcp_server.serializer import ResultSerializer
+from runtime.src.mcp_server.builtin_tools import register_builtin_tools
+from runtime.src.mcp_server.metrics import MetricsExporter
+
+# Supported values of host.transport.type
+TRANSPORTS = ("stdio", "sse")
+
+class _AsgiEndpoint:
+    """
+    Wraps a coroutine as a raw ASGI app.
+
+    Starlette treats plain functions as request/response endpoints; the SSE
+    transport writes its own response, so it is routed as an ASGI app.
+    """
+    def __init__(self, handler):
+        self.handler = handler
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.handler(scope, receive, send)
 
 class MCPServer:
     """
@@ -20,14 +57,17 @@ class MCPServer:
     
     Handles tool discovery, registration, and execution.
     """
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, startup_report: Optional[dict] = None, server_registry: Optional[Any] = None):
         """
         Initialize the MCP server.
         
         Args:
             config: Configuration dictionary for the server.
+            startup_report: Optional component loading report from ServerRegistry.
+            server_registry: Optional ServerRegistry to watch for hot reload.
         """
         self.config = config
+        self.server_registry = server_registry
         # Reconfigure logger with the loaded config
         self.logger = get_logger(config=config)
         
@@ -36,6 +76,46 @@ class MCPServer:
         
         # Tools registry
         self.tools_registry = self._import_tools_registry()
+
+        # Host-provided tools, kept apart from the tool servers' registry
+        self.startup_report = startup_report or {}
+        from common.mcp_tool_decorator import ToolRegistry
+        self.builtin_tools = ToolRegistry()
+        register_builtin_tools(self)
+
+        # Dispatcher that runs tools off the event loop
+        self.dispatcher = ToolDispatcher(self.tools_registry, config, self.builtin_tools)
+
+        # Optional Prometheus file/endpoint for the dispatcher's metrics
+        self.metrics_exporter = MetricsExporter(self.dispatcher.metrics, config)
+
+        # Serializer for tool results
+        self.serializer = ResultSerializer(config)
+
+        # Transport settings
+        transport_config = config.get("host", {}).get("transport", {}) or {}
+        self.transport = transport_config.get("type", "stdio")
+        if self.transport not in TRANSPORTS:
+            raise ValueError(f"Unknown transport '{self.transport}', expected one of {', '.join(TRANSPORTS)}")
+        self.http_host = transport_config.get("host", "127.0.0.1")
+        self.http_port = transport_config.get("port", 8000)
+        self.sse_path = transport_config.get("sse_path", "/sse")
+        self.message_path = transport_config.get("message_path", "/messages/")
+        # Seconds to let open event streams finish before they are cancelled on shutdown
+        self.shutdown_timeout = transport_config.get("shutdown_timeout", 5)
+        # Additional Starlette routes for the SSE app (e.g. worker message forwarding)
+        self.extra_routes: List[Any] = []
+        # The running uvicorn server when serving over HTTP
+        self.http_server: Optional[Any] = None
+
+        # Client sessions to notify when the tool list changes
+        self._sessions: "weakref.WeakSet[ServerSession]" = weakref.WeakSet()
+
+        # Cached tools/list response, rebuilt only when the registry changes
+        self._tools_version: Optional[tuple] = None
+        self._tools_result: Optional[ServerResult] = None
+        self.tools_list_json: str = ""
+        self.refresh_tools()
     
     def _import_tools_registry(self) -> dict:
         """
@@ -59,27 +139,99 @@ class MCPServer:
         
         return tools_registry
     
-    async def serve(self) -> None:
+    def refresh_tools(self) -> bool:
         """
-        Run the MCP server with stdio communication.
-        
-        Sets up server, tool listing, and tool execution handlers.
+        Rebuild the cached tool list if the registry has changed.
+
+        The registry's version counter makes the check constant time, so it
+        is cheap enough to run on every request.
+
+        Returns:
+            True if the published tool list changed.
+        """
+        version = (getattr(self.tools_registry, "version", None), self.builtin_tools.version)
+        if self._tools_result is not None and version == self._tools_version:
+            return False
+
+        tools = [func._mcp_tool for func in self.builtin_tools.values()]
+        tools += [
+            func._mcp_tool for name, func in self.tools_registry.items()
+            if name not in self.builtin_tools
+        ]
+        result = ListToolsResult(tools=tools)
+        # Serialized tool list, compared across rebuilds to detect changes clients can see
+        tools_list_json = result.model_dump_json(by_alias=True, exclude_none=True)
+        # Swapping a lazy placeholder for its real function changes the
+        # registry but not what clients see
+        changed = tools_list_json != self.tools_list_json
+
+        self._tools_result = ServerResult(result)
+        self.tools_list_json = tools_list_json
+        self._tools_version = version
+
+        self.logger.debug(f"Tool list rebuilt ({len(tools)} tools)")
+        return changed
+
+    async def notify_tools_changed(self) -> None:
+        """Send tools/list_changed to every client session seen so far."""
+        for session in list(self._sessions):
+            try:
+                await session.send_tool_list_changed()
+            except Exception as e:
+                # The client has gone away; stop tracking it
+                self.logger.debug(f"Dropping session after failed notification: {e}")
+                self._sessions.discard(session)
+
+    async def tools_reloaded(self, report: Dict[str, Any]) -> None:
+        """
+        Publish tools swapped in by a hot reload.
+
+        Args:
+            report: The reload report from ServerRegistry.
+        """
+        # Process workers still hold the old modules
+        self.dispatcher.reset_process_pool()
+        if report.get("config_changed") and self.server_registry is not None:
+            self.dispatcher.admission.configure_servers(self.server_registry.config)
+        if self.refresh_tools():
+            await self.notify_tools_changed()
+
+    async def _sync_tools(self, server: Server) -> None:
+        """
+        Track the calling session and publish registry changes.
+
+        Args:
+            server: The low-level server handling the current request.
+        """
+        self._sessions.add(server.request_context.session)
+        if self.refresh_tools():
+            await self.notify_tools_changed()
+
+    def create_server(self) -> Server:
+        """
+        Create the low-level MCP server with tool listing and execution handlers.
+
+        Returns:
+            The configured server instance.
         """
         # Create MCP server instance
         server = Server(self.server_name)
 
-        @server.list_tools()
-        async def list_tools() -> list[Tool]:
+        async def list_tools(_: ListToolsRequest) -> ServerResult:
             """
             List available tools.
             
             Returns:
-                List of tool descriptions.
+                The cached tools/list result.
             """
+            await self._sync_tools(server)
             if not self.tools_registry:
                 self.logger.warning("No tools available")
-                return []
-            return [func._mcp_tool for func in self.tools_registry.values()]
+            return self._tools_result
+
+        # Registered directly rather than via @server.list_tools() so the
+        # cached result is returned as-is instead of being rebuilt per request
+        server.request_handlers[ListToolsRequest] = list_tools
 
         @server.call_tool()
         async def call_tool(name: str, arguments: dict) -> list[TextContent | ImageContent | EmbeddedResource]:
@@ -95,22 +247,116 @@ class MCPServer:
             
             Raises:
                 ValueError: If tool is not found or fails to execute.
+                ToolError: If the host rejected or aborted the call (e.g. a timeout);
+                    its text is a JSON error object.
             """
-            if name not in self.tools_registry:
+            await self._sync_tools(server)
+            if self.dispatcher.get_tool(name) is None:
                 raise ValueError(f"Tool not found: {name}")
             
-            func = self.tools_registry[name]
             try:
-                result = func(**arguments)
+                result = await self.dispatcher.dispatch(name, arguments)
+            except ToolError:
+                # Already structured and logged by the dispatcher
+                raise
             except Exception as e:
                 self.logger.error(f"Error processing tool '{name}': {e}", exc_info=True)
                 raise ValueError(f"Error processing tool '{name}': {str(e)}")
             
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return [TextContent(type="text", text=self.serializer.serialize(result))]
+
+        return server
+
+    def create_sse_app(self, server: Server, options: Any) -> Any:
+        """
+        Create the ASGI application for the SSE transport.
+
+        Clients open an event stream at ``sse_path`` and POST their messages
+        to ``message_path``; each stream is an independent MCP session
+        served by the same low-level server.
+
+        Args:
+            server: The low-level server from create_server.
+            options: Initialization options for each session.
+
+        Returns:
+            The Starlette application.
+        """
+        from mcp.server.sse import SseServerTransport
+        from starlette.applications import Starlette
+        from starlette.routing import Mount, Route
 
-        # Create initialization options
-        options = server.create_initialization_options()
+        sse = SseServerTransport(self.message_path)
+
+        async def handle_sse(scope, receive, send) -> None:
+            """Run one MCP session for the lifetime of an event stream."""
+            async with sse.connect_sse(scope, receive, send) as (read_stream, write_stream):
+                await server.run(read_stream, write_stream, options)
+
+        return Starlette(routes=[
+            Route(self.sse_path, endpoint=_AsgiEndpoint(handle_sse)),
+            Mount(self.message_path, app=sse.handle_post_message),
+            *self.extra_routes,
+        ])
+
+    async def _serve_sse(self, server: Server, options: Any, sockets: Optional[List[socket.socket]] = None) -> None:
+        """
+        Serve the SSE transport over HTTP until shut down.
+
+        Args:
+            server: The low-level server from create_server.
+            options: Initialization options for each session.
+            sockets: Already-listening sockets to serve on instead of binding host:port.
+        """
+        import uvicorn
+
+        app = self.create_sse_app(server, options)
+        self.http_server = uvicorn.Server(uvicorn.Config(
+            app,
+            host=self.http_host,
+            port=self.http_port,
+            log_config=None,
+            access_log=False,
+            lifespan="off",
+            timeout_graceful_shutdown=self.shutdown_timeout
+        ))
+        if sockets is None:
+            self.logger.info(f"Serving MCP over SSE at http://{self.http_host}:{self.http_port}{self.sse_path}")
+        try:
+            await self.http_server.serve(sockets=sockets)
+        finally:
+            self.http_server = None
+
+    async def serve(self, sockets: Optional[List[socket.socket]] = None) -> None:
+        """
+        Run the MCP server on the configured transport.
+
+        Args:
+            sockets: For the SSE transport, already-listening sockets to serve on.
+        """
+        server = self.create_server()
+
+        # Create initialization options, advertising tools/list_changed
+        options = server.create_initialization_options(
+            notification_options=NotificationOptions(tools_changed=True)
+        )
         
-        # Run server with stdio communication
-        async with stdio_server() as (read_stream, write_stream):
-            await server.run(read_stream, write_stream, options)
\ No newline at end of file
+        await self.metrics_exporter.start()
+        self.dispatcher.warm_process_pool()
+        watcher = None
+        if self.server_registry is not None and self.server_registry.hot_reload:
+            watcher = asyncio.create_task(self.server_registry.watch(self.tools_reloaded))
+        try:
+            if self.transport == "sse":
+                await self._serve_sse(server, options, sockets)
+            else:
+                # Run server with stdio communication
+                async with stdio_server() as (read_stream, write_stream):
+                    await server.run(read_stream, write_stream, options)
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await watcher
+            await self.metrics_exporter.stop()
+            self.dispatcher.shutdown(wait=False)
\ No newline at end of file
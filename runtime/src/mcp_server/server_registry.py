@@ -4,14 +4,42 @@ Server Registry Module for MCP Tool Servers
 
 This module provides a ServerRegistry class for managing 
 MCP tool servers and their components.
+
+With hot reload enabled, the registry also watches the tools packages
+and the config file, re-imports packages that changed and swaps their
+tools in TOOLS_REGISTRY without restarting the host.
 """
 
 import os
 import sys
+import time
+import asyncio
 import importlib
-from typing import List, Dict, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
 
+from runtime.src.mcp_server.config_loader import find_config_file, load_config
 from runtime.src.mcp_server.logging_config import get_logger, logger
+from runtime.src.mcp_server.tool_manifest import (
+    DEFAULT_MANIFEST_FILE,
+    load_manifest,
+    save_manifest,
+    record_module,
+    register_lazy_tools,
+    prune_manifest,
+    module_fingerprint,
+    tool_module,
+    import_lock,
+    import_tools,
+)
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size, or None where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
 
 class ServerRegistry:
     """Registry for managing MCP tool servers with components"""
@@ -25,6 +53,26 @@ class ServerRegistry:
         self.server_paths, self.components = self._setup_server_paths()
         self._setup_python_paths()
         self.loaded_modules = {}
+
+        # Lazy tool loading from the on-disk manifest
+        lazy_config = config.get("host", {}).get("lazy_tools", {}) or {}
+        self.lazy_tools = lazy_config.get("enabled", False)
+        self.manifest_path = os.path.join(project_root, lazy_config.get("manifest", DEFAULT_MANIFEST_FILE))
+        self.lazy_modules: Dict[str, int] = {}
+
+        # Startup loading options and the resulting per-module report
+        startup_config = config.get("host", {}).get("startup", {}) or {}
+        self.parallel_load = startup_config.get("parallel_load", False)
+        self.load_workers = startup_config.get("max_workers", 4)
+        self.startup_report: Dict[str, Any] = {"parallel": self.parallel_load, "total_seconds": 0.0, "modules": []}
+
+        # Hot reload: source fingerprints of each tools module and the config file's mtime
+        reload_config = config.get("host", {}).get("hot_reload", {}) or {}
+        self.hot_reload = reload_config.get("enabled", False)
+        self.reload_interval = reload_config.get("interval", 1.0)
+        self.config_path = find_config_file(project_root)
+        self._fingerprints: Dict[str, Optional[str]] = {}
+        self._config_mtime: Optional[int] = None
     
     def _setup_server_paths(self) -> Tuple[Dict[str, str], Dict[str, List[Dict[str, Any]]]]:
         """Process server configurations and resolve paths"""
@@ -120,20 +168,335 @@ class ServerRegistry:
     
     def load_server_components(self) -> None:
         """Load all enabled components from configured servers"""
-        for server_name, server_components in self.components.items():
-            for component in server_components:
-                module_name = component["module"]
-                component_type = component["type"]
-                auto_discovered = component.get("auto_discovered", False)
-                
-                # For testing, always try to import the module
-                try:
-                    logger.info(f"Loading {component_type} from {module_name}" + 
-                               (" (auto-discovered)" if auto_discovered else ""))
-                    self.loaded_modules[module_name] = importlib.import_module(module_name)
-                except ImportError as e:
-                    # If it's for testing, we'll catch the import error but not raise it
-                    if auto_discovered:
-                        logger.debug(f"Auto-discovered module {module_name} not found: {e}")
+        started = time.perf_counter()
+        manifest = load_manifest(self.manifest_path) if self.lazy_tools else None
+
+        entries: List[Dict[str, Any]] = []
+        if self.parallel_load and len(self.components) > 1:
+            # Servers are independent, so each one is loaded on its own worker;
+            # components within a server keep their configured order
+            with ThreadPoolExecutor(max_workers=self.load_workers, thread_name_prefix="mcp-load") as pool:
+                futures = [
+                    pool.submit(self._load_server, server_name, server_components, manifest)
+                    for server_name, server_components in self.components.items()
+                ]
+                for future in futures:
+                    entries.extend(future.result())
+        else:
+            for server_name, server_components in self.components.items():
+                entries.extend(self._load_server(server_name, server_components, manifest))
+
+        if manifest is not None:
+            self._update_manifest(manifest)
+        if self.hot_reload:
+            self._snapshot_sources()
+
+        self.startup_report = {
+            "parallel": self.parallel_load,
+            "total_seconds": round(time.perf_counter() - started, 4),
+            "modules": sorted(entries, key=lambda e: e["seconds"], reverse=True)
+        }
+        self._log_startup_report()
+
+    def _load_server(self, server_name: str, server_components: List[Dict[str, Any]],
+                     manifest: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Load one server's components in order and return their report entries"""
+        return [self._load_component(server_name, component, manifest) for component in server_components]
+
+    def _load_component(self, server_name: str, component: Dict[str, Any],
+                        manifest: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Import (or lazily register) one component and profile it"""
+        from common.mcp_tool_decorator import TOOLS_REGISTRY
+
+        module_name = component["module"]
+        component_type = component["type"]
+        auto_discovered = component.get("auto_discovered", False)
+        entry = {
+            "server": server_name,
+            "module": module_name,
+            "type": component_type,
+            "status": "loaded",
+            "seconds": 0.0,
+            "tools": 0,
+            "memory_delta_bytes": None
+        }
+
+        # Tools with a current manifest entry are registered without importing
+        if manifest is not None and component_type == "tools":
+            count = register_lazy_tools(manifest, module_name, TOOLS_REGISTRY)
+            if count is not None:
+                logger.info(f"Registered {count} tools from manifest for {module_name} (lazy)")
+                self.lazy_modules[module_name] = count
+                entry.update(status="lazy", tools=count)
+                return entry
+
+        # Process-wide RSS, so deltas overlap when servers load in parallel
+        rss_before = _rss_bytes()
+        started = time.perf_counter()
+        # For testing, always try to import the module
+        try:
+            logger.info(f"Loading {component_type} from {module_name}" + 
+                       (" (auto-discovered)" if auto_discovered else ""))
+            with import_lock(module_name):
+                self.loaded_modules[module_name], tools = import_tools(module_name)
+        except ImportError as e:
+            # If it's for testing, we'll catch the import error but not raise it
+            if auto_discovered:
+                logger.debug(f"Auto-discovered module {module_name} not found: {e}")
+                entry["status"] = "not_found"
+            else:
+                logger.warning(f"Failed to import {module_name}: {e}")
+                entry.update(status="failed", error=str(e))
+            entry["seconds"] = round(time.perf_counter() - started, 4)
+            return entry
+
+        entry["seconds"] = round(time.perf_counter() - started, 4)
+        rss_after = _rss_bytes()
+        if rss_before is not None and rss_after is not None:
+            entry["memory_delta_bytes"] = rss_after - rss_before
+        # Tools defined in submodules the module imports belong to it too
+        TOOLS_REGISTRY.update(tools)
+        entry["tools"] = len(tools)
+
+        if manifest is not None and component_type == "tools":
+            record_module(manifest, module_name, tools)
+        return entry
+
+    def _log_startup_report(self) -> None:
+        """Log the startup report, slowest modules first"""
+        report = self.startup_report
+        mode = "parallel" if report["parallel"] else "sequential"
+        logger.info(f"Loaded {len(report['modules'])} components in {report['total_seconds']:.3f}s ({mode})")
+        for entry in report["modules"]:
+            memory = entry["memory_delta_bytes"]
+            memory_text = f", {memory / 1024:.0f} KiB" if memory is not None else ""
+            logger.info(
+                f"  {entry['module']}: {entry['status']} in {entry['seconds']:.3f}s, "
+                f"{entry['tools']} tools{memory_text}"
+            )
+
+    def _update_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Write the manifest back if any module was imported or removed"""
+        tool_modules = self._tool_modules()
+        before = len(manifest["modules"])
+        prune_manifest(manifest, tool_modules)
+
+        imported = [m for m in tool_modules if m in self.loaded_modules]
+        if imported or len(manifest["modules"]) != before:
+            save_manifest(self.manifest_path, manifest)
+            logger.info(f"Tool manifest updated for {len(imported)} modules: {self.manifest_path}")
+
+    def _tool_modules(self) -> List[str]:
+        """Configured tools modules, in server order"""
+        return [
+            component["module"]
+            for server_components in self.components.values()
+            for component in server_components
+            if component["type"] == "tools"
+        ]
+
+    def _config_file_mtime(self) -> Optional[int]:
+        """Modification time of the config file, or None if there is none"""
+        if self.config_path is None:
+            return None
+        try:
+            return os.stat(self.config_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _snapshot_sources(self) -> None:
+        """Remember the current sources of every tools module and the config file"""
+        self._fingerprints = {module: module_fingerprint(module) for module in self._tool_modules()}
+        self._config_mtime = self._config_file_mtime()
+
+    def detect_changes(self) -> Tuple[List[str], bool]:
+        """
+        Compare the tools packages and the config file with the last snapshot.
+
+        Returns:
+            The tools modules whose package sources changed, and whether
+            the config file changed.
+        """
+        changed = []
+        for module, fingerprint in self._fingerprints.items():
+            current = module_fingerprint(module)
+            if current is not None and current != fingerprint:
+                changed.append(module)
+        return changed, self._config_file_mtime() != self._config_mtime
+
+    async def watch(self, on_reload: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None) -> None:
+        """
+        Poll for changes every reload interval until cancelled.
+
+        Args:
+            on_reload: Awaited with the report of each reload that changed something.
+        """
+        logger.info(f"Hot reload enabled, checking for changes every {self.reload_interval}s")
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                report = await self.reload()
+                if report is not None and on_reload is not None:
+                    await on_reload(report)
+            except Exception as e:
+                logger.error(f"Hot reload failed: {e}", exc_info=True)
+
+    async def reload(self) -> Optional[Dict[str, Any]]:
+        """
+        Apply changes to tools packages and the config file since the last check.
+
+        Changed packages are re-imported on a worker thread; their tools then
+        replace the old ones in TOOLS_REGISTRY in one update, so clients never
+        see a partial tool list. Packages that did not change are not touched,
+        so their servers keep their module state (connections, pools).
+
+        Returns:
+            A report of what was reloaded, or None if nothing changed.
+        """
+        plan = await asyncio.to_thread(self._prepare_reload)
+        if plan is None:
+            return None
+        return self._apply_reload(plan)
+
+    def _prepare_reload(self) -> Optional[Dict[str, Any]]:
+        """Detect changes, re-read the config and stage re-imported tools (runs off the event loop)"""
+        changed, config_changed = self.detect_changes()
+        if not changed and not config_changed:
+            return None
+
+        before = set(self._tool_modules())
+        failed: Dict[str, str] = {}
+        if config_changed:
+            try:
+                changed.extend(self._reload_config())
+            except Exception as e:
+                logger.warning(f"Ignoring config file change, it could not be loaded: {e}")
+                failed[self.config_path] = str(e)
+        current = self._tool_modules()
+        # Snapshot before importing, so edits made meanwhile are picked up next time
+        self._snapshot_sources()
+
+        # A package is purged and re-imported as a whole, so all of its tools modules reload together
+        packages = sorted({module.split(".")[0] for module in changed})
+        staged: Dict[str, Dict[str, Any]] = {}
+        reloaded: List[str] = []
+        for package in packages:
+            modules = [module for module in current if module.split(".")[0] == package]
+            try:
+                staged.update(self._stage_package(package, modules))
+                reloaded.extend(modules)
+            except Exception as e:
+                logger.warning(f"Keeping the previous version of {package}, reloading it failed: {e}")
+                for module in modules:
+                    failed[module] = str(e)
+
+        if self.lazy_tools and (reloaded or before != set(current)):
+            manifest = load_manifest(self.manifest_path)
+            for module in reloaded:
+                record_module(manifest, module, staged[module])
+            prune_manifest(manifest, current)
+            save_manifest(self.manifest_path, manifest)
+
+        return {
+            "reloaded": reloaded,
+            "removed": sorted(before - set(current)),
+            "failed": failed,
+            "config_changed": config_changed,
+            "tools": {name: func for tools in staged.values() for name, func in tools.items()}
+        }
+
+    def _reload_config(self) -> List[str]:
+        """
+        Re-read the config file and apply changes to its servers.
+
+        Settings under host: are kept as they were; they apply on restart.
+        Server concurrency settings are applied by MCPServer.tools_reloaded,
+        so a server is only re-imported when its location or tools modules
+        change and its module state (e.g. open sessions) survives other edits.
+
+        Returns:
+            Tools modules of servers that were added or moved.
+        """
+        def tools_modules(components: Dict[str, List[Dict[str, Any]]], name: str) -> List[str]:
+            return [component["module"] for component in components.get(name, []) if component["type"] == "tools"]
+
+        config = load_config(self.project_root)
+        if config.get("host") != self.config.get("host"):
+            logger.warning("Changes under host: in the config file take effect after a restart")
+
+        old_paths, old_components = self.server_paths, self.components
+        self.config = {**config, "host": self.config.get("host", {})}
+        self.server_paths, self.components = self._setup_server_paths()
+        self._setup_python_paths()
+        return [
+            module
+            for name in self.components
+            if self.server_paths.get(name) != old_paths.get(name)
+            or tools_modules(self.components, name) != tools_modules(old_components, name)
+            for module in tools_modules(self.components, name)
+        ]
+
+    def _stage_package(self, package: str, modules: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Re-import a package's tools modules without registering their tools.
+
+        Every module of the package is dropped from sys.modules first, so
+        edited siblings (e.g. models) are executed again too. If an import
+        fails, the previous modules are put back and the error is raised.
+
+        Returns:
+            The re-imported tools of each module, keyed by tool name.
+        """
+        def in_package(name: str) -> bool:
+            return name == package or name.startswith(package + ".")
+
+        # Lazy loads of the package's tools wait until it is consistent again
+        with import_lock(package):
+            previous = {name: module for name, module in list(sys.modules.items()) if in_package(name)}
+            for name in previous:
+                del sys.modules[name]
+            importlib.invalidate_caches()
+
+            staged: Dict[str, Dict[str, Any]] = {}
+            imported = {}
+            try:
+                for module_name in modules:
+                    logger.info(f"Reloading tools from {module_name}")
+                    if module_name in sys.modules:
+                        # Imported by a sibling just now; its tools were staged with that sibling
+                        imported[module_name], staged[module_name] = sys.modules[module_name], {}
                     else:
-                        logger.warning(f"Failed to import {module_name}: {e}")
\ No newline at end of file
+                        imported[module_name], staged[module_name] = import_tools(module_name)
+            except Exception:
+                for name in [name for name in list(sys.modules) if in_package(name)]:
+                    del sys.modules[name]
+                sys.modules.update(previous)
+                raise
+        self.loaded_modules.update(imported)
+        return staged
+
+    def _apply_reload(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+        """Swap staged tools into TOOLS_REGISTRY (on the event loop) and return the report"""
+        from common.mcp_tool_decorator import TOOLS_REGISTRY
+
+        replaced = set(plan["reloaded"]) | set(plan["removed"])
+        old_names = [name for name, func in list(TOOLS_REGISTRY.items()) if tool_module(func) in replaced]
+        TOOLS_REGISTRY.replace(old_names, plan["tools"])
+        for module in replaced:
+            self.lazy_modules.pop(module, None)
+        for module in plan["removed"]:
+            self.loaded_modules.pop(module, None)
+
+        report = {
+            "reloaded": plan["reloaded"],
+            "removed": plan["removed"],
+            "failed": plan["failed"],
+            "config_changed": plan["config_changed"],
+            "tools_added": sorted(set(plan["tools"]) - set(old_names)),
+            "tools_removed": sorted(set(old_names) - set(plan["tools"]))
+        }
+        logger.info(
+            f"Hot reload: {len(report['reloaded'])} modules reloaded, {len(report['removed'])} removed, "
+            f"{len(report['failed'])} failed; {len(plan['tools'])} tools swapped in"
+        )
+        return report
@@ -0,0 +1,73 @@
+# runtime/src/mcp_server/single_flight.py
+"""
+Single-Flight Module
+
+This module lets concurrent identical tool calls share one execution.
+The first caller for a key starts the call as a task; callers that
+arrive while it is running wait for the same task and receive the same
+result or exception.
+
+The shared task outlives any single caller: a caller that is cancelled
+stops waiting, and the task is only cancelled once every caller has
+gone. Everything runs on the event loop thread, so no locking is needed.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+class _Flight:
+    """A running shared call and the number of callers waiting on it."""
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """Coalesces concurrent calls that have the same key."""
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Number of shared calls currently running."""
+        return len(self._flights)
+
+    async def run(
+        self,
+        key: Hashable,
+        call: Callable[[], Awaitable[Any]],
+        on_join: Optional[Callable[[], None]] = None
+    ) -> Any:
+        """
+        Run a call, or join the identical call already running.
+
+        Args:
+            key: Identifies identical calls.
+            call: Starts the call; only invoked if none is running for ``key``.
+            on_join: Invoked when this caller joins a running call.
+
+        Returns:
+            The shared call's result.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(call()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._finish(key, flight))
+        elif on_join is not None:
+            on_join()
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller was cancelled; nobody wants the result any more
+                flight.task.cancel()
+
+    def _finish(self, key: Hashable, flight: _Flight) -> None:
+        """Forget a finished call so the next caller starts a new one."""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled():
+            # Mark the exception retrieved even if every caller left early
+            flight.task.exception()
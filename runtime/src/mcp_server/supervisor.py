@@ -0,0 +1,325 @@
+# runtime/src/mcp_server/supervisor.py
+"""
+Worker Supervisor Module
+
+This module runs the SSE transport in several pre-forked worker
+processes so CPU-bound tools scale across cores. The supervisor forks
+after ServerRegistry has imported every tool module, so workers share
+those modules copy-on-write, and all workers accept connections from
+one listening socket.
+
+An SSE session lives in the worker that accepted its event stream, but
+the client's POSTed messages may be accepted by any worker. Each worker
+therefore advertises a message path containing its pid and listens on a
+private Unix socket; a worker that receives a message for another
+worker forwards it there.
+
+Signals: SIGHUP starts a fresh set of workers and retires the old ones
+gracefully; SIGTERM or SIGINT shuts everything down. A worker that exits
+unexpectedly is replaced. Requires os.fork (POSIX only).
+
+Each worker keeps its own metrics. With ``host.metrics.prometheus_file``
+every worker writes its own file, labelled with its pid; a shared
+``prometheus_port`` cannot be bound by several workers and is rejected.
+"""
+import asyncio
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from runtime.src.mcp_server.logging_config import get_logger
+from runtime.src.mcp_server.metrics import MetricsExporter, worker_metrics_file
+from runtime.src.mcp_server.server import MCPServer
+
+# Seconds between checks for exited workers and pending signals
+POLL_INTERVAL = 0.2
+
+# A worker that exits sooner than this after starting is replaced only after the same delay,
+# so a worker that cannot start doesn't turn into a fork loop
+MIN_WORKER_LIFETIME = 1.0
+
+def worker_message_path(pid: int) -> str:
+    """
+    Return the SSE message path advertised by a worker.
+
+    Args:
+        pid: Process id of the worker.
+
+    Returns:
+        The message path, unique to the worker.
+    """
+    return f"/w{pid}/messages/"
+
+class MessageForwarder:
+    """
+    Forwards SSE messages to the worker that owns the session.
+
+    Runs inside each worker; one HTTP client per peer is kept open.
+    """
+    def __init__(self, run_dir: str):
+        """
+        Initialize the forwarder.
+
+        Args:
+            run_dir: Directory holding the workers' Unix sockets.
+        """
+        self.run_dir = run_dir
+        self._clients: Dict[int, Any] = {}
+
+    def socket_path(self, pid: int) -> str:
+        """Return the Unix socket path of a worker."""
+        return os.path.join(self.run_dir, f"worker-{pid}.sock")
+
+    async def forward(self, request: Any) -> Any:
+        """
+        Relay a POSTed message to its worker and return that worker's response.
+
+        Args:
+            request: The Starlette request for /w<pid>/messages/.
+
+        Returns:
+            The owning worker's response, or 404 if that worker is gone.
+        """
+        import httpx
+        from starlette.responses import Response
+
+        pid = request.path_params["worker"]
+        path = self.socket_path(pid)
+        if not os.path.exists(path):
+            return Response("Could not find session", status_code=404)
+
+        client = self._clients.get(pid)
+        if client is None:
+            client = self._clients[pid] = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(uds=path),
+                base_url="http://worker"
+            )
+        try:
+            response = await client.post(
+                request.url.path,
+                params=request.query_params,
+                content=await request.body(),
+                headers={"content-type": request.headers.get("content-type", "application/json")}
+            )
+        except httpx.HTTPError:
+            await self._clients.pop(pid).aclose()
+            return Response("Could not find session", status_code=404)
+        return Response(
+            response.content,
+            status_code=response.status_code,
+            media_type=response.headers.get("content-type")
+        )
+
+    async def close(self) -> None:
+        """Close every peer client."""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients = {}
+
+class Supervisor:
+    """
+    Pre-forks and supervises SSE worker processes.
+
+    Configured under ``host.transport``: ``workers`` is the number of
+    worker processes (0 for one per CPU), and ``host``/``port`` the
+    shared listening address.
+    """
+    def __init__(self, config: Dict[str, Any], startup_report: Optional[dict] = None,
+                 server_registry: Optional[Any] = None):
+        """
+        Initialize the supervisor.
+
+        Args:
+            config: Configuration dictionary for the server.
+            startup_report: Component loading report, passed to each worker's MCPServer.
+            server_registry: ServerRegistry inherited by each worker, which hot-reloads its own copy.
+        """
+        self.config = config
+        self.startup_report = startup_report
+        self.server_registry = server_registry
+        self.logger = get_logger(config=config)
+
+        transport_config = config.get("host", {}).get("transport", {}) or {}
+        self.worker_count = transport_config.get("workers") or os.cpu_count() or 1
+        self.http_host = transport_config.get("host", "127.0.0.1")
+        self.http_port = transport_config.get("port", 8000)
+        # Workers get this long to drain, plus a margin, before they are killed
+        self.stop_timeout = transport_config.get("shutdown_timeout", 5) + 5
+
+        metrics_config = config.get("host", {}).get("metrics", {}) or {}
+        self.metrics_file = metrics_config.get("prometheus_file")
+        if metrics_config.get("prometheus_port") is not None and self.worker_count > 1:
+            raise ValueError(
+                "host.metrics.prometheus_port cannot be shared by several workers; "
+                "use host.metrics.prometheus_file, which each worker writes separately"
+            )
+
+        self.listener: Optional[socket.socket] = None
+        self.run_dir: Optional[str] = None
+        # Current workers, and workers retired by a restart that are still draining
+        self.workers: List[int] = []
+        self.retiring: List[int] = []
+        self._started_at: Dict[int, float] = {}
+
+        self._stop_requested = False
+        self._restart_requested = False
+
+    def _request_stop(self, signum, frame) -> None:
+        self._stop_requested = True
+
+    def _request_restart(self, signum, frame) -> None:
+        self._restart_requested = True
+
+    def run(self) -> None:
+        """Bind the shared socket, fork the workers and supervise them until stopped."""
+        self.listener = socket.create_server((self.http_host, self.http_port), backlog=2048)
+        self.run_dir = tempfile.mkdtemp(prefix="mcp-workers-")
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGHUP, self._request_restart)
+
+        self.logger.info(
+            f"Serving MCP over SSE at http://{self.http_host}:{self.http_port} "
+            f"with {self.worker_count} workers (supervisor pid {os.getpid()})"
+        )
+        try:
+            self.workers = [self._spawn() for _ in range(self.worker_count)]
+            while not self._stop_requested:
+                if self._restart_requested:
+                    self._restart_requested = False
+                    self._restart()
+                self._reap()
+                time.sleep(POLL_INTERVAL)
+        finally:
+            self._stop_workers(self.workers + self.retiring)
+            self.listener.close()
+            shutil.rmtree(self.run_dir, ignore_errors=True)
+            self.logger.info("Supervisor stopped")
+
+    def _spawn(self) -> int:
+        """
+        Fork one worker.
+
+        Returns:
+            The worker's pid.
+        """
+        pid = os.fork()
+        if pid == 0:
+            self._worker_main()
+        self._started_at[pid] = time.monotonic()
+        self.logger.info(f"Started worker {pid}")
+        return pid
+
+    def _restart(self) -> None:
+        """Start a new set of workers, then retire the old ones gracefully."""
+        self.logger.info("Restarting workers")
+        old_workers = self.workers
+        self.workers = [self._spawn() for _ in range(self.worker_count)]
+        for pid in old_workers:
+            self._signal(pid, signal.SIGTERM)
+        self.retiring.extend(old_workers)
+
+    def _reap(self) -> None:
+        """Collect exited workers and replace any that exited unexpectedly."""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            lifetime = time.monotonic() - self._started_at.pop(pid, 0.0)
+            self._remove_metrics_file(pid)
+            if pid in self.retiring:
+                self.retiring.remove(pid)
+            elif pid in self.workers:
+                self.workers.remove(pid)
+                self.logger.warning(f"Worker {pid} exited unexpectedly (status {status}); replacing it")
+                if lifetime < MIN_WORKER_LIFETIME:
+                    time.sleep(MIN_WORKER_LIFETIME)
+                self.workers.append(self._spawn())
+
+    def _remove_metrics_file(self, pid: int) -> None:
+        """Remove the metrics file of a worker that exited, in case it could not."""
+        if not self.metrics_file:
+            return
+        try:
+            os.unlink(worker_metrics_file(self.metrics_file, pid))
+        except OSError:
+            pass
+
+    def _signal(self, pid: int, signum: int) -> None:
+        """Send a signal to a worker that may already have exited."""
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def _stop_workers(self, pids: List[int]) -> None:
+        """
+        Stop workers gracefully, killing any that outlast the stop timeout.
+
+        Args:
+            pids: Workers to stop.
+        """
+        for pid in pids:
+            self._signal(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.stop_timeout
+        remaining = set(pids)
+        while remaining and time.monotonic() < deadline:
+            for pid in list(remaining):
+                try:
+                    if os.waitpid(pid, os.WNOHANG)[0] != 0:
+                        remaining.discard(pid)
+                except ChildProcessError:
+                    remaining.discard(pid)
+            time.sleep(POLL_INTERVAL / 4)
+        for pid in remaining:
+            self.logger.warning(f"Worker {pid} did not stop in time; killing it")
+            self._signal(pid, signal.SIGKILL)
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.workers, self.retiring = [], []
+
+    def _worker_main(self) -> None:
+        """Run one worker process; never returns."""
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(signum, signal.SIG_DFL)
+        code = 0
+        try:
+            asyncio.run(self._serve_worker())
+        except Exception as e:
+            self.logger.error(f"Worker {os.getpid()} failed: {e}", exc_info=True)
+            code = 1
+        finally:
+            os._exit(code)
+
+    async def _serve_worker(self) -> None:
+        """Serve the SSE transport on the shared socket and this worker's Unix socket."""
+        from starlette.routing import Route
+
+        pid = os.getpid()
+        forwarder = MessageForwarder(self.run_dir)
+        private = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        private.bind(forwarder.socket_path(pid))
+        private.listen(128)
+
+        server = MCPServer(self.config, startup_report=self.startup_report, server_registry=self.server_registry)
+        server.message_path = worker_message_path(pid)
+        server.metrics_exporter = MetricsExporter(server.dispatcher.metrics, self.config, worker=pid)
+        server.extra_routes = [Route("/w{worker:int}/messages/", endpoint=forwarder.forward, methods=["POST"])]
+        try:
+            await server.serve(sockets=[self.listener, private])
+        finally:
+            await forwarder.close()
+            private.close()
+            try:
+                os.unlink(forwarder.socket_path(pid))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,403 @@
+# runtime/src/mcp_server/tool_dispatcher.py
+"""
+Tool Dispatcher Module
+
+This module provides the dispatch layer used by the MCP server to
+execute registered tools without blocking the asyncio event loop.
+Async tools are awaited natively on the loop, while synchronous tools
+are run on a bounded thread pool so that the loop remains free to
+service other requests. Arguments are validated once, before the tool
+runs, using the validator compiled by the @mcp_tool decorator, and
+every call is recorded in per-tool metrics.
+
+Calls can be given a deadline. When it passes, or when the client
+cancels the request, an async tool is cancelled where it awaits; a
+synchronous tool that already started cannot be interrupted, so its
+worker finishes in the background while the caller gets the error.
+
+Calls to server tools pass through admission control first: per-tool
+and host-wide concurrency limits with bounded wait queues reject
+excess calls immediately. Built-in host tools are exempt, so the
+diagnostics stay reachable under load.
+
+Tools declared with ``@mcp_tool(executor="process")`` run in a warm
+process pool instead, keeping CPU-bound work off the host's GIL.
+
+Tools listed from the tool manifest are placeholders until their first
+call, which imports the owning module on a worker thread so a heavy
+import does not stall other sessions.
+
+Tools that opt in with ``@mcp_tool(cache=...)`` have their results
+memoized; a cache hit is answered before admission, validation and
+execution. Tools declared with ``single_flight=True`` share one
+execution between concurrent calls with identical arguments.
+"""
+import asyncio
+import functools
+import inspect
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Any, Dict, Optional
+
+from runtime.src.mcp_server.admission import AdmissionController
+from runtime.src.mcp_server.errors import ToolOverloadedError, ToolTimeoutError
+from runtime.src.mcp_server.logging_config import get_logger
+from runtime.src.mcp_server.metrics import MetricsRegistry
+from runtime.src.mcp_server.process_pool import create_process_pool, run_tool
+from runtime.src.mcp_server.result_cache import MISSING, ResultCache, ToolCache, default_key
+from runtime.src.mcp_server.single_flight import SingleFlight
+from runtime.src.mcp_server.tool_manifest import tool_module
+
+# Default size of the shared worker pool for synchronous tools
+DEFAULT_MAX_WORKERS = 8
+
+class ToolDispatcher:
+    """
+    Dispatches tool calls to the event loop or to worker pools.
+
+    Coroutine tools are awaited directly. A shared thread pool serves
+    every synchronous tool by default. Tools listed under
+    ``host.dispatch.tools`` with their own ``max_workers`` get a
+    dedicated pool, which keeps slow tools from starving fast ones.
+
+    A call's deadline is the tool's ``timeout`` under ``host.dispatch.tools``,
+    else the ``timeout`` given to @mcp_tool, else ``host.dispatch.timeout``.
+    A timeout of None means no deadline.
+    """
+    def __init__(
+        self,
+        tools_registry: Dict[str, Any],
+        config: Dict[str, Any],
+        builtin_tools: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            tools_registry: Mapping of tool names to tool functions.
+            config: Configuration dictionary for the server.
+            builtin_tools: Optional mapping of host-provided tools, checked first.
+        """
+        self.tools_registry = tools_registry
+        self.builtin_tools = builtin_tools if builtin_tools is not None else {}
+        self.logger = get_logger(config=config)
+
+        dispatch_config = config.get("host", {}).get("dispatch", {}) or {}
+        self.max_workers = dispatch_config.get("max_workers", DEFAULT_MAX_WORKERS)
+        self.tool_overrides = dispatch_config.get("tools", {}) or {}
+        self.default_timeout = dispatch_config.get("timeout")
+        self.process_workers = dispatch_config.get("process_workers") or os.cpu_count() or 1
+        self.process_start_method = dispatch_config.get("process_start_method")
+
+        # Per-tool call counts, errors, in-flight calls and latency
+        self.metrics = MetricsRegistry()
+
+        # Per-tool and global concurrency limits
+        self.admission = AdmissionController(config)
+
+        # Memoized results of tools declared with cache=
+        self.results = ResultCache()
+
+        # Shared executions of tools declared with single_flight=True
+        self.flights = SingleFlight()
+
+        # One lazy import at a time per tools module
+        self._lazy_locks: Dict[str, asyncio.Lock] = {}
+
+        # Pools are created lazily on first use
+        self._default_executor: Optional[ThreadPoolExecutor] = None
+        self._tool_executors: Dict[str, ThreadPoolExecutor] = {}
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self, name: str) -> ThreadPoolExecutor:
+        """
+        Return the thread pool that should run the given tool.
+
+        Args:
+            name: Name of the tool.
+
+        Returns:
+            The dedicated pool for the tool if configured, otherwise the shared pool.
+        """
+        override = self.tool_overrides.get(name) or {}
+        max_workers = override.get("max_workers")
+        if max_workers:
+            executor = self._tool_executors.get(name)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix=f"mcp-tool-{name}"
+                )
+                self._tool_executors[name] = executor
+                self.logger.debug(f"Created dedicated pool for '{name}' ({max_workers} workers)")
+            return executor
+
+        if self._default_executor is None:
+            self._default_executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="mcp-tool"
+            )
+        return self._default_executor
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """
+        Return the process pool for tools declared with executor="process".
+
+        Returns:
+            The pool, created on first use with workers that import every
+            tools module known to the registry.
+        """
+        if self._process_pool is None:
+            modules = [tool_module(func) for func in self.tools_registry.values()]
+            self._process_pool = create_process_pool(modules, self.process_workers, self.process_start_method)
+            self.logger.debug(f"Created process pool ({self.process_workers} workers)")
+        return self._process_pool
+
+    def reset_process_pool(self) -> None:
+        """
+        Replace the process pool so its workers import reloaded tools modules.
+
+        Calls already submitted finish on the old workers.
+        """
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False)
+            self._process_pool = None
+        self.warm_process_pool()
+
+    def warm_process_pool(self) -> None:
+        """
+        Start the process pool's workers ahead of the first call.
+
+        Does nothing unless a loaded tool is declared with executor="process".
+        """
+        if not any(getattr(func, "_mcp_executor", None) == "process" for func in self.tools_registry.values()):
+            return
+        pool = self._get_process_pool()
+        # Workers are started on demand; one no-op task per worker starts them all
+        for _ in range(self.process_workers):
+            pool.submit(os.getpid)
+
+    def get_timeout(self, name: str, func: Any) -> Optional[float]:
+        """
+        Return the deadline for a call to the given tool.
+
+        Args:
+            name: Name of the tool.
+            func: The registered tool function.
+
+        Returns:
+            The timeout in seconds, or None for no deadline.
+        """
+        override = self.tool_overrides.get(name) or {}
+        if "timeout" in override:
+            return override["timeout"]
+        timeout = getattr(func, "_mcp_timeout", None)
+        return timeout if timeout is not None else self.default_timeout
+
+    def get_tool(self, name: str) -> Optional[Any]:
+        """
+        Look up a tool by name.
+
+        Args:
+            name: Name of the tool.
+
+        Returns:
+            The tool function, or None if no tool has that name.
+        """
+        func = self.builtin_tools.get(name)
+        return func if func is not None else self.tools_registry.get(name)
+
+    @staticmethod
+    def _is_async(func: Any) -> bool:
+        """
+        Determine whether a tool should be awaited on the event loop.
+
+        Args:
+            func: The registered tool function.
+
+        Returns:
+            True if the tool is a coroutine function.
+        """
+        return getattr(func, "_mcp_is_async", None) or inspect.iscoroutinefunction(func)
+
+    async def dispatch(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """
+        Execute a tool without blocking the event loop and return its result.
+
+        Args:
+            name: Name of the tool to execute.
+            arguments: Arguments for the tool.
+
+        Returns:
+            The value returned by the tool.
+
+        Raises:
+            ValueError: If the tool is not found or the arguments are invalid.
+            ToolTimeoutError: If the call exceeds its deadline.
+            ToolOverloadedError: If a concurrency limit and its wait queue are full.
+        """
+        func = self.get_tool(name)
+        if func is None:
+            raise ValueError(f"Tool not found: {name}")
+        if hasattr(func, "_mcp_lazy_import"):
+            func = await self._load_lazy(name, func)
+
+        cache = self.results.cache_for(name, func)
+        cache_key = cache.make_key(arguments or {}) if cache is not None else None
+        if cache_key is not None:
+            result = cache.get(cache_key)
+            if result is not MISSING:
+                self.metrics.call_finished(name, self.metrics.call_started(name))
+                return result
+
+        if getattr(func, "_mcp_single_flight", False):
+            return await self.flights.run(
+                (name, default_key(arguments or {})),
+                lambda: self._run(name, func, arguments, cache, cache_key),
+                on_join=lambda: self.metrics.call_coalesced(name)
+            )
+        return await self._run(name, func, arguments, cache, cache_key)
+
+    async def _load_lazy(self, name: str, placeholder: Any) -> Any:
+        """
+        Replace a manifest placeholder with its real function.
+
+        The module is imported on a worker thread; concurrent first calls
+        to one module's tools wait for a single import.
+
+        Args:
+            name: Name of the tool.
+            placeholder: The tool's LazyTool placeholder.
+
+        Returns:
+            The real tool function.
+
+        Raises:
+            ValueError: If the module cannot be imported or no longer provides the tool.
+        """
+        module = placeholder._mcp_lazy_module
+        lock = self._lazy_locks.setdefault(module, asyncio.Lock())
+        async with lock:
+            func = self.tools_registry.get(name)
+            if func is not None and not hasattr(func, "_mcp_lazy_import"):
+                # Loaded by a call that held the lock before us
+                return func
+            tools = await asyncio.to_thread(placeholder._mcp_lazy_import)
+            return placeholder._mcp_lazy_resolve(tools)
+
+    async def _run(
+        self,
+        name: str,
+        func: Any,
+        arguments: Dict[str, Any],
+        cache: Optional[ToolCache],
+        cache_key: Any
+    ) -> Any:
+        """
+        Admit, execute and record one call, caching its result if enabled.
+
+        Args:
+            name: Name of the tool.
+            func: The registered tool function.
+            arguments: Arguments for the tool.
+            cache: The tool's result cache, if any.
+            cache_key: Key to store the result under, or None.
+
+        Returns:
+            The value returned by the tool.
+        """
+        admission = nullcontext() if name in self.builtin_tools else self.admission.admit(name, func)
+        try:
+            async with admission:
+                started = self.metrics.call_started(name)
+                outcome = "error"
+                try:
+                    result = await self._execute(name, func, arguments)
+                    outcome = "ok"
+                    if cache_key is not None:
+                        cache.put(cache_key, result)
+                    return result
+                except ToolTimeoutError:
+                    outcome = "timeout"
+                    raise
+                except asyncio.CancelledError:
+                    # The client cancelled the request (or the host is shutting down)
+                    outcome = "cancelled"
+                    raise
+                finally:
+                    self.metrics.call_finished(name, started, outcome=outcome)
+        except ToolOverloadedError as e:
+            self.metrics.call_rejected(name)
+            self.logger.warning(f"Rejected call to '{name}': {e.limit} limit and queue are full")
+            raise
+
+    async def _execute(self, name: str, func: Any, arguments: Dict[str, Any]) -> Any:
+        """
+        Validate arguments and run a tool on the loop or a worker pool.
+
+        Args:
+            name: Name of the tool.
+            func: The registered tool function.
+            arguments: Arguments for the tool.
+
+        Returns:
+            The value returned by the tool.
+
+        Raises:
+            ToolTimeoutError: If the call exceeds its deadline.
+        """
+        # Validate once here with the validator compiled by @mcp_tool
+        validator = getattr(func, "_mcp_validator", None)
+        if validator is not None:
+            arguments = validator(arguments or {})
+
+        if getattr(func, "_mcp_executor", None) == "process":
+            loop = asyncio.get_running_loop()
+            call = loop.run_in_executor(
+                self._get_process_pool(),
+                functools.partial(run_tool, tool_module(func), name, arguments)
+            )
+        elif self._is_async(func):
+            call = func(**arguments)
+        else:
+            loop = asyncio.get_running_loop()
+            call = loop.run_in_executor(
+                self._get_executor(name),
+                functools.partial(func, **arguments)
+            )
+
+        timeout = self.get_timeout(name, func)
+        if timeout is None:
+            return await call
+        deadline = asyncio.timeout(timeout)
+        try:
+            async with deadline:
+                return await call
+        except TimeoutError:
+            # A TimeoutError raised by the tool itself passes through unchanged
+            if not deadline.expired():
+                raise
+            self.logger.warning(f"Tool '{name}' timed out after {timeout}s")
+            raise ToolTimeoutError(name, timeout) from None
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shut down all worker pools.
+
+        Args:
+            wait: Whether to wait for running tool calls to finish.
+        """
+        executors = list(self._tool_executors.values())
+        if self._default_executor is not None:
+            executors.append(self._default_executor)
+
+        if self._process_pool is not None:
+            executors.append(self._process_pool)
+
+        for executor in executors:
+            executor.shutdown(wait=wait)
+
+        self._default_executor = None
+        self._tool_executors = {}
+        self._process_pool = None
@@ -0,0 +1,303 @@
+# runtime/src/mcp_server/tool_manifest.py
+"""
+Tool Manifest Module
+
+This module caches tool metadata (name, description, input schema and
+owning module) on disk so the host can answer tools/list without
+importing every tools module at startup. Tools listed in the manifest
+are registered as lightweight LazyTool stubs; the owning module is only
+imported the first time one of its tools is called.
+
+Each module's entry carries a fingerprint of its package sources, so a
+stale entry is detected and the module is imported and re-recorded.
+
+A tools module owns the tools its import registers, including tools
+defined in submodules it imports; each is tagged with its owner
+(``_mcp_module``) so limits, manifests and reloads attribute it correctly.
+"""
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from mcp.types import Tool
+
+from runtime.src.mcp_server.logging_config import logger
+
+# Default manifest location, relative to the project root
+DEFAULT_MANIFEST_FILE = ".mcp_tool_manifest.json"
+
+# Bumped when the manifest layout changes
+MANIFEST_VERSION = 2
+
+# Locks serializing imports of a top-level package (lazy loads, hot reload)
+_IMPORT_LOCKS: Dict[str, threading.Lock] = {}
+_IMPORT_LOCKS_GUARD = threading.Lock()
+
+class LazyTool:
+    """
+    Placeholder for a tool whose module has not been imported yet.
+
+    Carries the cached Tool metadata so the tool can be listed, and loads
+    the real function on first use.
+    """
+    def __init__(self, tool: Tool, module: str, registry: Dict[str, Any], executor: str = "thread"):
+        """
+        Initialize the placeholder.
+
+        Args:
+            tool: Cached tool metadata.
+            module: Module that registers the tool when imported.
+            registry: Registry the module's tools are registered into.
+            executor: The tool's recorded executor hint, so process tools can be pre-warmed.
+        """
+        self.__name__ = tool.name
+        self._mcp_tool = tool
+        self._mcp_lazy_module = module
+        self._mcp_executor = executor
+        self._registry = registry
+
+    def _mcp_lazy_import(self) -> Dict[str, Any]:
+        """
+        Import the owning module and return the tools it registered.
+
+        Blocking; meant to run off the event loop. The tools are returned
+        rather than registered, so the registry is only changed by
+        _mcp_lazy_resolve on the loop.
+
+        Returns:
+            The module's tools, keyed by name.
+
+        Raises:
+            ValueError: If the module cannot be imported.
+        """
+        with import_lock(self._mcp_lazy_module):
+            try:
+                _, tools = import_tools(self._mcp_lazy_module)
+            except ImportError as e:
+                raise ValueError(f"Failed to import {self._mcp_lazy_module} for tool {self.__name__}: {e}")
+        logger.debug(f"Lazily loaded {self._mcp_lazy_module} for tool {self.__name__}")
+        return tools
+
+    def _mcp_lazy_resolve(self, tools: Dict[str, Any]) -> Any:
+        """
+        Register tools returned by _mcp_lazy_import and return the real tool function.
+
+        Args:
+            tools: The owning module's tools.
+
+        Returns:
+            The function registered under this tool's name.
+
+        Raises:
+            ValueError: If the module no longer provides the tool.
+        """
+        if tools:
+            self._registry.update(tools)
+        func = self._registry.get(self.__name__)
+        if func is None or isinstance(func, LazyTool):
+            raise ValueError(f"Tool {self.__name__} is no longer provided by {self._mcp_lazy_module}")
+        return func
+
+def import_lock(module_name: str) -> threading.Lock:
+    """
+    Return the lock serializing imports of a module's top-level package.
+
+    Args:
+        module_name: Dotted module name.
+
+    Returns:
+        The package's lock.
+    """
+    package = module_name.split(".")[0]
+    with _IMPORT_LOCKS_GUARD:
+        return _IMPORT_LOCKS.setdefault(package, threading.Lock())
+
+def import_tools(module_name: str) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Import a tools module and collect the tools it registers.
+
+    The tools are tagged with ``module_name`` but not added to any
+    registry; the caller does that. If the module was already imported,
+    the tools already registered for it are returned instead.
+
+    Args:
+        module_name: Dotted module name.
+
+    Returns:
+        The module and its tools, keyed by name.
+
+    Raises:
+        ImportError: If the module cannot be imported.
+    """
+    # common is put on sys.path by ServerRegistry, so it is imported on first use
+    from common.mcp_tool_decorator import TOOLS_REGISTRY, collect_registrations
+
+    if module_name in sys.modules:
+        tools = {
+            name: func for name, func in list(TOOLS_REGISTRY.items())
+            if tool_module(func) == module_name and not isinstance(func, LazyTool)
+        }
+        return sys.modules[module_name], tools
+
+    tools: Dict[str, Any] = {}
+    with collect_registrations(tools):
+        module = importlib.import_module(module_name)
+    for func in tools.values():
+        func._mcp_module = module_name
+    return module, tools
+
+def tool_module(func: Any) -> str:
+    """
+    Return the module that registers a tool.
+
+    Args:
+        func: A registered tool function or LazyTool placeholder.
+
+    Returns:
+        The dotted module name.
+    """
+    return getattr(func, "_mcp_lazy_module", None) or getattr(func, "_mcp_module", None) or func.__module__
+
+def module_fingerprint(module_name: str) -> Optional[str]:
+    """
+    Fingerprint the sources of the package that owns a module.
+
+    Every .py file in the package directory is included, so editing a
+    sibling module (e.g. the models behind a tool's schema) also
+    invalidates the entry. Only file metadata is read, not contents.
+
+    Args:
+        module_name: Dotted module name.
+
+    Returns:
+        A hex digest, or None if the module cannot be located.
+    """
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin or not os.path.exists(spec.origin):
+        return None
+
+    root = os.path.dirname(spec.origin)
+    digest = hashlib.sha1()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+        for filename in sorted(filenames):
+            if not filename.endswith(".py"):
+                continue
+            path = os.path.join(dirpath, filename)
+            stat = os.stat(path)
+            digest.update(f"{os.path.relpath(path, root)}:{stat.st_mtime_ns}:{stat.st_size}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    """
+    Read a manifest from disk.
+
+    Args:
+        path: Manifest file path.
+
+    Returns:
+        The manifest, or an empty manifest if the file is missing or unreadable.
+    """
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {"version": MANIFEST_VERSION, "modules": {}}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable tool manifest {path}: {e}")
+        return {"version": MANIFEST_VERSION, "modules": {}}
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "modules": {}}
+    return manifest
+
+def save_manifest(path: str, manifest: Dict[str, Any]) -> None:
+    """
+    Write a manifest to disk atomically.
+
+    The temporary file is unique, so processes sharing the manifest
+    (e.g. SSE workers) never write through each other's temporary file.
+
+    Args:
+        path: Manifest file path.
+        manifest: Manifest to write.
+    """
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(prefix=f"{os.path.basename(path)}.", suffix=".tmp", dir=os.path.dirname(path) or ".")
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write tool manifest {path}: {e}")
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+def record_module(manifest: Dict[str, Any], module_name: str, tools: Dict[str, Any]) -> None:
+    """
+    Record the tools an imported module registered.
+
+    Args:
+        manifest: Manifest to update in place.
+        module_name: The imported module.
+        tools: The tools its import registered, as returned by import_tools.
+    """
+    manifest["modules"][module_name] = {
+        "fingerprint": module_fingerprint(module_name),
+        "tools": [
+            func._mcp_tool.model_dump(mode="json", exclude_none=True)
+            for func in tools.values() if hasattr(func, "_mcp_tool")
+        ],
+        # Executor hints, so placeholders for process tools can pre-warm the pool
+        "executors": {
+            name: func._mcp_executor for name, func in tools.items()
+            if getattr(func, "_mcp_executor", "thread") != "thread"
+        }
+    }
+
+def register_lazy_tools(manifest: Dict[str, Any], module_name: str, registry: Dict[str, Any]) -> Optional[int]:
+    """
+    Register placeholders for a module's tools if its manifest entry is current.
+
+    Args:
+        manifest: Loaded manifest.
+        module_name: Tools module to register.
+        registry: Registry to add placeholders to.
+
+    Returns:
+        Number of tools registered, or None if the entry is missing or stale.
+    """
+    entry = manifest.get("modules", {}).get(module_name)
+    if not entry:
+        return None
+    fingerprint = module_fingerprint(module_name)
+    if fingerprint is None or entry.get("fingerprint") != fingerprint:
+        return None
+
+    executors = entry.get("executors", {})
+    for tool_data in entry.get("tools", []):
+        tool = Tool.model_validate(tool_data)
+        registry[tool.name] = LazyTool(tool, module_name, registry, executors.get(tool.name, "thread"))
+    return len(entry.get("tools", []))
+
+def prune_manifest(manifest: Dict[str, Any], modules: Iterable[str]) -> None:
+    """
+    Drop entries for modules that are no longer configured.
+
+    Args:
+        manifest: Manifest to update in place.
+        modules: Currently configured tools modules.
+    """
+    keep = set(modules)
+    for module_name in list(manifest["modules"]):
+        if module_name not in keep:
+            del manifest["modules"][module_name]
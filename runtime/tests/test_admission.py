@@ -0,0 +1,156 @@
+"""
+Tests for the admission control module
+"""
+import asyncio
+import json
+
+import pytest
+
+from runtime.src.mcp_server.admission import AdmissionController, ConcurrencyLimit
+from runtime.src.mcp_server.errors import ToolOverloadedError
+from runtime.src.mcp_server.tool_dispatcher import ToolDispatcher
+
+def make_config(concurrency=None, server_concurrency=None):
+    """Build a server configuration with optional global and per-server limits"""
+    host = {"name": "test-mcp", "log_level": "INFO"}
+    if concurrency is not None:
+        host["dispatch"] = {"concurrency": concurrency}
+    server = {"location": "src", "tools": {"module": "demo_server.tools"}}
+    if server_concurrency is not None:
+        server["concurrency"] = server_concurrency
+    return {"host": host, "mcp_servers": {"demo": server}}
+
+def make_tool(release):
+    """Build an async tool from the demo server that waits for an event"""
+    async def wait() -> dict:
+        await release.wait()
+        return {}
+    wait.__module__ = "demo_server.tools"
+    return wait
+
+@pytest.mark.asyncio
+async def test_limit_queues_in_order_and_rejects_when_full():
+    """Test that waiters are admitted FIFO and excess calls fail fast"""
+    limit = ConcurrencyLimit("tool", max_concurrent=1, max_queue=2)
+    order = []
+
+    async def call(label):
+        await limit.acquire("demo")
+        order.append(label)
+        await asyncio.sleep(0)
+        limit.release()
+
+    await limit.acquire("demo")
+    waiters = [asyncio.create_task(call(label)) for label in ("a", "b")]
+    await asyncio.sleep(0)
+    assert limit.waiting == 2
+
+    with pytest.raises(ToolOverloadedError) as excinfo:
+        await limit.acquire("demo")
+    assert json.loads(str(excinfo.value))["error"]["code"] == "overloaded"
+
+    limit.release()
+    await asyncio.gather(*waiters)
+    assert order == ["a", "b"]
+    assert limit.snapshot() == {"max_concurrent": 1, "max_queue": 2, "active": 0, "waiting": 0, "rejected": 1}
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    """Test that a call cancelled while queued frees its queue place"""
+    limit = ConcurrencyLimit("tool", max_concurrent=1, max_queue=1)
+    await limit.acquire("demo")
+    waiter = asyncio.create_task(limit.acquire("demo"))
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limit.waiting == 0
+
+    limit.release()
+    assert limit.active == 0
+
+def test_tool_limits_come_from_server_entry():
+    """Test per-tool overrides on top of a server's defaults"""
+    release = asyncio.Event()
+    controller = AdmissionController(make_config(server_concurrency={
+        "max_concurrent": 4,
+        "max_queue": 8,
+        "tools": {"heavy": {"max_concurrent": 1}}
+    }))
+    tool = make_tool(release)
+
+    assert controller._tool_limit("heavy", tool).max_concurrent == 1
+    assert controller._tool_limit("heavy", tool).max_queue == 8
+    assert controller._tool_limit("light", tool).max_concurrent == 4
+
+    def other() -> dict:
+        return {}
+    assert controller._tool_limit("other", other) is None
+    assert controller.global_limit is None
+
+@pytest.mark.asyncio
+async def test_dispatcher_rejects_burst_beyond_queue():
+    """Test that a burst against a limited tool is partly queued and partly rejected"""
+    release = asyncio.Event()
+    config = make_config(server_concurrency={"max_concurrent": 1, "max_queue": 1})
+    dispatcher = ToolDispatcher({"wait": make_tool(release)}, config)
+
+    running = asyncio.create_task(dispatcher.dispatch("wait", {}))
+    queued = asyncio.create_task(dispatcher.dispatch("wait", {}))
+    await asyncio.sleep(0)
+
+    with pytest.raises(ToolOverloadedError):
+        await dispatcher.dispatch("wait", {})
+
+    release.set()
+    assert await asyncio.gather(running, queued) == [{}, {}]
+    metrics = dispatcher.metrics.tools["wait"]
+    assert (metrics.calls, metrics.rejected, metrics.errors) == (2, 1, 0)
+
+@pytest.mark.asyncio
+async def test_global_limit_spares_builtin_tools():
+    """Test that the host-wide limit applies to server tools but not builtins"""
+    release = asyncio.Event()
+
+    async def diagnostics() -> dict:
+        return {"ok": True}
+
+    dispatcher = ToolDispatcher(
+        {"wait": make_tool(release)},
+        make_config(concurrency={"max_concurrent": 1, "max_queue": 0}),
+        builtin_tools={"diagnostics": diagnostics}
+    )
+    running = asyncio.create_task(dispatcher.dispatch("wait", {}))
+    await asyncio.sleep(0)
+
+    with pytest.raises(ToolOverloadedError) as excinfo:
+        await dispatcher.dispatch("wait", {})
+    assert excinfo.value.limit == "global"
+    assert await dispatcher.dispatch("diagnostics", {}) == {"ok": True}
+
+    release.set()
+    await running
+    assert dispatcher.admission.snapshot()["global"]["active"] == 0
+
+def test_reconfigured_servers_rebuild_only_changed_limits():
+    """Test that a reloaded config replaces changed server limits and keeps the rest"""
+    release = asyncio.Event()
+    controller = AdmissionController(make_config(server_concurrency={"max_concurrent": 4}))
+    tool = make_tool(release)
+
+    def other() -> dict:
+        return {}
+    other.__module__ = "other_server.tools"
+
+    kept = controller._tool_limit("wait", tool)
+    assert controller._tool_limit("other", other) is None
+
+    controller.configure_servers(make_config(server_concurrency={"max_concurrent": 4}))
+    assert controller._tool_limit("wait", tool) is kept
+
+    config = make_config(server_concurrency={"max_concurrent": 1})
+    config["mcp_servers"]["other"] = {"tools": {"module": "other_server.tools"}, "concurrency": {"max_concurrent": 3}}
+    controller.configure_servers(config)
+    assert controller._tool_limit("wait", tool).max_concurrent == 1
+    assert controller._tool_limit("other", other).max_concurrent == 3
@@ -0,0 +1,39 @@
+"""
+Tests for the server entry point
+"""
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+INITIALIZE_REQUEST = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "smoke-test", "version": "0"},
+    },
+}
+
+
+def test_main_starts_over_stdio():
+    """Test that main.py starts and answers initialize when run the way the Makefile does."""
+    env = {**os.environ, "PYTHONPATH": "."}
+    result = subprocess.run(
+        [sys.executable, "runtime/src/mcp_server/main.py"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        input=json.dumps(INITIALIZE_REQUEST) + "\n",
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+    assert "Traceback" not in result.stderr, result.stderr
+    response = json.loads(result.stdout.splitlines()[0])
+    assert response["id"] == 1
+    assert response["result"]["serverInfo"]["name"]
@@ -0,0 +1,111 @@
+"""
+Tests for the tool metrics module
+"""
+import asyncio
+
+import pytest
+
+from runtime.src.mcp_server.metrics import LatencyHistogram, MetricsRegistry, MetricsExporter, worker_metrics_file
+from runtime.src.mcp_server.tool_dispatcher import ToolDispatcher
+
+def make_config(metrics=None):
+    """Build a minimal server configuration with optional metrics settings"""
+    host = {"name": "test-mcp", "log_level": "INFO"}
+    if metrics is not None:
+        host["metrics"] = metrics
+    return {"host": host, "mcp_servers": {}}
+
+def test_histogram_quantiles():
+    """Test quantile estimates from bucketed latencies"""
+    histogram = LatencyHistogram()
+    for _ in range(90):
+        histogram.observe(0.004)
+    for _ in range(10):
+        histogram.observe(0.8)
+
+    assert histogram.count == 100
+    assert 0.0025 <= histogram.quantile(0.5) <= 0.005
+    assert 0.5 <= histogram.quantile(0.95) <= 0.8
+    assert histogram.quantile(0.99) <= histogram.max
+    assert LatencyHistogram().quantile(0.5) is None
+
+@pytest.mark.asyncio
+async def test_dispatcher_records_calls_errors_and_in_flight():
+    """Test that dispatch updates per-tool metrics"""
+    release = asyncio.Event()
+
+    async def wait() -> dict:
+        await release.wait()
+        return {}
+
+    async def fail() -> dict:
+        raise RuntimeError("boom")
+
+    dispatcher = ToolDispatcher({"wait": wait, "fail": fail}, make_config())
+    task = asyncio.create_task(dispatcher.dispatch("wait", {}))
+    await asyncio.sleep(0)
+    assert dispatcher.metrics.tools["wait"].in_flight == 1
+
+    release.set()
+    await task
+    with pytest.raises(RuntimeError):
+        await dispatcher.dispatch("fail", {})
+
+    snapshot = dispatcher.metrics.snapshot()["tools"]
+    assert snapshot["wait"]["calls"] == 1
+    assert snapshot["wait"]["in_flight"] == 0
+    assert snapshot["wait"]["latency_ms"]["p50"] is not None
+    assert snapshot["fail"]["errors"] == 1
+    assert snapshot["fail"]["error_rate"] == 1.0
+
+def test_prometheus_text_format():
+    """Test the Prometheus exposition output"""
+    metrics = MetricsRegistry()
+    metrics.call_finished("echo", metrics.call_started("echo"))
+    text = metrics.to_prometheus()
+
+    assert "# TYPE mcp_tool_duration_seconds histogram" in text
+    assert 'mcp_tool_calls_total{tool="echo"} 1' in text
+    assert 'mcp_tool_duration_seconds_bucket{tool="echo",le="+Inf"} 1' in text
+    assert 'mcp_tool_duration_seconds_count{tool="echo"} 1' in text
+
+@pytest.mark.asyncio
+async def test_exporter_writes_file_and_serves_http(tmp_path):
+    """Test the Prometheus file and HTTP endpoint"""
+    metrics = MetricsRegistry()
+    metrics.call_finished("echo", metrics.call_started("echo"))
+    path = tmp_path / "metrics.prom"
+    exporter = MetricsExporter(metrics, make_config({"prometheus_file": str(path), "prometheus_port": 0}))
+
+    await exporter.start()
+    try:
+        port = exporter._http_server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+    finally:
+        await exporter.stop()
+
+    assert response.startswith(b"HTTP/1.1 200 OK")
+    assert b'mcp_tool_calls_total{tool="echo"} 1' in response
+    assert 'mcp_tool_calls_total{tool="echo"} 1' in path.read_text()
+
+@pytest.mark.asyncio
+async def test_worker_exporter_writes_own_labelled_file(tmp_path):
+    """Test that a worker's exporter uses its own file, labels samples and cleans up"""
+    metrics = MetricsRegistry()
+    metrics.call_finished("echo", metrics.call_started("echo"))
+    path = tmp_path / "metrics.prom"
+    exporter = MetricsExporter(metrics, make_config({"prometheus_file": str(path)}), worker=1234)
+    worker_path = tmp_path / "metrics.1234.prom"
+    assert worker_metrics_file(str(path), 1234) == str(worker_path)
+
+    await exporter.start()
+    await asyncio.sleep(0)
+    assert 'mcp_tool_calls_total{worker="1234",tool="echo"} 1' in worker_path.read_text()
+    await exporter.stop()
+
+    assert not worker_path.exists()
+    assert not path.exists()
@@ -0,0 +1,75 @@
+"""
+Tests for the process pool module
+"""
+import os
+import sys
+
+import pytest
+
+from common.mcp_tool_decorator import TOOLS_REGISTRY, mcp_tool
+from runtime.src.mcp_server.tool_dispatcher import ToolDispatcher
+
+TOOLS_SOURCE = '''
+import os
+from common.mcp_tool_decorator import mcp_tool
+
+@mcp_tool(name="process_demo_sum", description="CPU-bound sum", executor="process")
+def process_demo_sum(n: int) -> dict:
+    return {"sum": sum(range(n)), "pid": os.getpid()}
+
+@mcp_tool(name="process_demo_async", description="Async tool in a worker", executor="process")
+async def process_demo_async(n: int) -> dict:
+    return {"double": n * 2, "pid": os.getpid()}
+'''
+
+@pytest.fixture
+def process_tools(tmp_path):
+    """Create and import a tools module whose tools run in worker processes"""
+    (tmp_path / "process_demo_tools.py").write_text(TOOLS_SOURCE)
+    sys.path.insert(0, str(tmp_path))
+    import process_demo_tools
+    yield process_demo_tools
+
+    for name in ("process_demo_sum", "process_demo_async"):
+        TOOLS_REGISTRY.pop(name, None)
+    sys.modules.pop("process_demo_tools", None)
+    sys.path.remove(str(tmp_path))
+
+def make_config():
+    """Build a server configuration with a small process pool"""
+    return {"host": {"name": "test-mcp", "log_level": "INFO", "dispatch": {"process_workers": 2}}, "mcp_servers": {}}
+
+@pytest.mark.asyncio
+async def test_process_tools_run_in_worker_processes(process_tools):
+    """Test that process tools run outside the host process with validated arguments"""
+    dispatcher = ToolDispatcher(TOOLS_REGISTRY, make_config())
+    try:
+        dispatcher.warm_process_pool()
+        result = await dispatcher.dispatch("process_demo_sum", {"n": "1000"})
+        async_result = await dispatcher.dispatch("process_demo_async", {"n": 21})
+    finally:
+        dispatcher.shutdown()
+
+    assert result["sum"] == sum(range(1000))
+    assert result["pid"] != os.getpid()
+    assert async_result == {"double": 42, "pid": async_result["pid"]}
+    assert async_result["pid"] != os.getpid()
+
+@pytest.mark.asyncio
+async def test_thread_tools_do_not_start_a_process_pool():
+    """Test that the pool is only created when a process tool exists"""
+    def local() -> dict:
+        return {}
+
+    dispatcher = ToolDispatcher({"local": local}, make_config())
+    dispatcher.warm_process_pool()
+    try:
+        assert await dispatcher.dispatch("local", {}) == {}
+    finally:
+        dispatcher.shutdown()
+    assert dispatcher._process_pool is None
+
+def test_unknown_executor_is_rejected():
+    """Test executor validation in the decorator"""
+    with pytest.raises(ValueError, match="executor"):
+        mcp_tool(name="bad_executor", description="bad", executor="gpu")
@@ -0,0 +1,98 @@
+"""
+Tests for the result cache module
+"""
+import time
+
+import pytest
+from pydantic import BaseModel
+
+from common.mcp_tool_decorator import ArgumentValidator, CachePolicy, ToolRegistry, mcp_tool
+from runtime.src.mcp_server.result_cache import MISSING, ToolCache
+from runtime.src.mcp_server.tool_dispatcher import ToolDispatcher
+
+def make_config():
+    """Build a minimal server configuration"""
+    return {"host": {"name": "test-mcp", "log_level": "INFO"}, "mcp_servers": {}}
+
+def test_lru_evicts_least_recently_used():
+    """Test LRU ordering and eviction counts"""
+    cache = ToolCache(CachePolicy(ttl=None, max_entries=2))
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    stats = cache.snapshot()
+    assert (stats["entries"], stats["evictions"], stats["hits"], stats["misses"]) == (2, 1, 3, 1)
+
+def test_entries_expire_after_ttl(monkeypatch):
+    """Test that entries older than the TTL are dropped"""
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = ToolCache(CachePolicy(ttl=1.0))
+    cache.put("a", None)
+
+    assert cache.get("a") is None
+    now[0] += 1.5
+    assert cache.get("a") is MISSING
+    assert cache.snapshot()["expirations"] == 1
+
+def test_key_function_can_bypass_cache():
+    """Test custom keys and that a None key skips the cache"""
+    cache = ToolCache(CachePolicy(key=lambda args: args.get("zone")))
+
+    assert cache.make_key({"zone": "UTC", "ignored": 1}) == "UTC"
+    assert cache.make_key({}) is None
+    assert ToolCache(CachePolicy()).make_key({"b": 1, "a": 2}) == '{"a":2,"b":1}'
+
+class SquareInput(BaseModel):
+    x: int
+
+@pytest.mark.asyncio
+async def test_dispatcher_serves_hits_without_running_or_validating():
+    """Test that a repeated call is answered from the cache"""
+    calls = []
+    registry = ToolRegistry()
+
+    @mcp_tool(name="square", description="Square a number", registry=registry, cache=True)
+    async def square(x: int) -> dict:
+        calls.append(x)
+        return {"square": x * x}
+
+    validations = []
+    validator = registry["square"]._mcp_validator
+    registry["square"]._mcp_validator = lambda args: validations.append(args) or validator(args)
+
+    dispatcher = ToolDispatcher(registry, make_config())
+    assert await dispatcher.dispatch("square", {"x": 3}) == {"square": 9}
+    assert await dispatcher.dispatch("square", {"x": 3}) == {"square": 9}
+    assert await dispatcher.dispatch("square", {"x": 4}) == {"square": 16}
+
+    assert calls == [3, 4]
+    assert len(validations) == 2
+    stats = dispatcher.results.snapshot()["square"]
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+    assert dispatcher.metrics.tools["square"].calls == 3
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached():
+    """Test that failed calls run again"""
+    calls = []
+
+    def flaky(x: int) -> dict:
+        calls.append(x)
+        raise RuntimeError("device busy")
+    flaky._mcp_cache = CachePolicy()
+    flaky._mcp_validator = ArgumentValidator("flaky", SquareInput)
+
+    dispatcher = ToolDispatcher({"flaky": flaky}, make_config())
+    try:
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await dispatcher.dispatch("flaky", {"x": 1})
+    finally:
+        dispatcher.shutdown()
+
+    assert calls == [1, 1]
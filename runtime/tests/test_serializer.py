@@ -0,0 +1,66 @@
+"""
+Tests for the result serializer module
+"""
+import json
+
+import pytest
+from pydantic import BaseModel
+
+from runtime.src.mcp_server import serializer as serializer_module
+from runtime.src.mcp_server.serializer import ResultSerializer
+
+def make_config(serialization=None):
+    """Build a minimal server configuration with optional serialization settings"""
+    host = {"name": "test-mcp", "log_level": "INFO"}
+    if serialization is not None:
+        host["serialization"] = serialization
+    return {"host": host, "mcp_servers": {}}
+
+class Sample(BaseModel):
+    name: str
+    count: int
+
+def test_default_format_is_compact():
+    """Test that results are serialized without whitespace by default"""
+    serializer = ResultSerializer(make_config())
+
+    assert serializer.format == "compact"
+    assert serializer.serialize({"a": [1, 2], "b": "é"}) == '{"a":[1,2],"b":"é"}'
+
+def test_pretty_format_matches_indented_json():
+    """Test that the pretty format keeps the indented output"""
+    serializer = ResultSerializer(make_config({"format": "pretty"}))
+    result = {"a": [1, 2], "b": "text"}
+
+    assert serializer.serialize(result) == json.dumps(result, indent=2)
+
+def test_pydantic_results_are_serialized_directly():
+    """Test that Pydantic models are serialized without a dict round trip"""
+    serializer = ResultSerializer(make_config())
+
+    assert serializer.serialize(Sample(name="x", count=1)) == '{"name":"x","count":1}'
+    assert json.loads(serializer.serialize({"items": [Sample(name="y", count=2)]})) == {
+        "items": [{"name": "y", "count": 2}]
+    }
+
+def test_orjson_format_falls_back_when_missing(monkeypatch):
+    """Test that the orjson format degrades to compact JSON if orjson is absent"""
+    monkeypatch.setattr(serializer_module, "orjson", None)
+    serializer = ResultSerializer(make_config({"format": "orjson"}))
+
+    assert serializer.format == "compact"
+    assert serializer.serialize({"a": 1}) == '{"a":1}'
+
+def test_orjson_format_when_installed():
+    """Test that the orjson format produces equivalent compact JSON"""
+    pytest.importorskip("orjson")
+    serializer = ResultSerializer(make_config({"format": "orjson"}))
+    result = {"a": [1, 2], "nested": {"model": Sample(name="z", count=3)}}
+
+    assert serializer.format == "orjson"
+    assert json.loads(serializer.serialize(result)) == {"a": [1, 2], "nested": {"model": {"name": "z", "count": 3}}}
+
+def test_unknown_format_is_rejected():
+    """Test that an unknown format fails at startup"""
+    with pytest.raises(ValueError, match="Unknown serialization format"):
+        ResultSerializer(make_config({"format": "yaml"}))
@@ -1,12 +1,17 @@
 """
 Tests for the MCP server module
 """
+import asyncio
 import pytest
+import json
 import logging
 import importlib
 
+from mcp.shared.memory import create_connected_server_and_client_session
+from mcp.types import Tool
+
 from runtime.src.mcp_server.server import MCPServer
-from common.mcp_tool_decorator import TOOLS_REGISTRY
+from common.mcp_tool_decorator import TOOLS_REGISTRY, ToolRegistry
 
 def test_mcp_server_initialization():
     """Test MCPServer initialization"""
@@ -159,4 +164,214 @@ def test_mcp_server_tool_import_failure(monkeypatch):
     server = MCPServer(default_config)
     
     # Verify empty tools registry on import failure
-    assert len(server.tools_registry) == 0
\ No newline at end of file
+    assert len(server.tools_registry) == 0
+
+
+def make_server_with_tools(tools):
+    """Build an MCPServer whose registry holds only the given tools"""
+    config = {"host": {"name": "test-mcp", "log_level": "INFO"}, "mcp_servers": {}}
+    server = MCPServer(config)
+    server.tools_registry = ToolRegistry(tools)
+    server.dispatcher.tools_registry = server.tools_registry
+    server.refresh_tools()
+    return server
+
+def make_tool(name):
+    """Build a tool function carrying MCP metadata"""
+    def tool_func(message: str) -> dict:
+        return {"message": message}
+    tool_func._mcp_tool = Tool(name=name, description=name, inputSchema={"type": "object"})
+    return tool_func
+
+class RecordingSession:
+    """Stand-in client session that records list_changed notifications"""
+    def __init__(self):
+        self.notified = 0
+
+    async def send_tool_list_changed(self):
+        self.notified += 1
+
+def test_tool_list_is_cached_until_registry_changes():
+    """Test that the tools/list result is built once and rebuilt on change"""
+    server = make_server_with_tools({"one": make_tool("one")})
+    cached = server._tools_result
+
+    assert server.refresh_tools() is False
+    assert server._tools_result is cached
+    assert json.loads(server.tools_list_json)["tools"][-1]["name"] == "one"
+
+    server.tools_registry["two"] = make_tool("two")
+    assert server.refresh_tools() is True
+    assert [t.name for t in server._tools_result.root.tools] == [*server.builtin_tools, "one", "two"]
+
+@pytest.mark.asyncio
+async def test_registry_change_notifies_sessions():
+    """Test that known sessions receive tools/list_changed"""
+    server = make_server_with_tools({"one": make_tool("one")})
+    session = RecordingSession()
+    server._sessions.add(session)
+
+    del server.tools_registry["one"]
+    if server.refresh_tools():
+        await server.notify_tools_changed()
+
+    assert session.notified == 1
+    assert [t.name for t in server._tools_result.root.tools] == list(server.builtin_tools)
+
+@pytest.mark.asyncio
+async def test_list_and_call_tools_over_session():
+    """Test tools/list and tools/call through an in-memory client session"""
+    server = make_server_with_tools({"one": make_tool("one")})
+
+    async with create_connected_server_and_client_session(server.create_server()) as client:
+        listed = await client.list_tools()
+        result = await client.call_tool("one", {"message": "hi"})
+
+    assert [t.name for t in listed.tools] == [*server.builtin_tools, "one"]
+    assert json.loads(result.content[0].text) == {"message": "hi"}
+
+@pytest.mark.asyncio
+async def test_host_diagnostics_reports_startup():
+    """Test the built-in diagnostics tool"""
+    report = {"parallel": True, "total_seconds": 0.5, "modules": [{"module": "demo.tools", "seconds": 0.5}]}
+    server = make_server_with_tools({"one": make_tool("one")})
+    server.startup_report = report
+
+    result = await server.dispatcher.dispatch("host_diagnostics", {})
+
+    assert result["startup"] == report
+    assert result["tools"] == 1
+    assert "host_diagnostics" in result["builtin_tools"]
+    assert "host_diagnostics" not in TOOLS_REGISTRY
+
+@pytest.mark.asyncio
+async def test_timed_out_call_returns_structured_error():
+    """Test that a timeout reaches the client as a JSON error result"""
+    async def hang(message: str) -> dict:
+        await asyncio.sleep(60)
+        return {}
+    hang._mcp_tool = Tool(name="hang", description="hang", inputSchema={"type": "object"})
+    hang._mcp_timeout = 0.05
+    server = make_server_with_tools({"hang": hang})
+
+    async with create_connected_server_and_client_session(server.create_server()) as client:
+        result = await client.call_tool("hang", {"message": "hi"})
+
+    assert result.isError
+    error = json.loads(result.content[0].text)["error"]
+    assert error["code"] == "timeout"
+    assert error["timeout_seconds"] == 0.05
+
+@pytest.mark.asyncio
+async def test_sse_transport_serves_concurrent_clients():
+    """Test that one server process answers several SSE clients"""
+    import socket
+    from mcp import ClientSession
+    from mcp.client.sse import sse_client
+
+    server = make_server_with_tools({"one": make_tool("one")})
+    server.transport = "sse"
+    server.shutdown_timeout = 0.1
+    listener = socket.create_server(("127.0.0.1", 0))
+    port = listener.getsockname()[1]
+    serving = asyncio.create_task(server.serve(sockets=[listener]))
+
+    async def call(message):
+        async with sse_client(f"http://127.0.0.1:{port}/sse") as streams:
+            async with ClientSession(*streams) as client:
+                await client.initialize()
+                result = await client.call_tool("one", {"message": message})
+                return json.loads(result.content[0].text)["message"]
+
+    try:
+        while server.http_server is None or not server.http_server.started:
+            await asyncio.sleep(0.01)
+        assert await asyncio.gather(call("a"), call("b")) == ["a", "b"]
+    finally:
+        server.http_server.should_exit = True
+        await asyncio.wait_for(serving, 10)
+        listener.close()
+
+def test_unknown_transport_is_rejected():
+    """Test transport validation"""
+    config = {"host": {"name": "test-mcp", "log_level": "INFO", "transport": {"type": "carrier-pigeon"}}}
+    with pytest.raises(ValueError, match="Unknown transport"):
+        MCPServer(config)
+
+@pytest.mark.asyncio
+async def test_batch_call_returns_ordered_results_and_errors():
+    """Test the built-in batch tool in concurrent and sequential modes"""
+    server = make_server_with_tools({"one": make_tool("one")})
+    calls = [
+        {"name": "one", "arguments": {"message": "a"}},
+        {"name": "missing", "arguments": {}},
+        {"name": "batch_call", "arguments": {"calls": []}},
+        {"name": "one", "arguments": {"message": "b"}},
+    ]
+
+    result = await server.dispatcher.dispatch("batch_call", {"calls": calls})
+    assert [r["ok"] for r in result["results"]] == [True, False, False, True]
+    assert result["results"][0]["result"] == {"message": "a"}
+    assert result["results"][1]["error"]["message"] == "Tool not found: missing"
+    assert "nested" in result["results"][2]["error"]["message"]
+    assert (result["succeeded"], result["failed"]) == (2, 2)
+
+    result = await server.dispatcher.dispatch("batch_call", {"calls": calls, "sequential": True, "stop_on_error": True})
+    assert [r.get("skipped", False) for r in result["results"]] == [False, False, True, True]
+    assert server.dispatcher.metrics.tools["one"].calls == 3
+
+@pytest.mark.asyncio
+async def test_batch_call_over_session():
+    """Test that a batch is one round trip with one JSON result"""
+    server = make_server_with_tools({"one": make_tool("one")})
+
+    async with create_connected_server_and_client_session(server.create_server()) as client:
+        result = await client.call_tool("batch_call", {"calls": [
+            {"name": "one", "arguments": {"message": str(i)}} for i in range(5)
+        ]})
+
+    payload = json.loads(result.content[0].text)
+    assert [r["result"]["message"] for r in payload["results"]] == ["0", "1", "2", "3", "4"]
+
+@pytest.mark.asyncio
+async def test_batch_call_waits_for_limited_tool_instead_of_overflowing():
+    """Test that a batch larger than a tool's limit and queue is paced, not rejected"""
+    running = []
+    peak = 0
+
+    async def limited(message: str) -> dict:
+        nonlocal peak
+        running.append(message)
+        peak = max(peak, len(running))
+        await asyncio.sleep(0.01)
+        running.remove(message)
+        return {"message": message}
+    limited.__module__ = "demo_server.tools"
+    limited._mcp_tool = make_tool("limited")._mcp_tool
+
+    config = {
+        "host": {"name": "test-mcp", "log_level": "INFO", "dispatch": {"batch_concurrency": 8}},
+        "mcp_servers": {"demo": {
+            "location": "src",
+            "tools": {"module": "demo_server.tools"},
+            "concurrency": {"max_concurrent": 2, "max_queue": 1}
+        }}
+    }
+    server = MCPServer(config)
+    server.tools_registry = server.dispatcher.tools_registry = ToolRegistry({"limited": limited})
+
+    calls = [{"name": "limited", "arguments": {"message": str(i)}} for i in range(10)]
+    result = await server.dispatcher.dispatch("batch_call", {"calls": calls})
+
+    assert (result["succeeded"], result["failed"]) == (10, 0)
+    assert peak == 2
+    assert server.dispatcher.metrics.tools["limited"].rejected == 0
+
+def test_batch_call_size_is_limited():
+    """Test the configured batch size limit"""
+    config = {"host": {"name": "test-mcp", "log_level": "INFO", "dispatch": {"batch_max_calls": 2}}, "mcp_servers": {}}
+    server = MCPServer(config)
+    calls = [{"name": "host_metrics", "arguments": {}}] * 3
+
+    with pytest.raises(ValueError, match="at most 2 calls"):
+        asyncio.run(server.dispatcher.dispatch("batch_call", {"calls": calls}))
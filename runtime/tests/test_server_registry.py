@@ -1,9 +1,15 @@
 """
 Tests for the server registry module
 """
+import asyncio
+import copy
 import os
 import sys
 
+import pytest
+import yaml
+
+from common.mcp_tool_decorator import TOOLS_REGISTRY
 from runtime.src.mcp_server.server_registry import ServerRegistry
 
 def test_server_registry_initialization():
@@ -136,4 +142,250 @@ def test_server_registry_auto_discovery():
     registry = ServerRegistry(project_root, default_config)
     
     # Verify some basic auto-discovery behavior
-    assert len(registry.server_paths) > 2  # More than just core paths
\ No newline at end of file
+    assert len(registry.server_paths) > 2  # More than just core paths
+
+
+def test_server_registry_parallel_load_report(tmp_path):
+    """Test concurrent loading and the startup report"""
+    for name in ("parallel_demo_a", "parallel_demo_b"):
+        package = tmp_path / name / "src" / name
+        package.mkdir(parents=True)
+        (package / "__init__.py").write_text("")
+        (package / "tools.py").write_text(
+            "from common.mcp_tool_decorator import mcp_tool\n"
+            f"@mcp_tool(name='{name}_tool', description='demo')\n"
+            f"def {name}_tool(x: int) -> dict:\n"
+            "    return {'x': x}\n"
+        )
+
+    config = {
+        "host": {"name": "test-mcp", "log_level": "INFO", "startup": {"parallel_load": True, "max_workers": 2}},
+        "core": {},
+        "mcp_servers": {
+            name: {"location": f"{name}/src", "tools": {"module": f"{name}.tools"}}
+            for name in ("parallel_demo_a", "parallel_demo_b")
+        },
+        "auto_discover": False
+    }
+    from common.mcp_tool_decorator import TOOLS_REGISTRY
+    try:
+        registry = ServerRegistry(str(tmp_path), config)
+        registry.load_server_components()
+    finally:
+        for name in ("parallel_demo_a", "parallel_demo_b"):
+            TOOLS_REGISTRY.pop(f"{name}_tool", None)
+            sys.modules.pop(f"{name}.tools", None)
+            sys.modules.pop(name, None)
+            sys.path.remove(str(tmp_path / name / "src"))
+
+    report = registry.startup_report
+    assert report["parallel"] is True
+    assert {e["module"] for e in report["modules"]} == {"parallel_demo_a.tools", "parallel_demo_b.tools"}
+    for entry in report["modules"]:
+        assert entry["status"] == "loaded"
+        assert entry["tools"] == 1
+        assert entry["seconds"] >= 0
+
+def write_tools(path, tool_name, value):
+    """Write a tools module with one tool returning a fixed value"""
+    path.write_text(
+        "from common.mcp_tool_decorator import mcp_tool\n"
+        f"@mcp_tool(name='{tool_name}', description='demo')\n"
+        f"def {tool_name}() -> dict:\n"
+        f"    return {{'value': {value!r}}}\n"
+    )
+    # Make the edit visible even within the file system's timestamp granularity
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+@pytest.fixture
+def reload_project(tmp_path):
+    """Create a project with two tools packages and hot reload enabled"""
+    for name in ("reload_demo_a", "reload_demo_b"):
+        package = tmp_path / name / "src" / name
+        package.mkdir(parents=True)
+        (package / "__init__.py").write_text("")
+        write_tools(package / "tools.py", f"{name}_tool", "v1")
+
+    config = {
+        "host": {"name": "test-mcp", "log_level": "INFO", "hot_reload": {"enabled": True, "interval": 0.05}},
+        "core": {},
+        "mcp_servers": {
+            name: {"location": f"{name}/src", "tools": {"module": f"{name}.tools"}}
+            for name in ("reload_demo_a", "reload_demo_b")
+        },
+        "auto_discover": False
+    }
+    yield tmp_path, config
+
+    for name in ("reload_demo_a", "reload_demo_b", "reload_demo_c"):
+        TOOLS_REGISTRY.pop(f"{name}_tool", None)
+        TOOLS_REGISTRY.pop(f"{name}_extra", None)
+        sys.modules.pop(f"{name}.tools", None)
+        sys.modules.pop(name, None)
+        if str(tmp_path / name / "src") in sys.path:
+            sys.path.remove(str(tmp_path / name / "src"))
+
+@pytest.mark.asyncio
+async def test_hot_reload_swaps_only_changed_package(reload_project):
+    """Test that an edited package is re-imported and the others are left alone"""
+    root, config = reload_project
+    registry = ServerRegistry(str(root), config)
+    registry.load_server_components()
+    untouched = sys.modules["reload_demo_b.tools"]
+    assert await registry.reload() is None
+
+    write_tools(root / "reload_demo_a" / "src" / "reload_demo_a" / "tools.py", "reload_demo_a_extra", "v2")
+    report = await registry.reload()
+
+    assert report["reloaded"] == ["reload_demo_a.tools"]
+    assert report["tools_added"] == ["reload_demo_a_extra"]
+    assert report["tools_removed"] == ["reload_demo_a_tool"]
+    assert TOOLS_REGISTRY["reload_demo_a_extra"]() == {"value": "v2"}
+    assert "reload_demo_a_tool" not in TOOLS_REGISTRY
+    assert sys.modules["reload_demo_b.tools"] is untouched
+    assert TOOLS_REGISTRY["reload_demo_b_tool"]() == {"value": "v1"}
+
+@pytest.mark.asyncio
+async def test_hot_reload_keeps_previous_version_on_error(reload_project):
+    """Test that a package that fails to import keeps serving its old tools"""
+    root, config = reload_project
+    registry = ServerRegistry(str(root), config)
+    registry.load_server_components()
+    previous = sys.modules["reload_demo_a.tools"]
+
+    tools_path = root / "reload_demo_a" / "src" / "reload_demo_a" / "tools.py"
+    tools_path.write_text("def broken(:\n")
+    report = await registry.reload()
+
+    assert report["reloaded"] == []
+    assert "reload_demo_a.tools" in report["failed"]
+    assert sys.modules["reload_demo_a.tools"] is previous
+    assert TOOLS_REGISTRY["reload_demo_a_tool"]() == {"value": "v1"}
+
+    # The broken version is not retried until the package changes again
+    assert await registry.reload() is None
+
+@pytest.mark.asyncio
+async def test_hot_reload_applies_config_changes(reload_project):
+    """Test that servers added to or removed from the config file are loaded and dropped"""
+    root, config = reload_project
+    package = root / "reload_demo_c" / "src" / "reload_demo_c"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    write_tools(package / "tools.py", "reload_demo_c_tool", "v1")
+    config_path = root / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+
+    registry = ServerRegistry(str(root), config)
+    registry.load_server_components()
+    untouched = sys.modules["reload_demo_a.tools"]
+
+    new_config = dict(config, mcp_servers={
+        "reload_demo_a": config["mcp_servers"]["reload_demo_a"],
+        "reload_demo_c": {"location": "reload_demo_c/src", "tools": {"module": "reload_demo_c.tools"}}
+    })
+    config_path.write_text(yaml.safe_dump(new_config))
+    stat = os.stat(config_path)
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    report = await registry.reload()
+
+    assert report["config_changed"] is True
+    assert report["reloaded"] == ["reload_demo_c.tools"]
+    assert report["removed"] == ["reload_demo_b.tools"]
+    assert "reload_demo_b_tool" not in TOOLS_REGISTRY
+    assert TOOLS_REGISTRY["reload_demo_c_tool"]() == {"value": "v1"}
+    assert sys.modules["reload_demo_a.tools"] is untouched
+
+@pytest.mark.asyncio
+async def test_watch_notifies_server_of_reload(reload_project):
+    """Test that the watcher publishes reloaded tools through MCPServer"""
+    from runtime.src.mcp_server.server import MCPServer
+
+    root, config = reload_project
+    registry = ServerRegistry(str(root), config)
+    registry.load_server_components()
+    server = MCPServer(config, server_registry=registry)
+    assert "reload_demo_a_extra" not in server.tools_list_json
+
+    reloaded = asyncio.Event()
+
+    async def on_reload(report):
+        await server.tools_reloaded(report)
+        reloaded.set()
+
+    watcher = asyncio.create_task(registry.watch(on_reload))
+    try:
+        write_tools(root / "reload_demo_a" / "src" / "reload_demo_a" / "tools.py", "reload_demo_a_extra", "v2")
+        await asyncio.wait_for(reloaded.wait(), timeout=5)
+    finally:
+        watcher.cancel()
+        server.dispatcher.shutdown(wait=False)
+
+    assert "reload_demo_a_extra" in server.tools_list_json
+
+@pytest.mark.asyncio
+async def test_reloaded_concurrency_settings_reach_the_dispatcher(reload_project):
+    """Test that editing a server's concurrency block updates its tools' limits"""
+    from runtime.src.mcp_server.server import MCPServer
+
+    root, config = reload_project
+    config["mcp_servers"]["reload_demo_a"]["concurrency"] = {"max_concurrent": 4}
+    config_path = root / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+
+    registry = ServerRegistry(str(root), config)
+    registry.load_server_components()
+    server = MCPServer(config, server_registry=registry)
+    tool = TOOLS_REGISTRY["reload_demo_a_tool"]
+    assert server.dispatcher.admission._tool_limit("reload_demo_a_tool", tool).max_concurrent == 4
+
+    edited = copy.deepcopy(config)
+    edited["mcp_servers"]["reload_demo_a"]["concurrency"] = {"max_concurrent": 1}
+    edited["mcp_servers"]["reload_demo_b"]["concurrency"] = {"max_concurrent": 2}
+    config_path.write_text(yaml.safe_dump(edited))
+    stat = os.stat(config_path)
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    try:
+        await server.tools_reloaded(await registry.reload())
+    finally:
+        server.dispatcher.shutdown(wait=False)
+
+    admission = server.dispatcher.admission
+    assert admission._tool_limit("reload_demo_a_tool", TOOLS_REGISTRY["reload_demo_a_tool"]).max_concurrent == 1
+    assert admission._tool_limit("reload_demo_b_tool", TOOLS_REGISTRY["reload_demo_b_tool"]).max_concurrent == 2
+
+@pytest.mark.asyncio
+async def test_concurrency_only_edit_keeps_module_state(reload_project):
+    """Test that a concurrency-only config edit does not re-import the server's tools"""
+    from runtime.src.mcp_server.server import MCPServer
+
+    root, config = reload_project
+    config_path = root / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+
+    registry = ServerRegistry(str(root), config)
+    registry.load_server_components()
+    server = MCPServer(config, server_registry=registry)
+    module = sys.modules["reload_demo_a.tools"]
+    # Stands in for module-level state such as open telnet sessions
+    module.SESSIONS = {"session-1": object()}
+    sessions = module.SESSIONS
+
+    edited = copy.deepcopy(config)
+    edited["mcp_servers"]["reload_demo_a"]["concurrency"] = {"max_concurrent": 3}
+    config_path.write_text(yaml.safe_dump(edited))
+    stat = os.stat(config_path)
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    try:
+        report = await registry.reload()
+        await server.tools_reloaded(report)
+    finally:
+        server.dispatcher.shutdown(wait=False)
+
+    assert report["config_changed"] is True
+    assert report["reloaded"] == []
+    assert sys.modules["reload_demo_a.tools"] is module
+    assert module.SESSIONS is sessions
+    tool = TOOLS_REGISTRY["reload_demo_a_tool"]
+    assert server.dispatcher.admission._tool_limit("reload_demo_a_tool", tool).max_concurrent == 3
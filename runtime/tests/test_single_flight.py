@@ -0,0 +1,113 @@
+"""
+Tests for the single-flight module
+"""
+import asyncio
+
+import pytest
+
+from common.mcp_tool_decorator import ToolRegistry, mcp_tool
+from runtime.src.mcp_server.single_flight import SingleFlight
+from runtime.src.mcp_server.tool_dispatcher import ToolDispatcher
+
+def make_config():
+    """Build a minimal server configuration"""
+    return {"host": {"name": "test-mcp", "log_level": "INFO"}, "mcp_servers": {}}
+
+def make_registry(release, calls, single_flight=True):
+    """Register a slow login tool that records each execution"""
+    registry = ToolRegistry()
+
+    @mcp_tool(name="login", description="Log in to a device", registry=registry, single_flight=single_flight)
+    async def login(host: str) -> dict:
+        calls.append(host)
+        await release.wait()
+        return {"host": host, "session": len(calls)}
+
+    return registry
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_calls_share_one_execution():
+    """Test that identical calls are coalesced and different ones are not"""
+    release, calls = asyncio.Event(), []
+    dispatcher = ToolDispatcher(make_registry(release, calls), make_config())
+
+    tasks = [asyncio.create_task(dispatcher.dispatch("login", {"host": "r1"})) for _ in range(3)]
+    tasks.append(asyncio.create_task(dispatcher.dispatch("login", {"host": "r2"})))
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert sorted(calls) == ["r1", "r2"]
+    assert results[0] == results[1] == results[2]
+    assert dispatcher.metrics.tools["login"].coalesced == 2
+    assert dispatcher.flights.in_flight == 0
+
+    # Once finished, the next call runs again
+    await dispatcher.dispatch("login", {"host": "r1"})
+    assert calls.count("r1") == 2
+
+@pytest.mark.asyncio
+async def test_tools_run_independently_without_opt_in():
+    """Test that coalescing is opt-in"""
+    release, calls = asyncio.Event(), []
+    dispatcher = ToolDispatcher(make_registry(release, calls, single_flight=False), make_config())
+
+    tasks = [asyncio.create_task(dispatcher.dispatch("login", {"host": "r1"})) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert calls == ["r1", "r1"]
+
+@pytest.mark.asyncio
+async def test_errors_are_shared():
+    """Test that every waiter receives the shared exception"""
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def fail():
+        await release.wait()
+        raise RuntimeError("login refused")
+
+    tasks = [asyncio.create_task(flights.run("k", fail)) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+@pytest.mark.asyncio
+async def test_cancelling_one_waiter_keeps_the_call_running():
+    """Test that the shared call is only cancelled when every waiter has left"""
+    flights = SingleFlight()
+    release = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def work():
+        try:
+            await release.wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "done"
+
+    first = asyncio.create_task(flights.run("k", work))
+    second = asyncio.create_task(flights.run("k", work))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    release.set()
+    assert await second == "done"
+    assert not cancelled.is_set()
+
+    release.clear()
+    only = asyncio.create_task(flights.run("k", work))
+    await asyncio.sleep(0)
+    only.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await only
+    await asyncio.wait_for(cancelled.wait(), 1)
+    await asyncio.sleep(0)
+    assert flights.in_flight == 0
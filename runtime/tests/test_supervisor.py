@@ -0,0 +1,105 @@
+"""
+Tests for the worker supervisor module
+"""
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from runtime.src.mcp_server.supervisor import Supervisor, worker_message_path
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+SUPERVISOR_SCRIPT = textwrap.dedent('''
+    import sys
+    sys.path[:0] = [{root!r}, {root!r} + "/common/src"]
+    from runtime.src.mcp_server.supervisor import Supervisor
+    config = {{
+        "host": {{
+            "name": "test-mcp",
+            "log_level": "WARNING",
+            "transport": {{"type": "sse", "port": {port}, "workers": 2, "shutdown_timeout": 0.5}}
+        }},
+        "mcp_servers": {{}}
+    }}
+    Supervisor(config).run()
+''')
+
+def free_port():
+    """Return a TCP port that is currently unused"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+async def worker_pid(port):
+    """Open one SSE session and return the pid of the worker serving it"""
+    from mcp import ClientSession
+    from mcp.client.sse import sse_client
+
+    async with sse_client(f"http://127.0.0.1:{port}/sse") as streams:
+        async with ClientSession(*streams) as client:
+            await client.initialize()
+            result = await client.call_tool("host_diagnostics", {})
+            assert not result.isError, result.content[0].text
+            return json.loads(result.content[0].text)["pid"]
+
+async def wait_for_workers(port, timeout=10):
+    """Wait until the supervisor's workers accept connections"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        try:
+            return await worker_pid(port)
+        except Exception:
+            if loop.time() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+def test_worker_message_path_is_unique_per_worker():
+    """Test that each worker advertises its own message path"""
+    assert worker_message_path(123) == "/w123/messages/"
+    assert worker_message_path(123) != worker_message_path(456)
+
+def test_shared_metrics_port_is_rejected_with_several_workers():
+    """Test that workers are not started when they would all bind the metrics port"""
+    config = {
+        "host": {
+            "name": "test-mcp",
+            "log_level": "WARNING",
+            "transport": {"type": "sse", "workers": 2},
+            "metrics": {"prometheus_port": 9464}
+        },
+        "mcp_servers": {}
+    }
+    with pytest.raises(ValueError):
+        Supervisor(config)
+
+    config["host"]["metrics"] = {"prometheus_file": "metrics.prom"}
+    assert Supervisor(config).metrics_file == "metrics.prom"
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="pre-fork mode requires os.fork")
+@pytest.mark.asyncio
+async def test_workers_share_socket_and_restart_gracefully():
+    """Test sessions across workers, graceful restart and shutdown"""
+    port = free_port()
+    process = subprocess.Popen([sys.executable, "-c", SUPERVISOR_SCRIPT.format(root=PROJECT_ROOT, port=port)])
+    try:
+        await wait_for_workers(port)
+        # Messages reach the session's worker whichever worker accepts the POST
+        pids = set(await asyncio.gather(*(worker_pid(port) for _ in range(8))))
+        assert 1 <= len(pids) <= 2
+        assert process.pid not in pids
+
+        process.send_signal(signal.SIGHUP)
+        await asyncio.sleep(1.5)
+        restarted = set(await asyncio.gather(*(worker_pid(port) for _ in range(8))))
+        assert restarted.isdisjoint(pids)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=15) == 0
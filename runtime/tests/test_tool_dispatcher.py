@@ -0,0 +1,248 @@
+"""
+Tests for the tool dispatcher module
+"""
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from pydantic import BaseModel
+
+from common.mcp_tool_decorator import ArgumentValidator
+from runtime.src.mcp_server.errors import ToolTimeoutError
+from runtime.src.mcp_server.tool_dispatcher import ToolDispatcher, DEFAULT_MAX_WORKERS
+
+def make_config(dispatch=None):
+    """Build a minimal server configuration with optional dispatch settings"""
+    host = {"name": "test-mcp", "log_level": "INFO"}
+    if dispatch is not None:
+        host["dispatch"] = dispatch
+    return {"host": host, "mcp_servers": {}}
+
+def test_dispatcher_defaults():
+    """Test dispatcher configuration defaults"""
+    dispatcher = ToolDispatcher({}, make_config())
+
+    assert dispatcher.max_workers == DEFAULT_MAX_WORKERS
+    assert dispatcher.tool_overrides == {}
+
+@pytest.mark.asyncio
+async def test_dispatch_runs_sync_tool_off_loop():
+    """Test that synchronous tools run on a worker thread"""
+    def whoami() -> dict:
+        return {"thread": threading.current_thread().name}
+
+    dispatcher = ToolDispatcher({"whoami": whoami}, make_config())
+    try:
+        result = await dispatcher.dispatch("whoami", {})
+    finally:
+        dispatcher.shutdown()
+
+    assert result["thread"] != threading.current_thread().name
+    assert result["thread"].startswith("mcp-tool")
+
+@pytest.mark.asyncio
+async def test_dispatch_awaits_async_tool_on_loop():
+    """Test that async tools are awaited on the event loop thread"""
+    async def whoami() -> dict:
+        await asyncio.sleep(0)
+        return {"thread": threading.current_thread().name}
+
+    dispatcher = ToolDispatcher({"whoami": whoami}, make_config())
+    result = await dispatcher.dispatch("whoami", {})
+
+    assert result["thread"] == threading.current_thread().name
+
+@pytest.mark.asyncio
+async def test_dispatch_async_tools_concurrently():
+    """Test that many async tool calls overlap without using threads"""
+    async def wait(delay: float) -> dict:
+        await asyncio.sleep(delay)
+        return {"delay": delay}
+
+    dispatcher = ToolDispatcher({"wait": wait}, make_config({"max_workers": 1}))
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(dispatcher.dispatch("wait", {"delay": 0.1}) for _ in range(200)))
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == 200
+    assert elapsed < 1.0
+
+@pytest.mark.asyncio
+async def test_dispatch_unknown_tool():
+    """Test that dispatching an unknown tool raises ValueError"""
+    dispatcher = ToolDispatcher({}, make_config())
+
+    with pytest.raises(ValueError, match="Tool not found"):
+        await dispatcher.dispatch("missing", {})
+
+@pytest.mark.asyncio
+async def test_slow_tool_does_not_block_fast_tool():
+    """Test that a slow synchronous tool does not stall other calls"""
+    def slow() -> dict:
+        time.sleep(0.5)
+        return {"done": True}
+
+    def fast(message: str) -> dict:
+        return {"message": message}
+
+    config = make_config({"max_workers": 2, "tools": {"slow": {"max_workers": 1}}})
+    dispatcher = ToolDispatcher({"slow": slow, "fast": fast}, config)
+    try:
+        slow_task = asyncio.create_task(dispatcher.dispatch("slow", {}))
+        await asyncio.sleep(0.05)
+
+        start = time.perf_counter()
+        result = await dispatcher.dispatch("fast", {"message": "hi"})
+        elapsed = time.perf_counter() - start
+
+        assert result == {"message": "hi"}
+        assert elapsed < 0.25
+        assert not slow_task.done()
+        assert await slow_task == {"done": True}
+    finally:
+        dispatcher.shutdown()
+
+@pytest.mark.asyncio
+async def test_per_tool_override_uses_dedicated_pool():
+    """Test that per-tool overrides get their own thread pool"""
+    def whoami() -> dict:
+        return {"thread": threading.current_thread().name}
+
+    config = make_config({"max_workers": 2, "tools": {"isolated": {"max_workers": 1}}})
+    dispatcher = ToolDispatcher({"isolated": whoami, "shared": whoami}, config)
+    try:
+        isolated = await dispatcher.dispatch("isolated", {})
+        shared = await dispatcher.dispatch("shared", {})
+    finally:
+        dispatcher.shutdown()
+
+    assert isolated["thread"].startswith("mcp-tool-isolated")
+    assert not shared["thread"].startswith("mcp-tool-isolated")
+
+class AddInput(BaseModel):
+    a: int
+    b: int = 0
+
+@pytest.mark.asyncio
+async def test_dispatch_validates_arguments_once():
+    """Test that arguments are validated and coerced before the tool runs"""
+    calls = []
+
+    def add(a: int, b: int = 0) -> dict:
+        calls.append((a, b))
+        return {"sum": a + b}
+    add._mcp_validator = ArgumentValidator("add", AddInput)
+
+    dispatcher = ToolDispatcher({"add": add}, make_config())
+    try:
+        assert await dispatcher.dispatch("add", {"a": 1, "b": 2}) == {"sum": 3}
+        assert await dispatcher.dispatch("add", {"a": "4"}) == {"sum": 4}
+        with pytest.raises(ValueError, match="Invalid input for add"):
+            await dispatcher.dispatch("add", {"a": "four"})
+    finally:
+        dispatcher.shutdown()
+
+    # The invalid call never reached the tool
+    assert calls == [(1, 2), (4, 0)]
+
+@pytest.mark.asyncio
+async def test_dispatch_times_out_async_tool():
+    """Test that a hung async tool is cancelled at its deadline"""
+    cancelled = asyncio.Event()
+
+    async def hang() -> dict:
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return {}
+
+    dispatcher = ToolDispatcher({"hang": hang}, make_config({"timeout": 0.05}))
+    with pytest.raises(ToolTimeoutError) as excinfo:
+        await dispatcher.dispatch("hang", {})
+
+    assert cancelled.is_set()
+    assert json.loads(str(excinfo.value)) == {
+        "error": {
+            "code": "timeout",
+            "tool": "hang",
+            "message": "Tool 'hang' did not complete within 0.05s",
+            "timeout_seconds": 0.05
+        }
+    }
+    metrics = dispatcher.metrics.tools["hang"]
+    assert (metrics.errors, metrics.timeouts) == (1, 1)
+
+@pytest.mark.asyncio
+async def test_dispatch_times_out_sync_tool():
+    """Test that the caller is released when a sync tool overruns"""
+    release = threading.Event()
+
+    def block() -> dict:
+        release.wait(5)
+        return {}
+
+    dispatcher = ToolDispatcher({"block": block}, make_config({"timeout": 0.05}))
+    try:
+        with pytest.raises(ToolTimeoutError):
+            await dispatcher.dispatch("block", {})
+    finally:
+        release.set()
+        dispatcher.shutdown()
+
+def test_timeout_precedence():
+    """Test that config per-tool timeouts beat @mcp_tool, which beats the default"""
+    def plain() -> dict:
+        return {}
+
+    def decorated() -> dict:
+        return {}
+    decorated._mcp_timeout = 5
+
+    dispatcher = ToolDispatcher({}, make_config({
+        "timeout": 30,
+        "tools": {"pinned": {"timeout": 1}, "unbounded": {"timeout": None}}
+    }))
+
+    assert dispatcher.get_timeout("plain", plain) == 30
+    assert dispatcher.get_timeout("decorated", decorated) == 5
+    assert dispatcher.get_timeout("pinned", decorated) == 1
+    assert dispatcher.get_timeout("unbounded", plain) is None
+    assert ToolDispatcher({}, make_config()).get_timeout("plain", plain) is None
+
+@pytest.mark.asyncio
+async def test_tool_timeout_error_is_not_a_deadline():
+    """Test that a TimeoutError raised by the tool itself passes through"""
+    async def device_timeout() -> dict:
+        raise TimeoutError("device did not answer")
+
+    dispatcher = ToolDispatcher({"device": device_timeout}, make_config({"timeout": 10}))
+    with pytest.raises(TimeoutError, match="device did not answer") as excinfo:
+        await dispatcher.dispatch("device", {})
+
+    assert not isinstance(excinfo.value, ToolTimeoutError)
+    assert dispatcher.metrics.tools["device"].timeouts == 0
+
+@pytest.mark.asyncio
+async def test_cancelled_call_is_recorded():
+    """Test that cancelling a call aborts the tool and is counted separately"""
+    started = asyncio.Event()
+
+    async def wait() -> dict:
+        started.set()
+        await asyncio.sleep(60)
+        return {}
+
+    dispatcher = ToolDispatcher({"wait": wait}, make_config())
+    task = asyncio.create_task(dispatcher.dispatch("wait", {}))
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    metrics = dispatcher.metrics.tools["wait"]
+    assert (metrics.calls, metrics.errors, metrics.cancelled, metrics.in_flight) == (1, 0, 1, 0)
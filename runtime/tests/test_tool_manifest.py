@@ -0,0 +1,157 @@
+"""
+Tests for the tool manifest module
+"""
+import json
+import os
+import sys
+
+import pytest
+
+from common.mcp_tool_decorator import TOOLS_REGISTRY
+from runtime.src.mcp_server.server_registry import ServerRegistry
+from runtime.src.mcp_server.tool_dispatcher import ToolDispatcher
+from runtime.src.mcp_server.tool_manifest import LazyTool
+
+TOOLS_SOURCE = '''
+from common.mcp_tool_decorator import mcp_tool
+
+@mcp_tool(name="lazy_demo_echo", description="Echo for lazy loading tests")
+def lazy_demo_echo(message: str) -> dict:
+    return {"message": message}
+'''
+
+@pytest.fixture
+def demo_project(tmp_path):
+    """Create a project with one tools package and lazy loading enabled"""
+    package = tmp_path / "src" / "lazy_demo_pkg"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "tools.py").write_text(TOOLS_SOURCE)
+
+    config = {
+        "host": {
+            "name": "test-mcp",
+            "log_level": "INFO",
+            "lazy_tools": {"enabled": True, "manifest": str(tmp_path / "manifest.json")}
+        },
+        "core": {},
+        "mcp_servers": {"demo": {"location": "src", "tools": {"module": "lazy_demo_pkg.tools"}}},
+        "auto_discover": False
+    }
+    yield tmp_path, config
+
+    forget_module()
+    if str(tmp_path / "src") in sys.path:
+        sys.path.remove(str(tmp_path / "src"))
+
+def forget_module():
+    """Simulate a fresh process by unloading the demo package"""
+    for name in [name for name in TOOLS_REGISTRY if name.startswith("lazy_demo_")]:
+        TOOLS_REGISTRY.pop(name)
+    for name in [name for name in sys.modules if name.split(".")[0] == "lazy_demo_pkg"]:
+        sys.modules.pop(name)
+
+def test_first_start_imports_and_writes_manifest(demo_project):
+    """Test that a missing manifest is generated from an eager import"""
+    root, config = demo_project
+    registry = ServerRegistry(str(root), config)
+    registry.load_server_components()
+
+    assert "lazy_demo_pkg.tools" in registry.loaded_modules
+    manifest = json.loads((root / "manifest.json").read_text())
+    tools = manifest["modules"]["lazy_demo_pkg.tools"]["tools"]
+    assert [t["name"] for t in tools] == ["lazy_demo_echo"]
+    assert "message" in tools[0]["inputSchema"]["properties"]
+
+@pytest.mark.asyncio
+async def test_manifest_defers_import_until_first_call(demo_project):
+    """Test that tools are listed from the manifest and imported on first call"""
+    root, config = demo_project
+    ServerRegistry(str(root), config).load_server_components()
+    forget_module()
+
+    registry = ServerRegistry(str(root), config)
+    registry.load_server_components()
+
+    assert registry.lazy_modules == {"lazy_demo_pkg.tools": 1}
+    assert "lazy_demo_pkg.tools" not in sys.modules
+    assert isinstance(TOOLS_REGISTRY["lazy_demo_echo"], LazyTool)
+    assert TOOLS_REGISTRY["lazy_demo_echo"]._mcp_tool.name == "lazy_demo_echo"
+
+    dispatcher = ToolDispatcher(TOOLS_REGISTRY, config)
+    try:
+        result = await dispatcher.dispatch("lazy_demo_echo", {"message": "hi"})
+    finally:
+        dispatcher.shutdown()
+
+    assert result == {"message": "hi"}
+    assert "lazy_demo_pkg.tools" in sys.modules
+    assert not isinstance(TOOLS_REGISTRY["lazy_demo_echo"], LazyTool)
+
+def test_stale_manifest_entry_is_reimported(demo_project):
+    """Test that editing a tools package invalidates its manifest entry"""
+    root, config = demo_project
+    ServerRegistry(str(root), config).load_server_components()
+    forget_module()
+
+    tools_file = root / "src" / "lazy_demo_pkg" / "tools.py"
+    tools_file.write_text(TOOLS_SOURCE + "\n# edited\n")
+    stat = os.stat(tools_file)
+    os.utime(tools_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    registry = ServerRegistry(str(root), config)
+    registry.load_server_components()
+
+    assert registry.lazy_modules == {}
+    assert "lazy_demo_pkg.tools" in registry.loaded_modules
+
+def test_tools_defined_in_submodules_are_recorded(demo_project):
+    """Test that tools registered by a submodule are attributed to the tools module"""
+    root, config = demo_project
+    package = root / "src" / "lazy_demo_pkg"
+    (package / "nav.py").write_text(
+        "from common.mcp_tool_decorator import mcp_tool\n"
+        "@mcp_tool(name='lazy_demo_nav', description='Tool defined in a submodule')\n"
+        "def lazy_demo_nav(target: str) -> dict:\n"
+        "    return {'target': target}\n"
+    )
+    (package / "tools.py").write_text(TOOLS_SOURCE + "\nfrom lazy_demo_pkg import nav\n")
+
+    first = ServerRegistry(str(root), config)
+    first.load_server_components()
+    assert first.startup_report["modules"][0]["tools"] == 2
+    assert TOOLS_REGISTRY["lazy_demo_nav"]._mcp_module == "lazy_demo_pkg.tools"
+    forget_module()
+
+    second = ServerRegistry(str(root), config)
+    second.load_server_components()
+    assert second.lazy_modules == {"lazy_demo_pkg.tools": 2}
+    assert TOOLS_REGISTRY["lazy_demo_nav"]._mcp_lazy_module == "lazy_demo_pkg.tools"
+
+@pytest.mark.asyncio
+async def test_lazy_tools_keep_cache_and_executor_hints(demo_project):
+    """Test that a placeholder's first call is cached and its executor hint is known up front"""
+    root, config = demo_project
+    (root / "src" / "lazy_demo_pkg" / "tools.py").write_text(
+        "from common.mcp_tool_decorator import mcp_tool\n"
+        "@mcp_tool(name='lazy_demo_cached', description='Cached tool', cache=True)\n"
+        "def lazy_demo_cached(x: int) -> dict:\n"
+        "    return {'x': x}\n"
+        "@mcp_tool(name='lazy_demo_cpu', description='CPU tool', executor='process')\n"
+        "def lazy_demo_cpu(x: int) -> dict:\n"
+        "    return {'x': x}\n"
+    )
+    ServerRegistry(str(root), config).load_server_components()
+    forget_module()
+    ServerRegistry(str(root), config).load_server_components()
+
+    assert isinstance(TOOLS_REGISTRY["lazy_demo_cpu"], LazyTool)
+    assert TOOLS_REGISTRY["lazy_demo_cpu"]._mcp_executor == "process"
+
+    dispatcher = ToolDispatcher(TOOLS_REGISTRY, config)
+    try:
+        assert await dispatcher.dispatch("lazy_demo_cached", {"x": 1}) == {"x": 1}
+        assert await dispatcher.dispatch("lazy_demo_cached", {"x": 1}) == {"x": 1}
+    finally:
+        dispatcher.shutdown()
+    assert dispatcher.results.snapshot()["lazy_demo_cached"]["hits"] == 1
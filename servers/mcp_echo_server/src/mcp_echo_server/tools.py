@@ -1,5 +1,4 @@
 # mcp_echo_server/tools.py
-from pydantic import ValidationError
 from mcp.shared.exceptions import McpError
 
 # common imports
@@ -8,16 +7,13 @@ from common.mcp_tool_decorator import mcp_tool
 # project imports – using absolute imports to reference the echo server models
 from mcp_echo_server.models import EchoInput, EchoResult
 
-@mcp_tool(name="echo", description="Echo back the input message")
+@mcp_tool(name="echo", description="Echo back the input message", input_model=EchoInput)
 def echo(message: str) -> dict:
     """
-    Validate input using EchoInput and return an echo response as defined by EchoResult.
-    """
-    try:
-        validated_input = EchoInput(message=message)
-    except ValidationError as e:
-        raise ValueError(f"Invalid input for echo: {e}")
+    Return an echo response as defined by EchoResult.
 
+    Input is validated against EchoInput by the dispatcher before the call.
+    """
     # Build the result by simply echoing the message back.
-    result = EchoResult(message=validated_input.message)
+    result = EchoResult(message=message)
     return result.model_dump()
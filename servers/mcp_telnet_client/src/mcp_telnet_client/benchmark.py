@@ -0,0 +1,227 @@
+# mcp_telnet_client/benchmark.py
+"""
+Offline benchmarks for telnet_client_tool.
+
+Each benchmark runs against a local TelnetSimulator, so changes to pooling,
+framing or the async I/O path can be measured and compared without a real
+device. Four things are measured:
+
+- connect: TCP connect, option negotiation and banner read
+- latency: per-command round trip on a warm session, sequential and pipelined
+- throughput: one-shot calls per second, with and without the connection pool
+- memory: heap growth per open session (tracemalloc)
+
+Run with:
+
+    python -m mcp_telnet_client.benchmark --output bench_output.txt
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+from .simulator import TelnetSimulator
+from .telnet_connection import TelnetConnection
+from .host_profiles import DEFAULT_PROMPT, get_prompt_pattern
+from .tools import telnet_client_tool, telnet_close_session, TELNET_SESSIONS, TELNET_POOL
+
+HOST = "127.0.0.1"
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    """Summarize timings (seconds) as milliseconds."""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+@contextmanager
+def _session_limits(extra: int) -> Iterator[None]:
+    """Raise the session limits so benchmark sessions are never evicted."""
+    limits = (TELNET_SESSIONS.max_sessions, TELNET_SESSIONS.max_sessions_per_host)
+    TELNET_SESSIONS.max_sessions = TELNET_SESSIONS.max_sessions_per_host = len(TELNET_SESSIONS) + extra
+    try:
+        yield
+    finally:
+        TELNET_SESSIONS.max_sessions, TELNET_SESSIONS.max_sessions_per_host = limits
+
+async def bench_connect(simulator: TelnetSimulator, iterations: int = 100) -> Dict[str, float]:
+    """
+    Time connect + negotiation + banner read for fresh connections.
+
+    :param simulator: Running simulator to connect to.
+    :param iterations: Number of connections to open.
+    :return: Timing summary.
+    """
+    prompt = get_prompt_pattern(DEFAULT_PROMPT)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        tn = await TelnetConnection.open(HOST, simulator.port)
+        await tn.expect(prompt, timeout=5)
+        samples.append(time.perf_counter() - start)
+        await tn.close()
+    return _summarize(samples)
+
+async def bench_command_latency(simulator: TelnetSimulator, commands: int = 200) -> Dict[str, dict]:
+    """
+    Time single commands on a warm session, and a pipelined batch.
+
+    :param simulator: Running simulator to connect to.
+    :param commands: Number of commands to send.
+    :return: Timing summaries for sequential calls and per-command pipelined cost.
+    """
+    session_id = f"bench-{uuid.uuid4()}"
+    await telnet_client_tool(HOST, simulator.port, ["warmup"], session_id=session_id)
+
+    samples = []
+    for i in range(commands):
+        start = time.perf_counter()
+        await telnet_client_tool(HOST, simulator.port, [f"cmd {i}"], session_id=session_id)
+        samples.append(time.perf_counter() - start)
+
+    batch = [f"cmd {i}" for i in range(commands)]
+    start = time.perf_counter()
+    await telnet_client_tool(HOST, simulator.port, batch, session_id=session_id, pipeline=True)
+    pipelined = time.perf_counter() - start
+
+    await telnet_close_session(session_id)
+    return {
+        "sequential": _summarize(samples),
+        "pipelined": {
+            "count": commands,
+            "total_ms": round(pipelined * 1000, 3),
+            "per_command_ms": round(pipelined * 1000 / commands, 3),
+        },
+    }
+
+async def bench_throughput(
+    simulator: TelnetSimulator,
+    calls: int = 500,
+    concurrency: int = 50,
+    pooled: bool = True
+) -> Dict[str, float]:
+    """
+    Measure one-shot telnet_client_tool calls per second.
+
+    :param simulator: Running simulator to connect to.
+    :param calls: Total number of calls.
+    :param concurrency: Calls in flight at once.
+    :param pooled: Use the connection pool; otherwise every call opens and closes its own connection.
+    :return: Calls per second and latency summary.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def one_call(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            if pooled:
+                await telnet_client_tool(HOST, simulator.port, [f"cmd {i}"])
+            else:
+                await telnet_client_tool(
+                    HOST, simulator.port, [f"cmd {i}"], session_id=f"bench-{uuid.uuid4()}", close_session=True
+                )
+            samples.append(time.perf_counter() - start)
+
+    with _session_limits(concurrency):
+        start = time.perf_counter()
+        await asyncio.gather(*(one_call(i) for i in range(calls)))
+        elapsed = time.perf_counter() - start
+    await TELNET_POOL.close_all()
+    return {"calls_per_second": round(calls / elapsed, 1), **_summarize(samples)}
+
+async def bench_memory_per_session(simulator: TelnetSimulator, sessions: int = 200) -> Dict[str, float]:
+    """
+    Measure heap growth per open session.
+
+    :param simulator: Running simulator to connect to.
+    :param sessions: Number of sessions to open.
+    :return: Bytes allocated per session.
+    """
+    session_ids = [f"bench-{uuid.uuid4()}" for _ in range(sessions)]
+    with _session_limits(sessions):
+        try:
+            # Warm caches (regexes, models) so they don't count towards sessions
+            await telnet_client_tool(HOST, simulator.port, ["warmup"], close_session=True)
+
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            for session_id in session_ids:
+                await telnet_client_tool(HOST, simulator.port, ["hello"], session_id=session_id)
+            after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+        finally:
+            for session_id in session_ids:
+                await telnet_close_session(session_id)
+
+    growth = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return {"sessions": sessions, "bytes_per_session": round(growth / sessions)}
+
+async def run_benchmarks(
+    iterations: int = 100,
+    calls: int = 500,
+    concurrency: int = 50,
+    sessions: int = 200,
+    command_delay: float = 0.0,
+    output_size: int = 0
+) -> dict:
+    """
+    Run every benchmark against a fresh simulator.
+
+    :param iterations: Connections for the connect benchmark and commands for the latency benchmark.
+    :param calls: Total calls for the throughput benchmarks.
+    :param concurrency: Calls in flight at once for the throughput benchmarks.
+    :param sessions: Sessions opened for the memory benchmark.
+    :param command_delay: Simulated device think time per command (seconds).
+    :param output_size: Simulated output bytes per command.
+    :return: Results keyed by benchmark name.
+    """
+    async with TelnetSimulator(command_delay=command_delay, output_size=output_size) as simulator:
+        results = {
+            "connect": await bench_connect(simulator, iterations),
+            "latency": await bench_command_latency(simulator, iterations),
+            "throughput_pooled": await bench_throughput(simulator, calls, concurrency, pooled=True),
+            "throughput_unpooled": await bench_throughput(simulator, calls, concurrency, pooled=False),
+            "memory": await bench_memory_per_session(simulator, sessions),
+        }
+    await TELNET_SESSIONS.close_all()
+    await TELNET_POOL.close_all()
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark telnet_client_tool against a local Telnet simulator")
+    parser.add_argument("--iterations", type=int, default=100, help="Connections/commands for connect and latency runs")
+    parser.add_argument("--calls", type=int, default=500, help="Total calls for throughput runs")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent calls for throughput runs")
+    parser.add_argument("--sessions", type=int, default=200, help="Sessions opened for the memory run")
+    parser.add_argument("--delay", type=float, default=0.0, help="Simulated per-command delay (seconds)")
+    parser.add_argument("--output-size", type=int, default=0, help="Simulated output bytes per command")
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmarks(
+        iterations=args.iterations,
+        calls=args.calls,
+        concurrency=args.concurrency,
+        sessions=args.sessions,
+        command_delay=args.delay,
+        output_size=args.output_size
+    ))
+    report = json.dumps(results, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+
+if __name__ == "__main__":
+    main()
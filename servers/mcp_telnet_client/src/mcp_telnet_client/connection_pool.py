@@ -0,0 +1,151 @@
+# mcp_telnet_client/connection_pool.py
+"""
+Telnet connection pool.
+
+Keeps warm, already-negotiated connections per host:port so one-shot
+telnet_client calls (no session_id) can skip the TCP connect, option
+negotiation and banner wait. Connections are health-checked before they
+are handed out and idle ones are closed after a timeout.
+"""
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Pattern, Tuple
+
+from .telnet_connection import TelnetConnection
+
+# Defaults, overridable through the environment
+DEFAULT_MAX_IDLE_PER_HOST = int(os.getenv("TELNET_POOL_MAX_IDLE_PER_HOST", "4"))
+DEFAULT_POOL_IDLE_TIMEOUT = float(os.getenv("TELNET_POOL_IDLE_TIMEOUT", "60"))
+
+class TelnetConnectionPool:
+    """
+    Pool of idle Telnet connections keyed by (host, port).
+
+    Idle connections are reused most-recently-returned first, which keeps
+    the warmest sockets in use and lets the rest age out.
+    """
+    def __init__(
+        self,
+        max_idle_per_host: int = DEFAULT_MAX_IDLE_PER_HOST,
+        idle_timeout: float = DEFAULT_POOL_IDLE_TIMEOUT
+    ):
+        self.max_idle_per_host = max_idle_per_host
+        self.idle_timeout = idle_timeout
+
+        self._idle: Dict[Tuple[str, int], Deque[Tuple[TelnetConnection, float]]] = {}
+        self._reaper_task: Optional[asyncio.Task] = None
+        self.counters: Dict[str, int] = {"hits": 0, "misses": 0, "discarded": 0}
+
+    def _is_reusable(self, tn: TelnetConnection, returned_at: float) -> bool:
+        """Health check run before a pooled connection is handed out."""
+        return tn.is_healthy and time.time() - returned_at <= self.idle_timeout
+
+    async def acquire(
+        self,
+        host: str,
+        port: int,
+        connect_timeout: float,
+        banner_prompt: Pattern[bytes],
+        banner_timeout: float,
+        idle_gap: Optional[float] = None
+    ) -> Tuple[TelnetConnection, Optional[str]]:
+        """
+        Check out a connection, opening a new one if none is reusable.
+
+        :param host: Host/IP of the Telnet server.
+        :param port: Port number.
+        :param connect_timeout: Connect timeout for new connections.
+        :param banner_prompt: Prompt pattern ending the banner on new connections.
+        :param banner_timeout: Banner read timeout for new connections.
+        :param idle_gap: Optional silence that also ends the banner read.
+        :return: The connection and its banner, or None for the banner if it was reused.
+        """
+        idle = self._idle.get((host, port))
+        while idle:
+            tn, returned_at = idle.pop()
+            if self._is_reusable(tn, returned_at):
+                self.counters["hits"] += 1
+                return tn, None
+            self.counters["discarded"] += 1
+            await tn.close()
+
+        self.counters["misses"] += 1
+        tn = await TelnetConnection.open(host, port, timeout=connect_timeout)
+        try:
+            banner = await tn.expect(banner_prompt, timeout=banner_timeout, idle_gap=idle_gap)
+        except BaseException:
+            await tn.close()
+            raise
+        return tn, banner.data.decode("utf-8", errors="ignore")
+
+    async def release(self, host: str, port: int, tn: TelnetConnection) -> None:
+        """
+        Return a connection to the pool, or close it if it can't be reused.
+
+        :param host: Host/IP of the Telnet server.
+        :param port: Port number.
+        :param tn: The connection being returned.
+        """
+        self.ensure_reaper()
+        idle = self._idle.setdefault((host, port), deque())
+        if not tn.is_healthy or len(idle) >= self.max_idle_per_host:
+            self.counters["discarded"] += 1
+            await tn.close()
+            return
+        idle.append((tn, time.time()))
+
+    async def reap(self) -> int:
+        """
+        Close idle connections that have expired or gone unhealthy.
+
+        :return: Number of connections closed.
+        """
+        closed = 0
+        for key, idle in list(self._idle.items()):
+            keep = deque()
+            while idle:
+                tn, returned_at = idle.popleft()
+                if self._is_reusable(tn, returned_at):
+                    keep.append((tn, returned_at))
+                else:
+                    await tn.close()
+                    closed += 1
+            if keep:
+                self._idle[key] = keep
+            else:
+                del self._idle[key]
+        self.counters["discarded"] += closed
+        return closed
+
+    async def _reaper(self) -> None:
+        """Periodically close expired idle connections."""
+        while True:
+            await asyncio.sleep(self.idle_timeout)
+            await self.reap()
+
+    def ensure_reaper(self) -> None:
+        """Start the background reaper on the running loop if needed."""
+        loop = asyncio.get_running_loop()
+        task = self._reaper_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._reaper_task = loop.create_task(self._reaper())
+
+    async def close_all(self) -> None:
+        """Close every idle connection and stop the reaper."""
+        for idle in self._idle.values():
+            while idle:
+                tn, _ = idle.pop()
+                await tn.close()
+        self._idle.clear()
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+            self._reaper_task = None
+
+    def stats(self) -> dict:
+        """Return idle counts per host and reuse counters."""
+        return {
+            "idle_connections": {f"{host}:{port}": len(idle) for (host, port), idle in self._idle.items() if idle},
+            **self.counters
+        }
@@ -0,0 +1,56 @@
+# mcp_telnet_client/host_profiles.py
+"""
+Per-host Telnet profiles.
+
+A profile describes how to frame responses from a particular device: the
+prompt regex that ends each command's output, how long to wait, and an
+optional idle gap for devices whose prompt is not known up front.
+Profiles are keyed by "host:port", with a bare "host" entry acting as a
+fallback for every port on that host.
+"""
+from functools import lru_cache
+from typing import Dict, Optional, Pattern
+
+from .models import HostProfile
+from .telnet_connection import compile_prompt
+
+# Prompt used when neither the call nor a host profile provides one
+DEFAULT_PROMPT = r"> "
+
+# Registered profiles keyed by "host:port" or "host"
+HOST_PROFILES: Dict[str, HostProfile] = {}
+
+def profile_key(host: str, port: Optional[int] = None) -> str:
+    """Build the registry key for a host, optionally scoped to one port."""
+    return host if port is None else f"{host}:{port}"
+
+def register_host_profile(profile: HostProfile) -> None:
+    """
+    Register or replace a host profile.
+
+    :param profile: The profile to store.
+    """
+    # Compile eagerly so an invalid regex is rejected at registration time
+    get_prompt_pattern(profile.prompt)
+    HOST_PROFILES[profile_key(profile.host, profile.port)] = profile
+
+def resolve_host_profile(host: str, port: int) -> Optional[HostProfile]:
+    """
+    Find the most specific profile for host:port.
+
+    :param host: Host of the Telnet server.
+    :param port: Port of the Telnet server.
+    :return: The matching profile, or None.
+    """
+    return HOST_PROFILES.get(profile_key(host, port)) or HOST_PROFILES.get(profile_key(host))
+
+@lru_cache(maxsize=256)
+def get_prompt_pattern(prompt: str, anchored: bool = True) -> Pattern[bytes]:
+    """
+    Compile (and cache) a prompt regex.
+
+    :param prompt: Regular expression describing the device prompt.
+    :param anchored: Whether the prompt must be at the end of the data.
+    :return: Compiled bytes pattern.
+    """
+    return compile_prompt(prompt, anchored)
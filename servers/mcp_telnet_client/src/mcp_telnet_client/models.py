@@ -1,18 +1,87 @@
 # mcp_telnet_client/models.py
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
+
+from .output_stream import DEFAULT_BUFFER_SIZE
 
 class TelnetClientInput(BaseModel):
     host: str = Field(..., description="Host or IP address of the Telnet server.")
     port: int = Field(..., description="Port on which the Telnet server is listening.")
     commands: List[str] = Field(..., description="Commands to send sequentially.")
+    session_id: Optional[str] = Field(None, description="Session ID that keeps the connection open between calls.")
+    close_session: bool = Field(False, description="Close the session (or pooled connection) after the commands.")
+    prompt: Optional[str] = Field(None, description="Regex matching the device prompt that ends each response.")
+    command_timeout: Optional[float] = Field(None, gt=0, description="Maximum seconds to wait for each response.")
+    idle_gap: Optional[float] = Field(None, gt=0, description="Seconds of silence after output that end a response.")
+    pipeline: bool = Field(False, description="Send all commands up front and split responses on prompt boundaries.")
 
 class CommandResponse(BaseModel):
     command: str
     response: str
+    # Why the read ended: "prompt", "idle", "timeout" or "eof"
+    end_reason: Optional[str] = None
 
 class TelnetClientOutput(BaseModel):
     host: str
     port: int
     initial_banner: str
     responses: List[CommandResponse]
+    session_id: Optional[str] = None
+    session_active: bool = False
+    connection_reused: bool = False
+
+class TelnetTarget(BaseModel):
+    host: str = Field(..., description="Host or IP address of the Telnet server.")
+    port: int = Field(23, description="Port on which the Telnet server is listening.")
+
+class TelnetMultiClientInput(BaseModel):
+    targets: List[TelnetTarget] = Field(..., min_length=1, description="Telnet servers to run the commands on.")
+    commands: List[str] = Field(..., description="Commands to send sequentially on every target.")
+    max_concurrency: int = Field(50, ge=1, description="Maximum number of targets processed at once.")
+    prompt: Optional[str] = Field(None, description="Regex matching the device prompt that ends each response.")
+    command_timeout: Optional[float] = Field(None, gt=0, description="Maximum seconds to wait for each response.")
+    idle_gap: Optional[float] = Field(None, gt=0, description="Seconds of silence after output that end a response.")
+    pipeline: bool = Field(False, description="Send all commands up front and split responses on prompt boundaries.")
+
+class TelnetHostResult(BaseModel):
+    host: str
+    port: int
+    success: bool
+    output: Optional[TelnetClientOutput] = None
+    error: Optional[str] = None
+    elapsed_seconds: float
+
+class TelnetMultiClientOutput(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    elapsed_seconds: float
+    results: List[TelnetHostResult]
+
+class HostProfile(BaseModel):
+    host: str = Field(..., description="Host or IP address the profile applies to.")
+    port: Optional[int] = Field(None, description="Port the profile applies to; omit to cover every port on the host.")
+    prompt: str = Field(..., description="Regex matching the device prompt that ends each response.")
+    banner_timeout: Optional[float] = Field(None, gt=0, description="Maximum seconds to wait for the login banner.")
+    command_timeout: Optional[float] = Field(None, gt=0, description="Maximum seconds to wait for each response.")
+    idle_gap: Optional[float] = Field(None, gt=0, description="Seconds of silence after output that end a response.")
+
+class TelnetStreamInput(BaseModel):
+    host: str = Field(..., description="Host or IP address of the Telnet server.")
+    port: int = Field(..., description="Port on which the Telnet server is listening.")
+    command: str = Field(..., description="Command whose output should be streamed.")
+    session_id: Optional[str] = Field(None, description="Session to run the command on; otherwise a pooled connection is used.")
+    prompt: Optional[str] = Field(None, description="Regex matching the device prompt that ends the output.")
+    command_timeout: Optional[float] = Field(None, gt=0, description="Maximum seconds to wait for the output to finish.")
+    idle_gap: Optional[float] = Field(None, gt=0, description="Seconds of silence after output that end the stream.")
+    buffer_size: int = Field(DEFAULT_BUFFER_SIZE, ge=1024, description="Ring buffer capacity in bytes.")
+
+class TelnetStreamChunk(BaseModel):
+    stream_id: str
+    data: str
+    cursor: int
+    next_cursor: int
+    dropped_bytes: int
+    done: bool
+    end_reason: Optional[str] = None
+    error: Optional[str] = None
@@ -0,0 +1,119 @@
+# mcp_telnet_client/output_stream.py
+"""
+Bounded output streams for long-running Telnet commands.
+
+A command's output is written into a fixed-size ring buffer as it arrives
+and read back with byte cursors, so a multi-megabyte config dump or log
+tail is consumed in pieces with constant memory instead of being buffered
+whole into a single response.
+"""
+import asyncio
+import time
+from typing import Optional, Tuple
+
+# Default ring buffer capacity per stream (bytes)
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+class OutputRingBuffer:
+    """
+    Fixed-capacity byte buffer addressed by absolute offsets.
+
+    Offsets count every byte ever written, so a reader's cursor stays valid
+    while old data is dropped. A cursor that falls behind the oldest
+    retained byte is moved forward and the gap is reported as dropped.
+    """
+    def __init__(self, capacity: int = DEFAULT_BUFFER_SIZE):
+        self.capacity = capacity
+        self._data = bytearray()
+        # Absolute offset of the first byte held in _data
+        self.start_offset = 0
+        self._changed = asyncio.Event()
+
+    @property
+    def end_offset(self) -> int:
+        """Absolute offset one past the last byte written."""
+        return self.start_offset + len(self._data)
+
+    def write(self, data: bytes) -> None:
+        """Append data, discarding the oldest bytes beyond capacity."""
+        self._data += data
+        overflow = len(self._data) - self.capacity
+        if overflow > 0:
+            del self._data[:overflow]
+            self.start_offset += overflow
+        self._changed.set()
+
+    def read(self, cursor: int, max_bytes: int) -> Tuple[bytes, int, int]:
+        """
+        Read up to ``max_bytes`` starting at ``cursor``.
+
+        :param cursor: Absolute offset to read from.
+        :param max_bytes: Maximum number of bytes to return.
+        :return: The data, the cursor for the next read and how many bytes were dropped.
+        """
+        dropped = 0
+        if cursor < self.start_offset:
+            dropped = self.start_offset - cursor
+            cursor = self.start_offset
+        index = cursor - self.start_offset
+        data = bytes(self._data[index:index + max_bytes])
+        return data, cursor + len(data), dropped
+
+    def notify(self) -> None:
+        """Wake readers waiting for new data."""
+        self._changed.set()
+
+    async def wait(self, cursor: int, timeout: float) -> None:
+        """Wait until data past ``cursor`` is available or the timeout expires."""
+        if cursor < self.end_offset:
+            return
+        self._changed.clear()
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+class TelnetOutputStream:
+    """A command whose output is being captured into a ring buffer."""
+    def __init__(self, stream_id: str, host: str, port: int, command: str, buffer_size: int):
+        self.stream_id = stream_id
+        self.host = host
+        self.port = port
+        self.command = command
+        self.buffer = OutputRingBuffer(buffer_size)
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.end_reason: Optional[str] = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def finish(self, end_reason: Optional[str] = None, error: Optional[str] = None) -> None:
+        """Mark the stream finished and wake any waiting readers."""
+        self.end_reason = end_reason
+        self.error = error
+        self.finished_at = time.time()
+        self.buffer.notify()
+
+def utf8_safe_split(data: bytes) -> Tuple[bytes, bytes]:
+    """
+    Split off a trailing incomplete UTF-8 sequence.
+
+    :param data: Bytes that may end part-way through a character.
+    :return: The complete prefix and the incomplete tail (possibly empty).
+    """
+    # Look back at most 3 bytes for the lead byte of a multi-byte character
+    for back in range(1, min(4, len(data)) + 1):
+        byte = data[-back]
+        if byte & 0xC0 == 0x80:
+            continue  # continuation byte, keep looking
+        if byte & 0x80 == 0:
+            return data, b""  # ASCII, sequence complete
+        needed = 2 if byte & 0xE0 == 0xC0 else 3 if byte & 0xF0 == 0xE0 else 4
+        if back < needed:
+            return data[:-back], data[-back:]
+        return data, b""
+    return data, b""
@@ -0,0 +1,209 @@
+# mcp_telnet_client/session_manager.py
+"""
+Telnet session manager.
+
+Keeps named Telnet sessions alive between tool calls while bounding how
+many can exist. Sessions are kept in least-recently-used order; when a
+global or per-host cap is hit the least recently used idle session is
+evicted, and a background reaper closes sessions that have been idle for
+longer than the TTL or whose remote end has gone away.
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional, Tuple
+
+from mcp.shared.exceptions import McpError
+from mcp.types import ErrorData, INTERNAL_ERROR
+
+# Defaults, overridable through the environment
+DEFAULT_MAX_SESSIONS = int(os.getenv("TELNET_MAX_SESSIONS", "256"))
+DEFAULT_MAX_SESSIONS_PER_HOST = int(os.getenv("TELNET_MAX_SESSIONS_PER_HOST", "16"))
+DEFAULT_IDLE_TIMEOUT = float(os.getenv("TELNET_IDLE_TIMEOUT", "300"))
+DEFAULT_REAP_INTERVAL = float(os.getenv("TELNET_REAP_INTERVAL", "30"))
+
+class TelnetSessionManager:
+    """
+    Bounded, LRU-ordered store of Telnet sessions.
+
+    Each session is a dict holding the ``telnet`` connection together with
+    its ``host``, ``port``, ``created_at`` and ``last_used`` timestamps.
+    Sessions whose connection lock is held are in use and are never evicted.
+    """
+    def __init__(
+        self,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        max_sessions_per_host: int = DEFAULT_MAX_SESSIONS_PER_HOST,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        reap_interval: float = DEFAULT_REAP_INTERVAL
+    ):
+        self.max_sessions = max_sessions
+        self.max_sessions_per_host = max_sessions_per_host
+        self.idle_timeout = idle_timeout
+        self.reap_interval = reap_interval
+
+        self._sessions: "OrderedDict[str, dict]" = OrderedDict()
+        self._reaper_task: Optional[asyncio.Task] = None
+        self.evictions: Dict[str, int] = {"idle": 0, "closed": 0, "lru": 0, "host_limit": 0}
+
+    # Mapping-style access
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __getitem__(self, session_id: str) -> dict:
+        return self._sessions[session_id]
+
+    def items(self) -> Iterator[Tuple[str, dict]]:
+        return iter(list(self._sessions.items()))
+
+    def get(self, session_id: str) -> Optional[dict]:
+        """
+        Look up a session and mark it as most recently used.
+
+        :param session_id: The session ID.
+        :return: The session dict, or None if not found.
+        """
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self.touch(session_id)
+        return session
+
+    def touch(self, session_id: str) -> None:
+        """Record activity on a session."""
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session["last_used"] = time.time()
+            self._sessions.move_to_end(session_id)
+
+    async def add(self, session_id: str, telnet, host: str, port: int) -> dict:
+        """
+        Store a new session, evicting idle sessions if a cap is reached.
+
+        :param session_id: The session ID.
+        :param telnet: The open TelnetConnection.
+        :param host: Host of the Telnet server.
+        :param port: Port of the Telnet server.
+        :return: The stored session dict.
+        :raises McpError: If the session ID is already taken, or a cap is
+            reached and every session is in use. The caller still owns and
+            must close ``telnet`` in that case.
+        """
+        self._check_unused(session_id)
+        self.ensure_reaper()
+
+        host_sessions = [sid for sid, s in self._sessions.items() if (s["host"], s["port"]) == (host, port)]
+        if len(host_sessions) >= self.max_sessions_per_host:
+            await self._evict_one(host_sessions, "host_limit")
+        if len(self._sessions) >= self.max_sessions:
+            await self._evict_one(list(self._sessions), "lru")
+
+        # Evicting awaits, so a concurrent add may have taken the ID meanwhile;
+        # nothing awaits between this check and the insert
+        self._check_unused(session_id)
+        now = time.time()
+        session = {
+            "telnet": telnet,
+            "host": host,
+            "port": port,
+            "created_at": now,
+            "last_used": now
+        }
+        self._sessions[session_id] = session
+        return session
+
+    def _check_unused(self, session_id: str) -> None:
+        """Refuse to overwrite, and so leak, an existing session."""
+        if session_id in self._sessions:
+            raise McpError(ErrorData(
+                code=INTERNAL_ERROR,
+                message=f"Telnet session {session_id} already exists"
+            ))
+
+    async def _evict_one(self, candidates: list, reason: str) -> None:
+        """Close the least recently used idle session among the candidates."""
+        for session_id in candidates:
+            if not self._sessions[session_id]["telnet"].lock.locked():
+                await self.close(session_id)
+                self.evictions[reason] += 1
+                return
+        raise McpError(ErrorData(
+            code=INTERNAL_ERROR,
+            message=f"Telnet session limit reached ({reason}) and all sessions are busy"
+        ))
+
+    def pop(self, session_id: str) -> Optional[dict]:
+        """Remove a session without closing it."""
+        return self._sessions.pop(session_id, None)
+
+    async def close(self, session_id: str) -> bool:
+        """
+        Remove a session and close its socket.
+
+        :param session_id: The session ID.
+        :return: True if the session existed.
+        """
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        try:
+            await session["telnet"].close()
+        except Exception:
+            pass  # Best effort to close
+        return True
+
+    async def close_all(self) -> None:
+        """Close every session and stop the reaper."""
+        for session_id in list(self._sessions):
+            await self.close(session_id)
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+            self._reaper_task = None
+
+    async def reap(self) -> int:
+        """
+        Close sessions that are idle past the TTL or disconnected.
+
+        :return: Number of sessions closed.
+        """
+        now = time.time()
+        reaped = 0
+        for session_id, session in list(self._sessions.items()):
+            telnet = session["telnet"]
+            if telnet.lock.locked():
+                continue
+            if telnet.at_eof or telnet.is_closing:
+                reason = "closed"
+            elif now - session["last_used"] > self.idle_timeout:
+                reason = "idle"
+            else:
+                continue
+            await self.close(session_id)
+            self.evictions[reason] += 1
+            reaped += 1
+        return reaped
+
+    async def _reaper(self) -> None:
+        """Periodically reap idle sessions."""
+        while True:
+            await asyncio.sleep(self.reap_interval)
+            await self.reap()
+
+    def ensure_reaper(self) -> None:
+        """Start the background reaper on the running loop if needed."""
+        loop = asyncio.get_running_loop()
+        task = self._reaper_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._reaper_task = loop.create_task(self._reaper())
+
+    def stats(self) -> dict:
+        """Return limits and eviction counters."""
+        return {
+            "max_sessions": self.max_sessions,
+            "max_sessions_per_host": self.max_sessions_per_host,
+            "idle_timeout_seconds": self.idle_timeout,
+            "evictions": dict(self.evictions)
+        }
@@ -0,0 +1,178 @@
+# mcp_telnet_client/simulator.py
+"""
+Local Telnet device simulator.
+
+An asyncio Telnet server that behaves like a simple network device, so
+the telnet tools can be tested and benchmarked without real hardware.
+The banner, prompt, option negotiation, per-command delay and output size
+are all configurable.
+
+Run standalone with:
+
+    python -m mcp_telnet_client.simulator --port 8023 --prompt "router# "
+"""
+import argparse
+import asyncio
+from typing import Iterable, List, Optional, Set, Tuple
+
+from .telnet_connection import IAC, DO, DONT, WILL, WONT
+
+ECHO_OPTION = bytes([1])
+SGA_OPTION = bytes([3])
+
+# Options the simulator asks for on connect, as (command, option) pairs
+DEFAULT_OPTIONS: Tuple[Tuple[bytes, bytes], ...] = ((DO, ECHO_OPTION), (WILL, SGA_OPTION))
+
+# Size of each write when emitting large outputs
+OUTPUT_CHUNK_SIZE = 16 * 1024
+
+class TelnetSimulator:
+    """
+    Simulated Telnet device.
+
+    Every command line is answered with ``you said <command>`` followed by
+    ``output_size`` bytes of filler and the prompt, after ``command_delay``
+    seconds. Commands listed in ``silent_commands`` get no reply at all,
+    which simulates a hung device.
+    """
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        banner: bytes = b"Welcome\r\n",
+        prompt: bytes = b"> ",
+        options: Iterable[Tuple[bytes, bytes]] = DEFAULT_OPTIONS,
+        command_delay: float = 0.0,
+        output_size: int = 0,
+        silent_commands: Iterable[str] = ()
+    ):
+        self.host = host
+        self.port = port
+        self.banner = banner
+        self.prompt = prompt
+        self.options = tuple(options)
+        self.command_delay = command_delay
+        self.output_size = output_size
+        self.silent_commands: Set[bytes] = {c.encode("utf-8") for c in silent_commands}
+
+        self.server: Optional[asyncio.base_events.Server] = None
+
+        # Counters
+        self.connections = 0
+        self.active_connections = 0
+        self.commands = 0
+        # Negotiation replies received from clients as (command, option) pairs
+        self.negotiation_replies: List[Tuple[bytes, bytes]] = []
+
+    def _filler(self) -> bytes:
+        """Build ``output_size`` bytes of printable output lines."""
+        line = b"x" * 78 + b"\r\n"
+        full, rest = divmod(self.output_size, len(line))
+        return line * full + b"x" * rest
+
+    async def _reply(self, writer: asyncio.StreamWriter, line: bytes) -> None:
+        """Answer one command line."""
+        if self.command_delay:
+            await asyncio.sleep(self.command_delay)
+
+        writer.write(b"you said " + line + b"\r\n")
+        if self.output_size:
+            filler = self._filler()
+            for offset in range(0, len(filler), OUTPUT_CHUNK_SIZE):
+                writer.write(filler[offset:offset + OUTPUT_CHUNK_SIZE])
+                await writer.drain()
+        writer.write(self.prompt)
+        await writer.drain()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one client connection."""
+        self.connections += 1
+        self.active_connections += 1
+        try:
+            negotiation = b"".join(IAC + cmd + opt for cmd, opt in self.options)
+            writer.write(negotiation + self.banner + self.prompt)
+            await writer.drain()
+
+            line = bytearray()
+            iac_seq = b""
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    break
+                for byte in data:
+                    c = bytes([byte])
+                    if iac_seq:
+                        iac_seq += c
+                        if len(iac_seq) == 2 and c == IAC:
+                            line += IAC
+                            iac_seq = b""
+                        elif len(iac_seq) == 2 and c not in (DO, DONT, WILL, WONT):
+                            iac_seq = b""
+                        elif len(iac_seq) == 3:
+                            self.negotiation_replies.append((iac_seq[1:2], iac_seq[2:3]))
+                            iac_seq = b""
+                    elif c == IAC:
+                        iac_seq = c
+                    elif c == b"\n":
+                        command = bytes(line).rstrip(b"\r")
+                        line.clear()
+                        self.commands += 1
+                        if command not in self.silent_commands:
+                            await self._reply(writer, command)
+                    else:
+                        line += c
+        except ConnectionError:
+            pass
+        finally:
+            self.active_connections -= 1
+            writer.close()
+
+    async def start(self) -> "TelnetSimulator":
+        """Start listening; the bound port is available as ``self.port``."""
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def __aenter__(self) -> "TelnetSimulator":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+async def _serve(args: argparse.Namespace) -> None:
+    simulator = TelnetSimulator(
+        host=args.host,
+        port=args.port,
+        banner=args.banner.encode("utf-8") + b"\r\n",
+        prompt=args.prompt.encode("utf-8"),
+        command_delay=args.delay,
+        output_size=args.output_size
+    )
+    await simulator.start()
+    print(f"Telnet simulator listening on {simulator.host}:{simulator.port}")
+    await simulator.server.serve_forever()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulated Telnet device for testing the telnet tools")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8023, help="Port to listen on")
+    parser.add_argument("--banner", default="Welcome", help="Banner sent on connect")
+    parser.add_argument("--prompt", default="> ", help="Prompt sent after the banner and every response")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before answering each command")
+    parser.add_argument("--output-size", type=int, default=0, help="Bytes of filler output per command")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+# mcp_telnet_client/telnet_connection.py
+"""
+Asyncio Telnet connection.
+
+A small Telnet client built on asyncio streams. It performs the same
+minimal option negotiation as the original telnetlib-based tool: every
+DO is answered with WONT and every WILL with DONT, so the remote end
+falls back to a plain NVT session.
+"""
+import asyncio
+import re
+import time
+from typing import Callable, NamedTuple, Optional, Pattern
+
+# Telnet IAC / negotiation constants
+IAC  = bytes([255])  # Interpret As Command
+DONT = bytes([254])
+DO   = bytes([253])
+WONT = bytes([252])
+WILL = bytes([251])
+SB   = bytes([250])  # Subnegotiation Begin
+SE   = bytes([240])  # Subnegotiation End
+NULL = bytes([0])
+
+# Size of each read from the underlying stream
+READ_CHUNK_SIZE = 4096
+
+# How far back from the end of the buffer a prompt is searched for
+PROMPT_SEARCH_WINDOW = 512
+
+class ExpectResult(NamedTuple):
+    """Outcome of TelnetConnection.expect."""
+    data: bytes
+    # One of "prompt", "idle", "timeout" or "eof"
+    reason: str
+
+def compile_prompt(prompt: str, anchored: bool = True) -> Pattern[bytes]:
+    """
+    Compile a prompt regex for use with TelnetConnection.expect.
+
+    An anchored pattern only matches at the end of the received data, so
+    output that merely contains the prompt text (e.g. "> " inside a config
+    dump) does not end the read early. Unanchored patterns match the first
+    prompt anywhere, which is what splitting pipelined responses needs.
+
+    :param prompt: Regular expression describing the device prompt.
+    :param anchored: Whether the prompt must be at the end of the data.
+    :return: Compiled bytes pattern.
+    """
+    pattern = b"(?:" + prompt.encode("utf-8") + b")"
+    if anchored:
+        pattern += b"\\Z"
+    return re.compile(pattern)
+
+class TelnetConnection:
+    """
+    A Telnet session over an asyncio stream pair.
+
+    Incoming data is stripped of IAC sequences and buffered; negotiation
+    requests are refused as they arrive. A lock is provided so callers
+    sharing a connection can serialise command/response exchanges.
+    """
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.lock = asyncio.Lock()
+
+        # Cooked (IAC-free) data not yet returned to the caller
+        self._buffer = bytearray()
+        # Partial IAC sequence carried across reads
+        self._iac_seq = b""
+        # Whether we are inside an IAC SB ... IAC SE block
+        self._in_sb = False
+        self._eof = False
+
+    @classmethod
+    async def open(cls, host: str, port: int, timeout: float = 10) -> "TelnetConnection":
+        """
+        Open a Telnet connection.
+
+        :param host: Host/IP of the Telnet server.
+        :param port: Port number.
+        :param timeout: Connect timeout in seconds.
+        :return: A connected TelnetConnection.
+        """
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port),
+            timeout=timeout
+        )
+        return cls(reader, writer)
+
+    @property
+    def at_eof(self) -> bool:
+        """True once the remote end has closed the connection."""
+        return self._eof or self.reader.at_eof()
+
+    @property
+    def is_healthy(self) -> bool:
+        """True if the connection is open and has no unread data buffered."""
+        return not self.is_closing and not self.at_eof and not self._buffer
+
+    @property
+    def is_closing(self) -> bool:
+        """True if the transport is closed or closing."""
+        return self.writer.is_closing()
+
+    def _process_raw(self, data: bytes) -> None:
+        """Strip IAC sequences from raw data, answering negotiation requests."""
+        replies = bytearray()
+        pos = 0
+        while pos < len(data):
+            if not self._iac_seq:
+                # Copy (or skip, inside SB) everything up to the next IAC in one go
+                end = data.find(IAC, pos)
+                if end == -1:
+                    end = len(data)
+                if not self._in_sb:
+                    self._buffer += data[pos:end].replace(NULL, b"")
+                if end == len(data):
+                    break
+                self._iac_seq = IAC
+                pos = end + 1
+                continue
+
+            c = data[pos:pos + 1]
+            pos += 1
+            seq = self._iac_seq + c
+            if len(seq) == 2:
+                cmd = c
+                if cmd == IAC:
+                    # Escaped 255 data byte
+                    self._iac_seq = b""
+                    if not self._in_sb:
+                        self._buffer += IAC
+                elif cmd in (DO, DONT, WILL, WONT):
+                    # Wait for the option byte
+                    self._iac_seq = seq
+                elif cmd == SB:
+                    self._in_sb = True
+                    self._iac_seq = b""
+                elif cmd == SE:
+                    self._in_sb = False
+                    self._iac_seq = b""
+                else:
+                    # Other two-byte commands (NOP, GA, ...) are ignored
+                    self._iac_seq = b""
+            else:
+                cmd, opt = seq[1:2], seq[2:3]
+                if cmd == DO:
+                    replies += IAC + WONT + opt
+                elif cmd == WILL:
+                    replies += IAC + DONT + opt
+                self._iac_seq = b""
+
+        if replies:
+            self.writer.write(bytes(replies))
+
+    async def _fill(self, timeout: Optional[float]) -> bool:
+        """
+        Read one chunk from the stream into the buffer.
+
+        :param timeout: Seconds to wait for data, or None to wait forever.
+        :return: False if no data arrived before the timeout or EOF.
+        """
+        if self._eof:
+            return False
+        try:
+            data = await asyncio.wait_for(self.reader.read(READ_CHUNK_SIZE), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        if not data:
+            self._eof = True
+            return False
+        self._process_raw(data)
+        return True
+
+    async def read_until(self, marker: bytes, timeout: Optional[float] = None) -> bytes:
+        """
+        Read until the marker is seen or the timeout expires.
+
+        Like telnetlib, whatever has been received is returned when the
+        timeout expires or the connection closes.
+
+        :param marker: Byte string that ends the read.
+        :param timeout: Seconds to wait, or None to wait forever.
+        :return: The data read, including the marker if found.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        search_from = 0
+        while True:
+            index = self._buffer.find(marker, search_from)
+            if index >= 0:
+                end = index + len(marker)
+                data = bytes(self._buffer[:end])
+                del self._buffer[:end]
+                return data
+
+            # Only rescan the tail that could still hold a partial marker
+            search_from = max(0, len(self._buffer) - len(marker) + 1)
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            if not await self._fill(remaining):
+                break
+
+        return self.read_eager()
+
+    async def expect(
+        self,
+        prompt: Pattern[bytes],
+        timeout: Optional[float] = None,
+        idle_gap: Optional[float] = None
+    ) -> ExpectResult:
+        """
+        Read until the prompt matches.
+
+        Returns as soon as the prompt is seen rather than waiting for a
+        timeout. With ``idle_gap`` set, the read also ends once data has
+        been received and the line has then gone quiet for that long,
+        which suits devices whose prompt is unknown.
+
+        :param prompt: Pattern from compile_prompt; data after the match stays buffered.
+        :param timeout: Overall seconds to wait, or None to wait forever.
+        :param idle_gap: Seconds of silence after data that end the read.
+        :return: The data read and why the read ended.
+        """
+        chunks = []
+        reason = await self.expect_stream(prompt, chunks.append, timeout=timeout, idle_gap=idle_gap)
+        return ExpectResult(b"".join(chunks), reason)
+
+    async def expect_stream(
+        self,
+        prompt: Pattern[bytes],
+        sink: Callable[[bytes], None],
+        timeout: Optional[float] = None,
+        idle_gap: Optional[float] = None
+    ) -> str:
+        """
+        Like expect, but hand data to ``sink`` as it arrives.
+
+        Only the tail that could still contain the prompt is held back, so
+        memory stays bounded no matter how much output the command produces.
+
+        :param prompt: Pattern from compile_prompt.
+        :param sink: Called with each chunk of output, in order.
+        :param timeout: Overall seconds to wait, or None to wait forever.
+        :param idle_gap: Seconds of silence after data that end the read.
+        :return: Why the read ended: "prompt", "idle", "timeout" or "eof".
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        received = False
+        reason = None
+        # Length of the buffer already searched without a match
+        scanned = 0
+        while reason is None:
+            received = received or bool(self._buffer)
+            if self._buffer:
+                match = prompt.search(self._buffer, max(0, scanned - PROMPT_SEARCH_WINDOW))
+                if match:
+                    # Anything after the prompt belongs to the next response
+                    sink(bytes(self._buffer[:match.end()]))
+                    del self._buffer[:match.end()]
+                    return "prompt"
+                scanned = len(self._buffer)
+
+            # Pass on everything except the tail a prompt could still start in
+            if len(self._buffer) > PROMPT_SEARCH_WINDOW:
+                cut = len(self._buffer) - PROMPT_SEARCH_WINDOW
+                sink(bytes(self._buffer[:cut]))
+                del self._buffer[:cut]
+                scanned -= cut
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                reason = "timeout"
+                break
+
+            wait = remaining
+            use_idle_gap = idle_gap is not None and received
+            if use_idle_gap:
+                wait = idle_gap if wait is None else min(wait, idle_gap)
+
+            if not await self._fill(wait):
+                if self._eof:
+                    reason = "eof"
+                elif use_idle_gap and (remaining is None or remaining > idle_gap):
+                    reason = "idle"
+
+        data = self.read_eager()
+        if data:
+            sink(data)
+        return reason
+
+    def read_eager(self) -> bytes:
+        """Return and clear everything currently buffered."""
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+    async def write(self, data: bytes) -> None:
+        """
+        Write data to the connection, escaping IAC bytes.
+
+        :param data: Bytes to send.
+        """
+        self.writer.write(data.replace(IAC, IAC + IAC))
+        await self.writer.drain()
+
+    async def close(self) -> None:
+        """Close the connection and wait for the transport to shut down."""
+        if self.writer.is_closing():
+            return
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass  # Best effort to close
@@ -1,160 +1,653 @@
-import telnetlib
+import asyncio
+import re
 import time
-from typing import List, Optional, Dict
-from pydantic import ValidationError
+import uuid
+from typing import Dict, List, Optional, Tuple
 
 from common.mcp_tool_decorator import mcp_tool
 from mcp.shared.exceptions import McpError
+from mcp.types import ErrorData, INTERNAL_ERROR
 
-from .models import TelnetClientInput, TelnetClientOutput, CommandResponse
+from .models import (
+    TelnetClientInput,
+    TelnetClientOutput,
+    CommandResponse,
+    TelnetMultiClientInput,
+    TelnetMultiClientOutput,
+    TelnetHostResult,
+    TelnetTarget,
+    HostProfile,
+    TelnetStreamInput,
+    TelnetStreamChunk,
+)
+from .telnet_connection import TelnetConnection
+from .host_profiles import (
+    DEFAULT_PROMPT,
+    HOST_PROFILES,
+    register_host_profile,
+    resolve_host_profile,
+    get_prompt_pattern,
+)
+from .session_manager import TelnetSessionManager
+from .connection_pool import TelnetConnectionPool
+from .output_stream import TelnetOutputStream, DEFAULT_BUFFER_SIZE, utf8_safe_split
 
-# Telnet IAC / negotiation constants
-IAC  = bytes([255])  # Interpret As Command
-DONT = bytes([254])
-DO   = bytes([253])
-WONT = bytes([252])
-WILL = bytes([251])
+# Default timeouts (seconds)
+CONNECT_TIMEOUT = 10
+BANNER_TIMEOUT = 2
+COMMAND_TIMEOUT = 5
+STREAM_TIMEOUT = 300
 
-# Global session store
-TELNET_SESSIONS: Dict[str, dict] = {}
+# Seconds a finished stream is kept for readers before it is discarded
+STREAM_RETENTION = 300
 
-@mcp_tool(name="telnet_client", description="Connect to a Telnet server, run commands, and return output.")
-def telnet_client_tool(
-    host: str, 
-    port: int, 
-    commands: List[str], 
-    session_id: Optional[str] = None,
-    close_session: bool = False
+# Global session store; bounded, with idle-timeout and LRU eviction
+TELNET_SESSIONS = TelnetSessionManager()
+
+# Warm connections reused by one-shot calls that don't name a session
+TELNET_POOL = TelnetConnectionPool()
+
+# Streaming command outputs keyed by stream ID
+TELNET_STREAMS: Dict[str, TelnetOutputStream] = {}
+
+def _resolve_framing(
+    host: str,
+    port: int,
+    prompt: Optional[str],
+    command_timeout: Optional[float],
+    idle_gap: Optional[float]
 ) -> dict:
     """
-    Connect to the given Telnet server, do minimal Telnet option negotiation, 
-    send each command, and capture/return the responses in a dict.
+    Work out how responses are framed for a call.
 
-    :param host: Host/IP of the Telnet server.
-    :param port: Port number (e.g. 8023).
-    :param commands: List of commands to send to the server.
-    :param session_id: Optional session ID to maintain connection between calls.
-    :param close_session: If True, close the session after processing commands.
-    :return: A dict containing the server's responses and session info.
+    Per-call values win over the host profile, which wins over the defaults.
+
+    :return: Dict with the compiled prompt pattern and the timeouts to use.
     """
-    # 1) Validate input using TelnetClientInput
+    profile = resolve_host_profile(host, port)
+    prompt = prompt or (profile.prompt if profile else DEFAULT_PROMPT)
     try:
-        validated_input = TelnetClientInput(
-            host=host, 
-            port=port, 
-            commands=commands
-        )
-    except ValidationError as e:
-        raise ValueError(f"Invalid input for telnet_client_tool: {e}")
+        pattern = get_prompt_pattern(prompt)
+    except re.error as e:
+        raise ValueError(f"Invalid prompt pattern {prompt!r}: {e}")
+
+    return {
+        "prompt": pattern,
+        "pipeline_prompt": get_prompt_pattern(prompt, anchored=False),
+        "banner_timeout": (profile and profile.banner_timeout) or BANNER_TIMEOUT,
+        "command_timeout": command_timeout or (profile and profile.command_timeout) or COMMAND_TIMEOUT,
+        "idle_gap": idle_gap or (profile and profile.idle_gap) or None,
+    }
 
-    # Generate a session ID if none provided
+async def _checkout_connection(
+    host: str,
+    port: int,
+    session_id: Optional[str],
+    framing: dict
+) -> Tuple[TelnetConnection, str, bool]:
+    """
+    Get the connection a call should use.
+
+    With a session ID the named session is reused or created; without one a
+    warm connection is taken from the pool.
+
+    :return: The connection, the banner if it was freshly opened, and whether it was reused.
+    """
     if not session_id:
-        session_id = f"telnet_{host}_{port}_{int(time.time())}"
-    
+        try:
+            tn, banner = await TELNET_POOL.acquire(
+                host,
+                port,
+                connect_timeout=CONNECT_TIMEOUT,
+                banner_prompt=framing["prompt"],
+                banner_timeout=framing["banner_timeout"],
+                idle_gap=framing["idle_gap"]
+            )
+        except Exception as ex:
+            raise McpError(ErrorData(
+                code=INTERNAL_ERROR,
+                message=f"Failed to connect to Telnet server: {ex}"
+            ))
+        return tn, banner or "", banner is None
+
     # Check if we have an existing session
     session = TELNET_SESSIONS.get(session_id)
-    tn = None
-    initial_data = ""
-    
     if session:
         # Reuse existing session
         tn = session.get("telnet")
         if not tn:
-            raise McpError(f"Session {session_id} exists but telnet connection is invalid")
-    else:
-        # Create new session
-        tn = telnetlib.Telnet()
-        
-        # Minimal negotiation callback: always refuse
-        def negotiation_callback(sock, cmd, opt):
-            if cmd == DO:
-                sock.sendall(IAC + WONT + opt)
-            elif cmd == WILL:
-                sock.sendall(IAC + DONT + opt)
-
-        tn.set_option_negotiation_callback(negotiation_callback)
-
-        # Open the connection
-        try:
-            tn.open(validated_input.host, validated_input.port, timeout=10)
-        except Exception as ex:
-            raise McpError(f"Failed to connect to Telnet server: {ex}")
+            raise McpError(ErrorData(
+                code=INTERNAL_ERROR,
+                message=f"Session {session_id} exists but telnet connection is invalid"
+            ))
+        return tn, "", True
 
+    # Open the connection; negotiation requests are refused as they arrive
+    try:
+        tn = await TelnetConnection.open(host, port, timeout=CONNECT_TIMEOUT)
+    except Exception as ex:
+        raise McpError(ErrorData(
+            code=INTERNAL_ERROR,
+            message=f"Failed to connect to Telnet server: {ex}"
+        ))
+
+    try:
         # Read initial banner
-        initial_data = tn.read_until(b"> ", timeout=2).decode("utf-8", errors="ignore")
-        
+        banner = await tn.expect(
+            framing["prompt"],
+            timeout=framing["banner_timeout"],
+            idle_gap=framing["idle_gap"]
+        )
+
         # Store the session
-        TELNET_SESSIONS[session_id] = {
-            "telnet": tn,
-            "host": validated_input.host,
-            "port": validated_input.port,
-            "created_at": time.time()
-        }
+        await TELNET_SESSIONS.add(session_id, tn, host, port)
+    except BaseException:
+        await tn.close()
+        raise
+    return tn, banner.data.decode("utf-8", errors="ignore"), False
+
+async def _checkin_connection(
+    host: str,
+    port: int,
+    session_id: Optional[str],
+    tn: TelnetConnection,
+    in_sync: bool,
+    close: bool
+) -> None:
+    """
+    Hand a connection back after use.
+
+    Pooled connections are only returned if they are known to be at a
+    prompt; named sessions are kept unless ``close`` is set.
+    """
+    if not session_id:
+        if close or not in_sync:
+            await tn.close()
+        else:
+            await TELNET_POOL.release(host, port, tn)
+        return
+
+    TELNET_SESSIONS.touch(session_id)
+
+    # Close the session if requested
+    if close:
+        await TELNET_SESSIONS.close(session_id)
+
+async def _run_pipelined(
+    tn: TelnetConnection,
+    commands: List[str],
+    framing: dict
+) -> Tuple[List[CommandResponse], bool]:
+    """
+    Write every command at once, then split the output on prompt boundaries.
+
+    The whole batch costs roughly one round trip instead of one per command.
+    If a response never completes, the remaining commands are reported with
+    the same end reason and an empty response instead of each waiting out
+    its own timeout.
+
+    :return: The responses in command order and whether the connection ended at a prompt.
+    """
+    await tn.write(b"".join(cmd.encode("utf-8") + b"\n" for cmd in commands))
 
-    # Send commands and collect responses
     responses = []
-    for cmd in validated_input.commands:
-        tn.write(cmd.encode("utf-8") + b"\n")
-        data = tn.read_until(b"> ", timeout=5)
+    failure = None
+    for cmd in commands:
+        if failure:
+            responses.append(CommandResponse(command=cmd, response="", end_reason=failure))
+            continue
+        result = await tn.expect(
+            framing["pipeline_prompt"],
+            timeout=framing["command_timeout"],
+            idle_gap=framing["idle_gap"]
+        )
+        if result.reason not in ("prompt", "idle"):
+            failure = result.reason
         responses.append(CommandResponse(
             command=cmd,
-            response=data.decode("utf-8", errors="ignore")
+            response=result.data.decode("utf-8", errors="ignore"),
+            end_reason=result.reason
         ))
+    return responses, failure is None
 
-    # Close the session if requested
-    if close_session and session_id in TELNET_SESSIONS:
-        tn.close()
-        del TELNET_SESSIONS[session_id]
+@mcp_tool(
+    name="telnet_client",
+    description="Connect to a Telnet server, run commands, and return output.",
+    input_model=TelnetClientInput
+)
+async def telnet_client_tool(
+    host: str, 
+    port: int, 
+    commands: List[str], 
+    session_id: Optional[str] = None,
+    close_session: bool = False,
+    prompt: Optional[str] = None,
+    command_timeout: Optional[float] = None,
+    idle_gap: Optional[float] = None,
+    pipeline: bool = False
+) -> dict:
+    """
+    Connect to the given Telnet server, do minimal Telnet option negotiation, 
+    send each command, and capture/return the responses in a dict.
+
+    Each response ends as soon as the prompt regex matches at the end of the
+    received output, so there is no fixed wait per command and output that
+    merely contains the prompt text is not truncated.
+
+    All socket I/O runs on the event loop, so many sessions can be driven
+    concurrently without blocking each other.
+
+    :param host: Host/IP of the Telnet server.
+    :param port: Port number (e.g. 8023).
+    :param commands: List of commands to send to the server.
+    :param session_id: Optional session ID to maintain connection between calls.
+        Without one, a warm pooled connection to host:port is reused when available.
+    :param close_session: If True, close the session (or pooled connection) after processing commands.
+    :param prompt: Regex for the device prompt; defaults to the host profile, then "> ".
+    :param command_timeout: Maximum seconds to wait for each response.
+    :param idle_gap: If set, a response also ends after this many seconds of silence.
+    :param pipeline: If True, send all commands up front and split the responses on
+        prompt boundaries. Only for devices that accept queued input.
+    :return: A dict containing the server's responses and session info.
+    """
+    framing = _resolve_framing(
+        host,
+        port,
+        prompt,
+        command_timeout,
+        idle_gap
+    )
+
+    # Without a session ID the call is one-shot and uses a pooled connection
+    pooled = not session_id
+    tn, initial_data, connection_reused = await _checkout_connection(
+        host, port, session_id, framing
+    )
+
+    # Send commands and collect responses; the lock keeps concurrent
+    # calls on the same session from interleaving their exchanges
+    responses = []
+    # A read that timed out may leave late output on the wire
+    in_sync = True
+    try:
+        async with tn.lock:
+            if pipeline:
+                responses, in_sync = await _run_pipelined(tn, commands, framing)
+            else:
+                for cmd in commands:
+                    await tn.write(cmd.encode("utf-8") + b"\n")
+                    result = await tn.expect(
+                        framing["prompt"],
+                        timeout=framing["command_timeout"],
+                        idle_gap=framing["idle_gap"]
+                    )
+                    in_sync = in_sync and result.reason in ("prompt", "idle")
+                    responses.append(CommandResponse(
+                        command=cmd,
+                        response=result.data.decode("utf-8", errors="ignore"),
+                        end_reason=result.reason
+                    ))
+    except BaseException:
+        if pooled:
+            await tn.close()
+        raise
+
+    await _checkin_connection(
+        host, port, session_id, tn, in_sync, close_session
+    )
 
     # Construct output
     output_model = TelnetClientOutput(
-        host=validated_input.host,
-        port=validated_input.port,
+        host=host,
+        port=port,
         initial_banner=initial_data,
         responses=responses,
         session_id=session_id,
-        session_active=session_id in TELNET_SESSIONS
+        session_active=not pooled and session_id in TELNET_SESSIONS,
+        connection_reused=connection_reused
     )
 
     return output_model.model_dump()
 
+@mcp_tool(
+    name="telnet_client_multi",
+    description="Run the same Telnet commands on many servers in parallel and return per-host results.",
+    input_model=TelnetMultiClientInput
+)
+async def telnet_client_multi(
+    targets: List[TelnetTarget],
+    commands: List[str],
+    max_concurrency: int = 50,
+    prompt: Optional[str] = None,
+    command_timeout: Optional[float] = None,
+    idle_gap: Optional[float] = None,
+    pipeline: bool = False
+) -> dict:
+    """
+    Fan a command list out across many Telnet servers concurrently.
+
+    Each target gets its own one-shot connection, so wall time is bounded by
+    the slowest host rather than the sum of all hosts. A failing host does
+    not abort the others; its error is reported in its result entry.
+
+    :param targets: List of {"host": ..., "port": ...} entries.
+    :param commands: Commands to send sequentially on every target.
+    :param max_concurrency: Maximum number of targets processed at once.
+    :param prompt: Regex for the device prompt; defaults to each host's profile.
+    :param command_timeout: Maximum seconds to wait for each response.
+    :param idle_gap: If set, a response also ends after this many seconds of silence.
+    :param pipeline: If True, send each host's commands up front (see telnet_client).
+    :return: A dict with per-host results and success/failure counts.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_target(target) -> TelnetHostResult:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                output = await telnet_client_tool(
+                    target.host,
+                    target.port,
+                    commands,
+                    close_session=True,
+                    prompt=prompt,
+                    command_timeout=command_timeout,
+                    idle_gap=idle_gap,
+                    pipeline=pipeline
+                )
+            except Exception as ex:
+                return TelnetHostResult(
+                    host=target.host,
+                    port=target.port,
+                    success=False,
+                    error=str(ex) or type(ex).__name__,
+                    elapsed_seconds=time.perf_counter() - start
+                )
+            return TelnetHostResult(
+                host=target.host,
+                port=target.port,
+                success=True,
+                output=TelnetClientOutput(**output),
+                elapsed_seconds=time.perf_counter() - start
+            )
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(run_target(t) for t in targets))
+    succeeded = sum(1 for r in results if r.success)
+
+    output_model = TelnetMultiClientOutput(
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        elapsed_seconds=time.perf_counter() - start,
+        results=results
+    )
+    return output_model.model_dump()
+
 # Add a tool for closing specific sessions
 @mcp_tool(name="telnet_close_session", description="Close a specific Telnet session.")
-def telnet_close_session(session_id: str) -> dict:
+async def telnet_close_session(session_id: str) -> dict:
     """
     Close a specific Telnet session by ID.
 
     :param session_id: The session ID to close.
     :return: Status of the operation.
     """
-    if session_id in TELNET_SESSIONS:
-        try:
-            TELNET_SESSIONS[session_id]["telnet"].close()
-        except:
-            pass  # Best effort to close
-        del TELNET_SESSIONS[session_id]
+    if await TELNET_SESSIONS.close(session_id):
         return {"success": True, "message": f"Session {session_id} closed"}
     else:
         return {"success": False, "message": f"Session {session_id} not found"}
 
 # Add a tool for listing active sessions
 @mcp_tool(name="telnet_list_sessions", description="List all active Telnet sessions.")
-def telnet_list_sessions() -> dict:
+async def telnet_list_sessions() -> dict:
     """
     List all active Telnet sessions.
 
-    :return: Dict with session information.
+    Runs on the event loop so the session store is read from the same
+    thread that mutates it.
+
+    :return: Dict with session information, limits, eviction counters and pool stats.
     """
+    now = time.time()
     sessions = {}
     for session_id, session_data in TELNET_SESSIONS.items():
         sessions[session_id] = {
             "host": session_data["host"],
             "port": session_data["port"],
             "created_at": session_data["created_at"],
-            "age_seconds": time.time() - session_data["created_at"]
+            "age_seconds": now - session_data["created_at"],
+            "last_used": session_data["last_used"],
+            "idle_seconds": now - session_data["last_used"]
         }
     
     return {
         "active_sessions": len(sessions),
-        "sessions": sessions
-    }
\ No newline at end of file
+        "sessions": sessions,
+        **TELNET_SESSIONS.stats(),
+        "pool": TELNET_POOL.stats()
+    }
+
+@mcp_tool(
+    name="telnet_set_host_profile",
+    description="Set the prompt regex and response timing used for a Telnet host.",
+    input_model=HostProfile
+)
+def telnet_set_host_profile(
+    host: str,
+    prompt: str,
+    port: Optional[int] = None,
+    banner_timeout: Optional[float] = None,
+    command_timeout: Optional[float] = None,
+    idle_gap: Optional[float] = None
+) -> dict:
+    """
+    Register a host profile used by telnet_client when a call gives no prompt.
+
+    :param host: Host/IP the profile applies to.
+    :param prompt: Regex matching the device prompt.
+    :param port: Optional port; omit to cover every port on the host.
+    :param banner_timeout: Maximum seconds to wait for the login banner.
+    :param command_timeout: Maximum seconds to wait for each response.
+    :param idle_gap: Seconds of silence after output that end a response.
+    :return: The stored profile.
+    """
+    # The arguments were already validated against HostProfile by mcp_tool
+    profile = HostProfile.model_construct(
+        host=host,
+        port=port,
+        prompt=prompt,
+        banner_timeout=banner_timeout,
+        command_timeout=command_timeout,
+        idle_gap=idle_gap
+    )
+    try:
+        register_host_profile(profile)
+    except re.error as e:
+        raise ValueError(f"Invalid prompt pattern {prompt!r}: {e}")
+
+    return profile.model_dump()
+
+@mcp_tool(name="telnet_list_host_profiles", description="List the registered Telnet host profiles.")
+def telnet_list_host_profiles() -> dict:
+    """
+    List registered host profiles.
+
+    :return: Dict of profiles keyed by "host:port" or "host".
+    """
+    return {
+        "default_prompt": DEFAULT_PROMPT,
+        "profiles": {key: profile.model_dump() for key, profile in HOST_PROFILES.items()}
+    }
+
+async def _run_stream(stream: TelnetOutputStream, session_id: Optional[str], framing: dict) -> None:
+    """Background task that pumps one command's output into its ring buffer."""
+    try:
+        tn, _, _ = await _checkout_connection(stream.host, stream.port, session_id, framing)
+    except Exception as ex:
+        stream.finish(error=str(ex) or type(ex).__name__)
+        return
+
+    try:
+        async with tn.lock:
+            await tn.write(stream.command.encode("utf-8") + b"\n")
+            reason = await tn.expect_stream(
+                framing["prompt"],
+                stream.buffer.write,
+                timeout=framing["command_timeout"],
+                idle_gap=framing["idle_gap"]
+            )
+    except asyncio.CancelledError:
+        if not session_id:
+            await tn.close()
+        stream.finish(error="cancelled")
+        raise
+    except Exception as ex:
+        if not session_id:
+            await tn.close()
+        stream.finish(error=str(ex) or type(ex).__name__)
+        return
+
+    await _checkin_connection(
+        stream.host, stream.port, session_id, tn, reason in ("prompt", "idle"), close=False
+    )
+    stream.finish(end_reason=reason)
+
+def _purge_streams() -> None:
+    """Drop finished streams that have outlived their retention period."""
+    now = time.time()
+    for stream_id, stream in list(TELNET_STREAMS.items()):
+        if stream.done and now - stream.finished_at > STREAM_RETENTION:
+            del TELNET_STREAMS[stream_id]
+
+@mcp_tool(
+    name="telnet_stream_start",
+    description="Start a long-running Telnet command whose output is read incrementally with telnet_stream_read.",
+    input_model=TelnetStreamInput
+)
+async def telnet_stream_start(
+    host: str,
+    port: int,
+    command: str,
+    session_id: Optional[str] = None,
+    prompt: Optional[str] = None,
+    command_timeout: Optional[float] = None,
+    idle_gap: Optional[float] = None,
+    buffer_size: int = DEFAULT_BUFFER_SIZE
+) -> dict:
+    """
+    Run a command in the background, capturing its output into a ring buffer.
+
+    Output is kept in a buffer of at most ``buffer_size`` bytes; readers page
+    through it with telnet_stream_read, so memory stays constant regardless
+    of how much the command prints.
+
+    :param host: Host/IP of the Telnet server.
+    :param port: Port number.
+    :param command: Command to run.
+    :param session_id: Optional session to run the command on; otherwise a pooled connection is used.
+    :param prompt: Regex for the device prompt; defaults to the host profile, then "> ".
+    :param command_timeout: Maximum seconds to wait for the output to finish.
+    :param idle_gap: If set, the stream also ends after this many seconds of silence.
+    :param buffer_size: Ring buffer capacity in bytes.
+    :return: The stream ID to read from.
+    """
+    framing = _resolve_framing(
+        host,
+        port,
+        prompt,
+        command_timeout or STREAM_TIMEOUT,
+        idle_gap
+    )
+
+    _purge_streams()
+    stream = TelnetOutputStream(
+        stream_id=f"stream_{uuid.uuid4().hex}",
+        host=host,
+        port=port,
+        command=command,
+        buffer_size=buffer_size
+    )
+    TELNET_STREAMS[stream.stream_id] = stream
+    stream.task = asyncio.get_running_loop().create_task(_run_stream(stream, session_id, framing))
+
+    return {
+        "stream_id": stream.stream_id,
+        "host": stream.host,
+        "port": stream.port,
+        "command": stream.command,
+        "buffer_size": buffer_size
+    }
+
+@mcp_tool(name="telnet_stream_read", description="Read the next chunk of output from a Telnet stream.")
+async def telnet_stream_read(
+    stream_id: str,
+    cursor: int = 0,
+    max_bytes: int = 65536,
+    wait_seconds: float = 0.0
+) -> dict:
+    """
+    Read output from a stream starting at ``cursor``.
+
+    Pass the returned ``next_cursor`` to the following call. If the reader
+    falls more than a buffer behind, the skipped bytes are reported in
+    ``dropped_bytes``. The stream is discarded once it is done and fully read.
+
+    :param stream_id: ID returned by telnet_stream_start.
+    :param cursor: Byte offset to read from.
+    :param max_bytes: Maximum bytes to return.
+    :param wait_seconds: Seconds to wait for new output if none is available yet.
+    :return: The chunk of output and the cursor for the next read.
+    """
+    stream = TELNET_STREAMS.get(stream_id)
+    if stream is None:
+        raise ValueError(f"Stream {stream_id} not found")
+    if max_bytes < 1:
+        raise ValueError("max_bytes must be at least 1")
+
+    if wait_seconds > 0 and not stream.done:
+        await stream.buffer.wait(cursor, wait_seconds)
+
+    # Snapshot completion before reading so no trailing output is missed
+    done = stream.done
+    data, next_cursor, dropped = stream.buffer.read(cursor, max_bytes)
+    if not done or next_cursor < stream.buffer.end_offset:
+        # Leave a partial multi-byte character for the next read
+        data, tail = utf8_safe_split(data)
+        next_cursor -= len(tail)
+
+    finished = done and next_cursor >= stream.buffer.end_offset
+    if finished:
+        TELNET_STREAMS.pop(stream_id, None)
+
+    chunk = TelnetStreamChunk(
+        stream_id=stream_id,
+        data=data.decode("utf-8", errors="ignore"),
+        cursor=next_cursor - len(data),
+        next_cursor=next_cursor,
+        dropped_bytes=dropped,
+        done=finished,
+        end_reason=stream.end_reason,
+        error=stream.error
+    )
+    return chunk.model_dump()
+
+@mcp_tool(name="telnet_stream_close", description="Stop a Telnet stream and discard its buffered output.")
+async def telnet_stream_close(stream_id: str) -> dict:
+    """
+    Cancel a running stream (if still running) and discard it.
+
+    :param stream_id: ID returned by telnet_stream_start.
+    :return: Status of the operation.
+    """
+    stream = TELNET_STREAMS.pop(stream_id, None)
+    if stream is None:
+        return {"success": False, "message": f"Stream {stream_id} not found"}
+
+    if stream.task is not None and not stream.task.done():
+        stream.task.cancel()
+        try:
+            await stream.task
+        except asyncio.CancelledError:
+            pass  # The task records its own error
+    return {"success": True, "message": f"Stream {stream_id} closed"}
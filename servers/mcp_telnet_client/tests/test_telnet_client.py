@@ -0,0 +1,425 @@
+# servers/mcp_telnet_client/tests/test_telnet_client.py
+import asyncio
+import pytest
+
+from mcp_telnet_client.telnet_connection import TelnetConnection, DONT, WONT, IAC, WILL
+from mcp_telnet_client.simulator import TelnetSimulator, ECHO_OPTION, SGA_OPTION
+from mcp_telnet_client.benchmark import run_benchmarks
+from mcp_telnet_client.session_manager import TelnetSessionManager
+from mcp_telnet_client.host_profiles import HOST_PROFILES
+from mcp_telnet_client.models import TelnetTarget
+from mcp_telnet_client.output_stream import OutputRingBuffer, utf8_safe_split
+from mcp_telnet_client.tools import (
+    telnet_client_tool,
+    telnet_client_multi,
+    telnet_close_session,
+    telnet_list_sessions,
+    TELNET_SESSIONS,
+    TELNET_POOL,
+    telnet_set_host_profile,
+    telnet_list_host_profiles,
+    telnet_stream_start,
+    telnet_stream_read,
+    telnet_stream_close,
+    TELNET_STREAMS,
+)
+
+@pytest.mark.asyncio
+async def test_connection_refuses_negotiation():
+    async with TelnetSimulator() as server:
+        tn = await TelnetConnection.open("127.0.0.1", server.port)
+        banner = await tn.read_until(b"> ", timeout=2)
+        # A round trip guarantees the negotiation replies have reached the server.
+        await tn.write(b"ping\n")
+        await tn.read_until(b"> ", timeout=2)
+        await tn.close()
+
+    # IAC sequences are stripped from the data and refused on the wire.
+    assert banner == b"Welcome\r\n> "
+    assert (WONT, ECHO_OPTION) in server.negotiation_replies
+    assert (DONT, SGA_OPTION) in server.negotiation_replies
+
+def test_iac_sequences_split_across_reads_are_stripped():
+    class RecordingWriter:
+        def __init__(self):
+            self.sent = bytearray()
+
+        def write(self, data):
+            self.sent += data
+
+    writer = RecordingWriter()
+    tn = TelnetConnection(None, writer)
+    for chunk in (b"ab\x00c" + IAC, IAC + b"d" + IAC + WILL, b"\x01e" + IAC + b"\xfa\x18xyz" + IAC + b"\xf0f"):
+        tn._process_raw(chunk)
+
+    assert bytes(tn._buffer) == b"abc\xffdef"
+    assert bytes(writer.sent) == IAC + DONT + b"\x01"
+
+@pytest.mark.asyncio
+async def test_read_until_returns_partial_data_on_timeout():
+    async with TelnetSimulator() as server:
+        tn = await TelnetConnection.open("127.0.0.1", server.port)
+        data = await tn.read_until(b"never-sent", timeout=0.2)
+        await tn.close()
+
+    assert data == b"Welcome\r\n> "
+
+@pytest.mark.asyncio
+async def test_telnet_client_tool_runs_commands():
+    async with TelnetSimulator() as server:
+        result = await telnet_client_tool("127.0.0.1", server.port, ["show version", "uptime"], close_session=True)
+
+        # close_session closes the one-shot connection instead of pooling it
+        for _ in range(50):
+            if server.active_connections == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert server.active_connections == 0
+        assert f"127.0.0.1:{server.port}" not in TELNET_POOL.stats()["idle_connections"]
+
+    assert result["initial_banner"] == "Welcome\r\n> "
+    assert [r["command"] for r in result["responses"]] == ["show version", "uptime"]
+    assert result["responses"][0]["response"] == "you said show version\r\n> "
+    assert result["session_active"] is False
+
+@pytest.mark.asyncio
+async def test_telnet_sessions_are_reused_and_closed():
+    async with TelnetSimulator() as server:
+        first = await telnet_client_tool("127.0.0.1", server.port, ["one"], session_id="reuse-test")
+        assert first["session_active"] is True
+        assert "reuse-test" in (await telnet_list_sessions())["sessions"]
+
+        second = await telnet_client_tool("127.0.0.1", server.port, ["two"], session_id="reuse-test")
+        assert second["initial_banner"] == ""
+        assert second["responses"][0]["response"] == "you said two\r\n> "
+
+        closed = await telnet_close_session("reuse-test")
+
+    assert closed["success"] is True
+    assert "reuse-test" not in TELNET_SESSIONS
+
+@pytest.mark.asyncio
+async def test_telnet_client_tool_connect_failure():
+    async with TelnetSimulator() as server:
+        port = server.port
+
+    # The server is gone, so connecting must fail.
+    with pytest.raises(Exception):
+        await telnet_client_tool("127.0.0.1", port, ["noop"])
+
+@pytest.mark.asyncio
+async def test_telnet_client_multi_fans_out():
+    async with TelnetSimulator() as first, TelnetSimulator() as second:
+        result = await telnet_client_multi(
+            targets=[TelnetTarget(host="127.0.0.1", port=first.port), TelnetTarget(host="127.0.0.1", port=second.port)],
+            commands=["show version"],
+            max_concurrency=2
+        )
+
+    assert result["total"] == 2
+    assert result["succeeded"] == 2
+    assert result["failed"] == 0
+    assert [r["port"] for r in result["results"]] == [first.port, second.port]
+    for entry in result["results"]:
+        assert entry["output"]["responses"][0]["response"] == "you said show version\r\n> "
+        assert entry["output"]["session_active"] is False
+
+@pytest.mark.asyncio
+async def test_telnet_client_multi_reports_partial_failure():
+    async with TelnetSimulator() as dead:
+        dead_port = dead.port
+
+    async with TelnetSimulator() as alive:
+        result = await telnet_client_multi(
+            targets=[TelnetTarget(host="127.0.0.1", port=dead_port), TelnetTarget(host="127.0.0.1", port=alive.port)],
+            commands=["uptime"]
+        )
+
+    assert result["succeeded"] == 1
+    assert result["failed"] == 1
+    failed, succeeded = result["results"]
+    assert failed["success"] is False
+    assert failed["error"]
+    assert failed["output"] is None
+    assert succeeded["success"] is True
+
+async def open_session(manager, server, session_id):
+    tn = await TelnetConnection.open("127.0.0.1", server.port)
+    await tn.read_until(b"> ", timeout=2)
+    try:
+        await manager.add(session_id, tn, "127.0.0.1", server.port)
+    except Exception:
+        await tn.close()
+        raise
+    return tn
+
+@pytest.mark.asyncio
+async def test_session_manager_evicts_least_recently_used():
+    manager = TelnetSessionManager(max_sessions=2, max_sessions_per_host=10, idle_timeout=60)
+    async with TelnetSimulator() as server:
+        first = await open_session(manager, server, "first")
+        await open_session(manager, server, "second")
+        manager.touch("first")
+        await open_session(manager, server, "third")
+
+        assert "second" not in manager
+        assert "first" in manager and "third" in manager
+        assert manager.evictions["lru"] == 1
+        assert not first.is_closing
+        await manager.close_all()
+
+@pytest.mark.asyncio
+async def test_session_manager_per_host_cap():
+    manager = TelnetSessionManager(max_sessions=10, max_sessions_per_host=1, idle_timeout=60)
+    async with TelnetSimulator() as server:
+        evicted = await open_session(manager, server, "first")
+        await open_session(manager, server, "second")
+
+        assert "first" not in manager
+        assert evicted.is_closing
+        assert manager.evictions["host_limit"] == 1
+        await manager.close_all()
+
+@pytest.mark.asyncio
+async def test_session_manager_never_evicts_busy_sessions():
+    manager = TelnetSessionManager(max_sessions=1, max_sessions_per_host=10, idle_timeout=60)
+    async with TelnetSimulator() as server:
+        busy = await open_session(manager, server, "busy")
+        async with busy.lock:
+            with pytest.raises(Exception):
+                await open_session(manager, server, "other")
+        assert "busy" in manager
+        await manager.close_all()
+
+@pytest.mark.asyncio
+async def test_session_manager_rejects_duplicate_session_id():
+    manager = TelnetSessionManager(max_sessions=10, max_sessions_per_host=10, idle_timeout=60)
+    async with TelnetSimulator() as server:
+        results = await asyncio.gather(
+            open_session(manager, server, "dup"),
+            open_session(manager, server, "dup"),
+            return_exceptions=True
+        )
+        kept = [r for r in results if isinstance(r, TelnetConnection)]
+        assert len(kept) == 1
+        assert len([r for r in results if isinstance(r, Exception)]) == 1
+        assert manager["dup"]["telnet"] is kept[0]
+        assert not kept[0].is_closing
+
+        # The rejected connection was closed rather than leaked
+        for _ in range(50):
+            if server.active_connections == 1:
+                break
+            await asyncio.sleep(0.01)
+        assert server.active_connections == 1
+        await manager.close_all()
+
+@pytest.mark.asyncio
+async def test_session_manager_reaps_idle_sessions():
+    manager = TelnetSessionManager(idle_timeout=0.1, reap_interval=0.05)
+    async with TelnetSimulator() as server:
+        tn = await open_session(manager, server, "idle")
+        await asyncio.sleep(0.3)
+
+        assert "idle" not in manager
+        assert tn.is_closing
+        assert manager.evictions["idle"] == 1
+        await manager.close_all()
+
+@pytest.mark.asyncio
+async def test_list_sessions_reports_usage_and_evictions():
+    async with TelnetSimulator() as server:
+        await telnet_client_tool("127.0.0.1", server.port, ["one"], session_id="listed")
+        listing = await telnet_list_sessions()
+        await telnet_close_session("listed")
+
+    entry = listing["sessions"]["listed"]
+    assert entry["last_used"] >= entry["created_at"]
+    assert entry["idle_seconds"] >= 0
+    assert set(listing["evictions"]) == {"idle", "closed", "lru", "host_limit"}
+
+@pytest.mark.asyncio
+async def test_one_shot_calls_reuse_pooled_connection():
+    async with TelnetSimulator() as server:
+        first = await telnet_client_tool("127.0.0.1", server.port, ["one"])
+        second = await telnet_client_tool("127.0.0.1", server.port, ["two"])
+        await TELNET_POOL.close_all()
+
+    assert server.connections == 1
+    assert first["connection_reused"] is False
+    assert first["initial_banner"] == "Welcome\r\n> "
+    assert second["connection_reused"] is True
+    assert second["initial_banner"] == ""
+    assert second["responses"][0]["response"] == "you said two\r\n> "
+    assert second["session_id"] is None
+    assert second["session_active"] is False
+
+@pytest.mark.asyncio
+async def test_pool_discards_dead_connections():
+    async with TelnetSimulator() as server:
+        await telnet_client_tool("127.0.0.1", server.port, ["one"])
+        # Kill the pooled connection from the server side.
+        idle = TELNET_POOL._idle[("127.0.0.1", server.port)]
+        idle[-1][0].writer.transport.abort()
+        await asyncio.sleep(0.05)
+
+        result = await telnet_client_tool("127.0.0.1", server.port, ["two"])
+        await TELNET_POOL.close_all()
+
+    assert server.connections == 2
+    assert result["connection_reused"] is False
+    assert result["responses"][0]["response"] == "you said two\r\n> "
+
+@pytest.mark.asyncio
+async def test_custom_prompt_returns_without_waiting_for_timeout():
+    async with TelnetSimulator(prompt=b"router# ") as server:
+        start = asyncio.get_running_loop().time()
+        result = await telnet_client_tool(
+            "127.0.0.1", server.port, ["show run"], close_session=True, prompt=r"\S+# ", command_timeout=5
+        )
+        elapsed = asyncio.get_running_loop().time() - start
+
+    assert elapsed < 1
+    assert result["initial_banner"] == "Welcome\r\nrouter# "
+    assert result["responses"][0]["response"] == "you said show run\r\nrouter# "
+    assert result["responses"][0]["end_reason"] == "prompt"
+
+@pytest.mark.asyncio
+async def test_prompt_text_inside_output_does_not_truncate():
+    async with TelnetSimulator() as server:
+        result = await telnet_client_tool("127.0.0.1", server.port, ["a > b > c"], close_session=True)
+
+    assert result["responses"][0]["response"] == "you said a > b > c\r\n> "
+
+@pytest.mark.asyncio
+async def test_idle_gap_ends_response_for_unknown_prompt():
+    async with TelnetSimulator(prompt=b"$$ ") as server:
+        start = asyncio.get_running_loop().time()
+        result = await telnet_client_tool(
+            "127.0.0.1", server.port, ["ls"], close_session=True, command_timeout=5, idle_gap=0.1
+        )
+        elapsed = asyncio.get_running_loop().time() - start
+
+    assert elapsed < 4
+    assert result["responses"][0]["response"] == "you said ls\r\n$$ "
+    assert result["responses"][0]["end_reason"] == "idle"
+
+@pytest.mark.asyncio
+async def test_host_profile_supplies_prompt():
+    async with TelnetSimulator(prompt=b"switch> ") as server:
+        try:
+            telnet_set_host_profile("127.0.0.1", r"switch> ", port=server.port, command_timeout=3)
+            assert f"127.0.0.1:{server.port}" in telnet_list_host_profiles()["profiles"]
+
+            result = await telnet_client_tool("127.0.0.1", server.port, ["show vlan"], close_session=True)
+        finally:
+            HOST_PROFILES.clear()
+
+    assert result["responses"][0]["end_reason"] == "prompt"
+
+def test_host_profile_rejects_invalid_regex():
+    with pytest.raises(ValueError):
+        telnet_set_host_profile("127.0.0.1", r"([unclosed")
+    assert not HOST_PROFILES
+
+def test_ring_buffer_reports_dropped_bytes():
+    buffer = OutputRingBuffer(capacity=8)
+    buffer.write(b"0123456789")
+
+    data, next_cursor, dropped = buffer.read(0, 100)
+    assert data == b"23456789"
+    assert next_cursor == 10
+    assert dropped == 2
+
+def test_utf8_safe_split_keeps_partial_characters():
+    data = "héllo".encode("utf-8")
+    assert utf8_safe_split(data) == (data, b"")
+    assert utf8_safe_split(data[:2]) == (b"h", data[1:2])
+
+@pytest.mark.asyncio
+async def test_stream_reads_large_output_incrementally():
+    async with TelnetSimulator(output_size=512 * 1024) as server:
+        started = await telnet_stream_start("127.0.0.1", server.port, "dump", buffer_size=1024 * 1024)
+        stream_id = started["stream_id"]
+
+        received = 0
+        cursor = 0
+        chunks = 0
+        while True:
+            chunk = await telnet_stream_read(stream_id, cursor=cursor, max_bytes=64 * 1024, wait_seconds=1)
+            received += len(chunk["data"])
+            cursor = chunk["next_cursor"]
+            chunks += 1
+            if chunk["done"]:
+                break
+        await TELNET_POOL.close_all()
+
+    assert received == len("you said dump\r\n") + 512 * 1024 + len("> ")
+    assert chunks > 1
+    assert chunk["end_reason"] == "prompt"
+    assert chunk["dropped_bytes"] == 0
+    assert stream_id not in TELNET_STREAMS
+
+@pytest.mark.asyncio
+async def test_stream_buffer_stays_bounded():
+    async with TelnetSimulator(output_size=256 * 1024) as server:
+        started = await telnet_stream_start("127.0.0.1", server.port, "dump", buffer_size=4096)
+        stream = TELNET_STREAMS[started["stream_id"]]
+        await stream.task
+
+        assert len(stream.buffer._data) <= 4096
+        chunk = await telnet_stream_read(started["stream_id"], cursor=0)
+        await TELNET_POOL.close_all()
+
+    assert chunk["dropped_bytes"] > 0
+    assert chunk["data"].endswith("> ")
+    assert chunk["done"] is True
+
+@pytest.mark.asyncio
+async def test_stream_close_cancels_running_stream():
+    async with TelnetSimulator(silent_commands=["hang"]) as server:
+        started = await telnet_stream_start("127.0.0.1", server.port, "hang", command_timeout=30)
+        await asyncio.sleep(0.1)
+        stream = TELNET_STREAMS[started["stream_id"]]
+        closed = await telnet_stream_close(started["stream_id"])
+
+    assert closed["success"] is True
+    assert stream.error == "cancelled"
+    assert started["stream_id"] not in TELNET_STREAMS
+
+@pytest.mark.asyncio
+async def test_pipelined_commands_are_demultiplexed_in_order():
+    commands = [f"cmd {i}" for i in range(50)]
+    async with TelnetSimulator() as server:
+        result = await telnet_client_tool("127.0.0.1", server.port, commands, close_session=True, pipeline=True)
+
+    assert [r["command"] for r in result["responses"]] == commands
+    for i, entry in enumerate(result["responses"]):
+        assert entry["response"] == f"you said cmd {i}\r\n> "
+        assert entry["end_reason"] == "prompt"
+
+@pytest.mark.asyncio
+async def test_pipelined_failure_does_not_wait_per_command():
+    async with TelnetSimulator(silent_commands=["hang"]) as server:
+        start = asyncio.get_running_loop().time()
+        result = await telnet_client_tool(
+            "127.0.0.1", server.port, ["one", "hang", "three", "four"],
+            close_session=True, pipeline=True, command_timeout=0.3
+        )
+        elapsed = asyncio.get_running_loop().time() - start
+
+    reasons = [r["end_reason"] for r in result["responses"]]
+    assert reasons[0] == "prompt"
+    assert reasons[-1] == "timeout"
+    assert elapsed < 1.5
+
+@pytest.mark.asyncio
+async def test_benchmark_suite_runs_against_simulator():
+    results = await run_benchmarks(iterations=5, calls=20, concurrency=5, sessions=5)
+
+    assert set(results) == {"connect", "latency", "throughput_pooled", "throughput_unpooled", "memory"}
+    assert results["connect"]["count"] == 5
+    assert results["latency"]["sequential"]["count"] == 5
+    assert results["throughput_pooled"]["calls_per_second"] > 0
+    assert results["memory"]["bytes_per_session"] > 0
+    assert len(TELNET_SESSIONS) == 0
@@ -1,9 +1,9 @@
 # timeserver/tools.py
+import time as _time
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-from pydantic import ValidationError
 from mcp.shared.exceptions import McpError
-from common.mcp_tool_decorator import mcp_tool
+from common.mcp_tool_decorator import mcp_tool, CachePolicy
 
 # Import our models - use relative import for better modularity
 from .models import (
@@ -13,29 +13,31 @@ from .models import (
     TimeConversionResult
 )
 
-@mcp_tool(name="get_current_time", description="Get current time in a specified timezone")
+@mcp_tool(
+    name="get_current_time",
+    description="Get current time in a specified timezone",
+    input_model=GetCurrentTimeInput,
+    # The result has one-second resolution, so cache it per timezone per second
+    cache=CachePolicy(ttl=1.0, max_entries=64, key=lambda args: (args.get("timezone"), int(_time.time())))
+)
 def get_current_time(timezone: str) -> dict:
     """
-    Validate input using GetCurrentTimeInput, compute current time in the provided timezone,
-    and return the result as defined by TimeResult.
-    """
-    try:
-        validated_input = GetCurrentTimeInput(timezone=timezone)
-    except ValidationError as e:
-        raise ValueError(f"Invalid input for get_current_time: {e}")
+    Compute current time in the provided timezone and return the result as defined by TimeResult.
 
+    Input is validated against GetCurrentTimeInput by the dispatcher before the call.
+    """
     try:
         # Get the timezone
-        tz = ZoneInfo(validated_input.timezone)
+        tz = ZoneInfo(timezone)
     except Exception as e:
-        raise McpError(f"Invalid timezone '{validated_input.timezone}': {e}")
+        raise McpError(f"Invalid timezone '{timezone}': {e}")
     
     # Get the time
     now = datetime.now(tz)
 
     # Build the result
     result = TimeResult(
-        timezone=validated_input.timezone,
+        timezone=timezone,
         datetime=now.isoformat(timespec="seconds"),
         is_dst=bool(now.dst())
     )
@@ -43,30 +45,29 @@ def get_current_time(timezone: str) -> dict:
     # Return the result
     return result.model_dump()
 
-@mcp_tool(name="convert_time", description="Convert time between timezones")
+@mcp_tool(
+    name="convert_time",
+    description="Convert time between timezones",
+    input_model=ConvertTimeInput,
+    # The result only depends on the arguments and today's date; the TTL bounds staleness at midnight
+    cache=CachePolicy(ttl=60.0, max_entries=1024)
+)
 def convert_time(source_timezone: str, time: str, target_timezone: str) -> dict:
     """
-    Validate input using ConvertTimeInput, convert the time from source timezone to target timezone,
-    and return the result as defined by TimeConversionResult.
-    """
-    try:
-        validated_input = ConvertTimeInput(
-            source_timezone=source_timezone,
-            time=time,
-            target_timezone=target_timezone
-        )
-    except ValidationError as e:
-        raise ValueError(f"Invalid input for convert_time: {e}")
+    Convert the time from source timezone to target timezone and return the result
+    as defined by TimeConversionResult.
 
+    Input is validated against ConvertTimeInput by the dispatcher before the call.
+    """
     try:
-        source_tz = ZoneInfo(validated_input.source_timezone)
-        target_tz = ZoneInfo(validated_input.target_timezone)
+        source_tz = ZoneInfo(source_timezone)
+        target_tz = ZoneInfo(target_timezone)
     except Exception as e:
         raise McpError(f"Invalid timezone: {e}")
 
     try:
         # Expecting time in "HH:MM" format
-        parsed_time = datetime.strptime(validated_input.time, "%H:%M").time()
+        parsed_time = datetime.strptime(time, "%H:%M").time()
     except ValueError:
         raise ValueError("Invalid time format. Expected HH:MM (24-hour format)")
 
@@ -92,12 +93,12 @@ def convert_time(source_timezone: str, time: str, target_timezone: str) -> dict:
 
     result = TimeConversionResult(
         source=TimeResult(
-            timezone=validated_input.source_timezone,
+            timezone=source_timezone,
             datetime=source_time.isoformat(timespec="seconds"),
             is_dst=bool(source_time.dst())
         ),
         target=TimeResult(
-            timezone=validated_input.target_timezone,
+            timezone=target_timezone,
             datetime=target_time.isoformat(timespec="seconds"),
             is_dst=bool(target_time.dst())
         ),